@@ -0,0 +1,62 @@
+"""
+Fan-out & merge latency of the local operator cluster (simulator/cluster.py) for an increasing number of operators -
+the same data set is partitioned across 1..N operators and each query is executed via the query node
+:sample:
+    python3 benchmarks/bench_cluster.py --operators 1 2 4 8 --repeat 20
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+import simulator.cluster
+
+QUERIES = [
+    'SELECT COUNT(*) FROM ping_sensor;',
+    'SELECT MIN(value), AVG(value), MAX(value) FROM ping_sensor;',
+    'select device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value) from ping_sensor group by device_name',
+    'select increments(minute, 10, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);',
+    'SELECT COUNT(DISTINCT(device_name)) AS device_name FROM ping_sensor;'
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--operators', type=int, nargs='+', default=[1, 2, 4, 8], help='operators per run')
+    parser.add_argument('--repeat', type=int, default=20, help='executions of each query per run')
+    parser.add_argument('--data-dir', type=str, default=os.path.join(ROOT_DIR, 'data'), help='directory with data files')
+    parser.add_argument('--file-info', type=str, default='anylog.ping_sensor', help='only load files containing this value')
+    args = parser.parse_args()
+
+    for operators in args.operators:
+        cluster = simulator.cluster.Cluster(operators=operators)
+        try:
+            cluster.load_dir(data_dir=args.data_dir, file_info=args.file_info)
+            commands = ['sql anylog format=json and stat=false "%s"' % query for query in QUERIES]
+            for command in commands: # warm up connections
+                rest.get.get_json(conn=cluster.conn, query=command)
+            cluster.stats.clear()
+
+            start = time.perf_counter()
+            for i in range(args.repeat):
+                for command in commands:
+                    rest.get.get_json(conn=cluster.conn, query=command)
+            duration = time.perf_counter() - start
+
+            stats = list(cluster.stats)
+            print('operators: %-3s queries: %s  total: %.2fms/query  fan-out: %.2fms  merge: %.2fms (median)' % (
+                operators, len(stats), duration * 1000 / len(stats),
+                statistics.median(stat['fanout'] for stat in stats) * 1000,
+                statistics.median(stat['merge'] for stat in stats) * 1000))
+        finally:
+            rest.get.close_sessions()
+            cluster.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Load & compare cost of expect files as JSON lines (json.loads per line, string compare per row) vs. the memory-mapped
+columnar form (support/columnar.py, typed arrays & vectorized compare) for every expect file that has one
+:sample:
+    python3 benchmarks/bench_columnar.py --expect-dir expect --repeat 5
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import support.columnar
+import support.golden
+import support.manifest
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--expect-dir', type=str, default=os.path.join(ROOT_DIR, 'expect'), help='directory with expect files')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is reported)')
+    args = parser.parse_args()
+
+    expect_files = [os.path.join(args.expect_dir, file_name) for file_name in sorted(support.manifest.load_manifest(args.expect_dir))]
+    expect_files = [expect_file for expect_file in expect_files if support.columnar.load(expect_file) is not None]
+    results = {}
+    for expect_file in expect_files:
+        with support.golden.open_expect(expect_file, 'r') as f:
+            results[expect_file] = [json.loads(line) for line in f if line.strip()]
+    rows = sum(len(data) for data in results.values())
+
+    def json_lines()->int:
+        support.golden.PERIOD_SOURCES.clear()
+        for expect_file, data in results.items():
+            with support.golden.open_expect(expect_file, 'r') as f:
+                expect = [json.loads(line) for line in f if line.strip()]
+            assert expect == data
+        return len(expect_files)
+
+    def columnar_load()->int:
+        support.columnar.COLUMNS.clear()
+        for expect_file in expect_files:
+            support.columnar.load(expect_file)
+        return len(expect_files)
+
+    def columnar_compare()->int:
+        support.columnar.COLUMNS.clear()
+        for expect_file, data in results.items():
+            assert support.columnar.compare(data, expect_file)['first'] is None
+        return len(expect_files)
+
+    print('expect files: %s  rows: %s' % (len(expect_files), rows))
+    for name, func in [('json lines load & compare', json_lines), ('columnar load (mmap)', columnar_load),
+                       ('columnar load & compare', columnar_compare)]:
+        durations = []
+        for i in range(args.repeat):
+            start = time.perf_counter()
+            func()
+            durations.append(time.perf_counter() - start)
+        print('%-28s best: %.4fs  per file: %.2f ms' % (name, min(durations), min(durations) * 1000 / len(expect_files)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Per call latency of support.convert.convert_timezone - previous implementation (strptime, astimezone & strftime per
+call) vs. the fast path (fixed layout parser & LRU cache of UTC offsets per hour) - and of the batch
+support.convert.convert_timezones per timestamp. Results are checked to be identical
+:sample:
+    TZ=America/New_York python3 benchmarks/bench_convert.py --timestamps 100000
+"""
+import argparse
+import datetime
+import os
+import random
+import sys
+import time
+
+from dateutil import tz
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import support.convert
+
+
+def convert_strptime(timestamp:str)->str:
+    """
+    Previous convert_timezone (w/o error handling)
+    """
+    subseconds = timestamp.split('.')[-1]
+    local_time = datetime.datetime.strptime(timestamp.split('.')[0], '%Y-%m-%d %H:%M:%S')
+    return local_time.astimezone(tz.tzutc()).strftime('%Y-%m-%d %H:%M:%S') + '.%s' % subseconds
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--timestamps', type=int, default=100000, help='number of timestamps')
+    parser.add_argument('--days', type=int, default=2, help='timestamps are spread over days from 2021-07-21 (the data set spans ~2 days)')
+    args = parser.parse_args()
+
+    random.seed(0)
+    start = datetime.datetime(2021, 7, 21)
+    timestamps = [(start + datetime.timedelta(seconds=random.randrange(args.days * 86400), microseconds=random.randrange(1000000))).strftime('%Y-%m-%d %H:%M:%S.%f')
+                  for i in range(args.timestamps)]
+
+    support.convert.hour_offset.cache_clear()
+    runs = [('strptime', lambda: [convert_strptime(timestamp) for timestamp in timestamps]),
+            ('fast path', lambda: [support.convert.convert_timezone('', timestamp) for timestamp in timestamps]),
+            ('fast path (warm)', lambda: [support.convert.convert_timezone('', timestamp) for timestamp in timestamps]),
+            ('batch', lambda: support.convert.convert_timezones('', timestamps))]
+    print('timestamps: %s  timezone: %s' % (args.timestamps, time.tzname))
+    expect = None
+    baseline = None
+    for name, func in runs:
+        begin = time.perf_counter()
+        results = func()
+        duration = time.perf_counter() - begin
+        expect = expect or results
+        assert results == expect, '%s results differ' % name
+        baseline = baseline or duration
+        print('%-18s %.3fs  per call: %.2f us  speedup: %.1fx' % (name, duration, duration * 1e6 / args.timestamps, baseline / duration))
+    print('offset cache: %s' % (support.convert.hour_offset.cache_info(),))
+
+
+if __name__ == '__main__':
+    main()
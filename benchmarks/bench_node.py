@@ -0,0 +1,58 @@
+"""
+Client throughput against the local stand-in node (simulator/node.py, started as a separate process) for an
+increasing number of client threads
+:sample:
+    python3 benchmarks/bench_node.py --queries 500 --threads 1 2 4 8
+"""
+import argparse
+import concurrent.futures
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+
+QUERIES = [
+    'SELECT COUNT(*) FROM ping_sensor;',
+    'SELECT MIN(value), AVG(value), MAX(value) FROM ping_sensor;',
+    "select count(*) from ping_sensor where timestamp < '2021-07-21T23:59:59Z'",
+    'select device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value) from ping_sensor group by device_name',
+    'select increments(minute, 10, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);'
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--queries', type=int, default=500, help='queries per run')
+    parser.add_argument('--threads', type=int, nargs='+', default=[1, 2, 4, 8], help='client threads per run')
+    args = parser.parse_args()
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    node = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'simulator', 'node.py'), '--port', str(port),
+                             '--data-dir', os.path.join(ROOT_DIR, 'data'), '--file-info', 'anylog.ping_sensor'],
+                            stdout=subprocess.PIPE, text=True)
+    while 'running' not in node.stdout.readline():
+        pass
+    conn = '127.0.0.1:%s' % port
+    commands = ['sql anylog format=json and stat=false "%s"' % QUERIES[i % len(QUERIES)] for i in range(args.queries)]
+    rest.get.set_pool(pool_size=max(args.threads), keep_alive=True)
+
+    for threads in args.threads:
+        start = time.perf_counter()
+        with concurrent.futures.ThreadPoolExecutor(max_workers=threads) as executor:
+            list(executor.map(lambda command: rest.get.get_json(conn=conn, query=command), commands))
+        duration = time.perf_counter() - start
+        print('threads: %-3s queries: %s  time: %.3fs  throughput: %.0f queries/s' % (threads, args.queries, duration, args.queries / duration))
+    rest.get.close_sessions()
+    node.terminate()
+
+
+if __name__ == '__main__':
+    main()
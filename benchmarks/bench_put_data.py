@@ -0,0 +1,72 @@
+"""
+Serial vs. parallel ingest of a directory of partition files with rest.put_data.put_data against the local stand-in
+node (simulator/node.py, started as a separate process). Partition files are generated by splitting the sample data
+:sample:
+    python3 benchmarks/bench_put_data.py --files 200 --workers 1 4 8
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+import rest.put_data
+
+
+def write_partitions(data_dir:str, files:int)->int:
+    """
+    Split the anylog.ping_sensor sample rows into files partition files
+    :return:
+        number of rows
+    """
+    rows = []
+    for file_name in sorted(os.listdir(os.path.join(ROOT_DIR, 'data'))):
+        if 'anylog.ping_sensor' in file_name:
+            with open(os.path.join(ROOT_DIR, 'data', file_name), 'r') as f:
+                rows += [line for line in f.read().split('\n') if line.strip()]
+    for i in range(files):
+        with open(os.path.join(data_dir, 'anylog.ping_sensor.%s.json' % i), 'w') as f:
+            f.write('\n'.join(rows))
+    return len(rows) * files
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--files', type=int, default=200, help='number of partition files')
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4, 8], help='concurrent uploads per run')
+    args = parser.parse_args()
+
+    data_dir = tempfile.mkdtemp(prefix='anylog_partitions_')
+    rows = write_partitions(data_dir, args.files)
+    rest.put_data.DATA_DIR = data_dir + os.sep
+    rest.get.set_pool(pool_size=max(args.workers), keep_alive=True)
+
+    try:
+        for workers in args.workers:
+            with socket.socket() as sock:
+                sock.bind(('127.0.0.1', 0))
+                port = sock.getsockname()[1]
+            node = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'simulator', 'node.py'), '--port', str(port)],
+                                    stdout=subprocess.PIPE, text=True)
+            while 'running' not in node.stdout.readline():
+                pass
+            try:
+                summary = rest.put_data.put_data(file_info='anylog.ping_sensor', conn='127.0.0.1:%s' % port, workers=workers)
+                print('workers: %-3s files: %s  rows: %s  MB: %.1f  time: %.3fs  throughput: %.0f rows/s' % (
+                    workers, len(summary['files']), rows, summary['bytes'] / 1e6, summary['duration'], rows / summary['duration']))
+            finally:
+                rest.get.close_sessions()
+                node.terminate()
+                node.wait()
+    finally:
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+Compare peak client memory of PUTting a large data file read whole (str(f.read()) as a single body) with the streamed
+uploads of rest.put_data.put_file (chunked single request & bounded row batches) against the local stand-in node
+(simulator/node.py, started as a separate process)
+:sample:
+    python3 benchmarks/bench_put_stream.py --rows 100000 --rows-per-request 10000
+"""
+import argparse
+import os
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+import rest.put_data
+from bench_stream_rows import measure
+
+HEADERS = {'type': 'json', 'dbms': 'anylog', 'table': 'ping_sensor', 'mode': 'file', 'Content-Type': 'text/plain'}
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='number of rows in data file')
+    parser.add_argument('--rows-per-request', type=int, default=10000, help='rows per request for batched upload')
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT_DIR, 'data', 'anylog.ping_sensor.0.20210721.json'), 'r') as f:
+        sample = [line for line in f.read().split('\n') if line.strip()]
+    data_dir = tempfile.mkdtemp(prefix='anylog_large_')
+    file_name = 'anylog.ping_sensor.large.json'
+    with open(os.path.join(data_dir, file_name), 'w') as f:
+        for i in range(args.rows):
+            f.write(sample[i % len(sample)] + '\n')
+    rest.put_data.DATA_DIR = data_dir + os.sep
+
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        port = sock.getsockname()[1]
+    node = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'simulator', 'node.py'), '--port', str(port)],
+                            stdout=subprocess.PIPE, text=True)
+    while 'running' not in node.stdout.readline():
+        pass
+    conn = '127.0.0.1:%s' % port
+
+    def whole_file()->int:
+        with open(os.path.join(data_dir, file_name), 'r') as f:
+            data = str(f.read())
+        rest.get.get_session(conn).put('http://%s' % conn, headers=HEADERS, data=data)
+        return 1
+
+    def chunked()->int:
+        return rest.put_data.put_file(file_name=file_name, conn=conn, headers=HEADERS)['requests']
+
+    def batched()->int:
+        return rest.put_data.put_file(file_name=file_name, conn=conn, headers=HEADERS, rows_per_request=args.rows_per_request)['requests']
+
+    try:
+        print('file: %s rows, %.1f MB' % (args.rows, os.path.getsize(os.path.join(data_dir, file_name)) / 1024 / 1024))
+        for name, func in [('whole file', whole_file), ('chunked', chunked), ('%s rows/request' % args.rows_per_request, batched)]:
+            requests, duration, peak = measure(func)
+            print('%-20s requests: %-4s time: %.3fs  peak memory: %.1f MB' % (name, requests, duration, peak / 1024 / 1024))
+    finally:
+        rest.get.close_sessions()
+        node.terminate()
+        shutil.rmtree(data_dir)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,110 @@
+"""
+Compare a fresh connection per query (requests.get) with the pooled sessions in rest.get against a local stand-in
+server that answers every query with a small {"Query": [...]} result
+:sample:
+    python3 benchmarks/bench_rest_get.py --queries 2000
+"""
+import argparse
+import http.server
+import json
+import os
+import sys
+import threading
+import time
+
+import requests
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+
+RESULT = json.dumps({'Query': [{'count(*)': '25862'}]}).encode()
+
+
+class StandInHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1' # allow keep-alive
+    disable_nagle_algorithm = True # headers & body are separate writes
+    result = RESULT
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(self.result)))
+        self.end_headers()
+        self.wfile.write(self.result)
+
+    def log_message(self, *args):
+        pass
+
+
+def start_server(result:bytes=RESULT)->http.server.ThreadingHTTPServer:
+    """
+    Start stand-in server on a random local port
+    :args:
+        result:bytes - body returned for every GET request
+    :return:
+        server
+    """
+    handler = type('StandInHandler', (StandInHandler,), {'result': result})
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run_unpooled(conn:str, query:str, queries:int)->float:
+    """
+    Execute queries with a new connection per query (previous rest.get behavior)
+    :return:
+        wall time
+    """
+    start = time.perf_counter()
+    for i in range(queries):
+        r = requests.get('http://%s' % conn, headers={'command': query, 'User-Agent': 'AnyLog/1.23'}, timeout=30)
+        r.json()
+    return time.perf_counter() - start
+
+
+def run_pooled(conn:str, query:str, queries:int)->float:
+    """
+    Execute queries via rest.get.get_json
+    :return:
+        wall time
+    """
+    start = time.perf_counter()
+    for i in range(queries):
+        rest.get.get_json(conn=conn, query=query)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--conn', type=str, default=None, help='REST node to use instead of the built-in stand-in server')
+    parser.add_argument('--queries', type=int, default=1000, help='number of queries per run')
+    parser.add_argument('--pool-size', type=int, default=10, help='pooled connections per node')
+    args = parser.parse_args()
+
+    conn = args.conn
+    if conn is None:
+        server = start_server()
+        conn = '127.0.0.1:%s' % server.server_address[1]
+    query = 'sql anylog format=json and stat=false "SELECT COUNT(*) FROM ping_sensor;"'
+    rest.get.set_pool(pool_size=args.pool_size, keep_alive=True)
+
+    # warm-up
+    run_unpooled(conn, query, 10)
+    run_pooled(conn, query, 10)
+
+    unpooled = run_unpooled(conn, query, args.queries)
+    pooled = run_pooled(conn, query, args.queries)
+    rest.get.close_sessions()
+
+    print('queries: %s' % args.queries)
+    print('requests.get (new connection): %.3fs (%.3fms/query)' % (unpooled, unpooled * 1000 / args.queries))
+    print('rest.get (pooled session):     %.3fs (%.3fms/query)' % (pooled, pooled * 1000 / args.queries))
+    print('speedup: %.2fx' % (unpooled / pooled))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+"""
+Compare peak client memory of rest.get.get_json (whole response materialized) with rest.get.get_json_stream (rows
+decoded off the socket one at a time) for a large {"Query": [...]} result
+:sample:
+    python3 benchmarks/bench_stream_rows.py --rows 200000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+from bench_rest_get import start_server
+
+
+def measure(func)->tuple:
+    """
+    Execute func & measure wall time and peak traced memory
+    :return:
+        row count, wall time, peak memory (bytes)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    rows = func()
+    duration = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return rows, duration, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='number of rows in result set')
+    args = parser.parse_args()
+
+    rows = [{'timestamp': '2021-07-22 01:59:59.%06d' % (i % 1000000), 'value': '%s.0' % (i % 48)} for i in range(args.rows)]
+    result = json.dumps({'Query': rows}).encode()
+    del rows
+    server = start_server(result=result)
+    conn = '127.0.0.1:%s' % server.server_address[1]
+    query = 'sql anylog format=json and stat=false "select timestamp, value from ping_sensor order by timestamp"'
+
+    def materialized()->int:
+        return len(rest.get.get_json(conn=conn, query=query))
+
+    def streamed()->int:
+        count = 0
+        for row in rest.get.get_json_stream(conn=conn, query=query):
+            count += 1
+        return count
+
+    print('result: %s rows, %.1f MB' % (args.rows, len(result) / 1024 / 1024))
+    for name, func in [('get_json', materialized), ('get_json_stream', streamed)]:
+        count, duration, peak = measure(func)
+        print('%-16s rows: %s  time: %.3fs  peak memory: %.1f MB' % (name, count, duration, peak / 1024 / 1024))
+    rest.get.close_sessions()
+
+
+if __name__ == '__main__':
+    main()
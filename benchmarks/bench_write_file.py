@@ -0,0 +1,65 @@
+"""
+Write a large result set as a results file - per row json.dumps & write (previous support.file.write_file) vs. the
+batched, buffered support.file.write_file (plain & gzip). The plain outputs are checked to be byte-identical
+:sample:
+    python3 benchmarks/bench_write_file.py --rows 100000 --repeat 5
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import support.file
+
+
+def write_rows(data:list, results_file:str):
+    """
+    Previous write_file - json.dumps & write per row
+    """
+    with open(results_file, 'w') as f:
+        for row in data:
+            f.write(json.dumps(row) + '\n')
+
+
+def main():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000, help='number of rows in result set')
+    parser.add_argument('--repeat', type=int, default=5, help='number of runs (best is reported)')
+    args = parser.parse_args()
+
+    with open(os.path.join(ROOT_DIR, 'data', 'anylog.ping_sensor.0.20210721.json'), 'r') as f:
+        sample = [json.loads(line) for line in f.read().split('\n') if line.strip()]
+    data = [{'timestamp': sample[i % len(sample)]['timestamp'], 'value': str(float(sample[i % len(sample)]['value']))}
+            for i in range(args.rows)]
+
+    results_dir = tempfile.mkdtemp(prefix='anylog_results_')
+    runs = [('per row', lambda results_file: write_rows(data, results_file), 'per_row.json'),
+            ('buffered', lambda results_file: support.file.write_file('', data, results_file), 'buffered.json'),
+            ('buffered gzip', lambda results_file: support.file.write_file('', data, results_file), 'buffered.json.gz')]
+    try:
+        baseline = None
+        for name, func, file_name in runs:
+            results_file = os.path.join(results_dir, file_name)
+            durations = []
+            for i in range(args.repeat):
+                start = time.perf_counter()
+                func(results_file)
+                durations.append(time.perf_counter() - start)
+            baseline = baseline or min(durations)
+            print('%-14s best: %.4fs  %.0f rows/s  size: %.1f MB  speedup: %.1fx' % (
+                name, min(durations), args.rows / min(durations), os.path.getsize(results_file) / 1e6, baseline / min(durations)))
+        with open(os.path.join(results_dir, 'per_row.json'), 'rb') as f1, open(os.path.join(results_dir, 'buffered.json'), 'rb') as f2:
+            assert f1.read() == f2.read(), 'buffered output differs from per row output'
+        print('outputs identical')
+    finally:
+        shutil.rmtree(results_dir)
+
+
+if __name__ == '__main__':
+    main()
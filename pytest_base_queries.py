@@ -1,7 +1,5 @@
-import filecmp
 import os
 import sys
-import time
 
 rest_dir = os.path.expandvars(os.path.expanduser('$HOME/testing/rest'))
 support_dir = os.path.expandvars(os.path.expanduser('$HOME/testing/support'))
@@ -27,7 +25,7 @@ class TestBaseQueries:
         :process:
             1. prepare config
             2. create actual_dir if not exists 
-            3. insert data if valid
+            3. insert data if valid & wait until all rows are visible
         :param:
             self.cmd:str - AnyLog SQL wrapper
             self.config:dict - config info
@@ -57,11 +55,46 @@ class TestBaseQueries:
             self.config['timeout'] = int(self.config['timeout']) 
         except: 
             self.config['timeout'] = 30 
+        try: 
+            self.config['pool_size'] = int(self.config['pool_size'])
+        except: 
+            self.config['pool_size'] = 10 
+        try: 
+            self.config['max_in_flight'] = int(self.config['max_in_flight'])
+        except: 
+            self.config['max_in_flight'] = 5 
+        try: 
+            self.config['expected_rows'] = int(self.config['expected_rows'])
+        except: 
+            self.config['expected_rows'] = 25862 
+        try: 
+            self.config['ingest_workers'] = int(self.config['ingest_workers'])
+        except: 
+            self.config['ingest_workers'] = 1 
+        try: 
+            self.config['rows_per_request'] = int(self.config['rows_per_request'])
+        except: 
+            self.config['rows_per_request'] = 0 
+        try: 
+            self.config['ingest_deadline'] = float(self.config['ingest_deadline'])
+        except: 
+            self.config['ingest_deadline'] = 60 
+        if self.config.get('oracle', 'false') == 'true': 
+            from support import oracle # requires numpy - imported only if the reference engine is enabled 
+            support.file.ORACLE = oracle.load_table(data_dir=rest.put_data.DATA_DIR, file_info='anylog.ping_sensor')
+            self.config['expected_rows'] = support.file.ORACLE.rows 
+        support.file.set_columnar(enabled=self.config.get('columnar', 'false') == 'true')
+        rest.get.set_pool(pool_size=self.config['pool_size'], keep_alive=self.config.get('keep_alive', 'true') == 'true')
+        rest.get.set_cache(enabled=self.config.get('cache', 'true') == 'true')
 
         # validate publish_conn & query_conn / insert data 
         if self.config['insert'] == 'true' and rest.get.get_status(conn=self.config['publish_conn'], auth=self.config['auth'], timeout=self.config['timeout']):
-            rest.put_data.put_data(file_info='anylog.ping_sensor', conn=self.config['publish_conn'], auth=self.config['auth'], timeout=self.config['timeout'])
-            time.sleep(10)
+            rest.put_data.put_data(file_info='anylog.ping_sensor', conn=self.config['publish_conn'], auth=self.config['auth'], timeout=self.config['timeout'],
+                                   workers=self.config['ingest_workers'], rows_per_request=self.config['rows_per_request'])
+            latency = rest.get.wait_for_count(conn=self.config['query_conn'], query=self.cmd % 'SELECT COUNT(*) FROM ping_sensor',
+                                              expected=self.config['expected_rows'], remote=True, auth=self.config['auth'],
+                                              timeout=self.config['timeout'], deadline=self.config['ingest_deadline'])
+            print('%s rows visible on %s %.3f seconds after insert' % (self.config['expected_rows'], self.config['query_conn'], latency))
         elif self.config['insert'] == 'true':
             assert True == False, 'Faild to get status from: %s' % self.config['publish_conn']
 
@@ -69,6 +102,26 @@ class TestBaseQueries:
         if not rest.get.get_status(conn=self.config['query_conn'], auth=self.config['auth'], timeout=self.config['timeout']):
             assert True == False, 'Failed to get status from: %s' % self.config['query_conn']
 
+    def teardown_class(self): 
+        """
+        Close pooled REST sessions & drop memoized results
+        """
+        rest.get.close_sessions()
+        rest.get.set_cache(enabled=False)
+        support.file.ORACLE = None
+        support.file.set_columnar(enabled=False)
+
+    def check_oracle(self, query:str, output:list, order_by:str=None): 
+        """
+        Assert results are equal to those computed by the reference engine (support.file.ORACLE) 
+        :args: 
+            query:str - query executed 
+            output:list - results 
+            order_by:str - column rows are matched by (GROUP BY results in any order) 
+        """
+        reason = support.file.ORACLE.verify(query=query, data=output, order_by=order_by)
+        assert reason is None, 'Failed Query: %s (%s)' % (query, reason)
+
     # Basic aggregate
     def test_aggregates_count(self):
         """
@@ -83,7 +136,10 @@ class TestBaseQueries:
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
 
-        assert int(output[0]['count(*)']) == 25862, 'Failed Query: %s' % self.cmd % query
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+        else: 
+            assert int(output[0]['count(*)']) == 25862, 'Failed Query: %s' % self.cmd % query
 
     def test_aggregates_min(self):
         """
@@ -98,7 +154,10 @@ class TestBaseQueries:
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
 
-        assert float(output[0]['min(value)']) == 0.0, 'Failed Query: %s' % self.cmd % query
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+        else: 
+            assert float(output[0]['min(value)']) == 0.0, 'Failed Query: %s' % self.cmd % query
 
     def test_aggregates_avg(self):
         """
@@ -112,7 +171,10 @@ class TestBaseQueries:
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
 
-        assert float(output[0]['avg(value)']) == 14.885159693759183, 'Failed Query: %s' % self.cmd % query
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+        else: 
+            assert float(output[0]['avg(value)']) == 14.885159693759183, 'Failed Query: %s' % self.cmd % query
 
     def test_aggregates_max(self):
         """
@@ -127,7 +189,10 @@ class TestBaseQueries:
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
 
-        assert float(output[0]['max(value)']) == 48.0, 'Failed Query: %s' % self.cmd % query
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+        else: 
+            assert float(output[0]['max(value)']) == 48.0, 'Failed Query: %s' % self.cmd % query
 
     def test_aggregates_sum(self):
         """
@@ -141,7 +206,10 @@ class TestBaseQueries:
         query = 'SELECT SUM(value) FROM ping_sensor;'
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True,
                 auth=self.config['auth'], timeout=self.config['timeout'])
-        assert float(output[0]['sum(value)']) == 384960.0, 'Failed Query: %s' % self.cmd % query
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+        else: 
+            assert float(output[0]['sum(value)']) == 384960.0, 'Failed Query: %s' % self.cmd % query
 
     # ORDER BY
     def test_order_by(self):
@@ -234,8 +302,8 @@ class TestBaseQueries:
 
         if len(output) == row_count:
             file_name = 'base_queries_test_where_less_than.json'
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_where_greater_than(self):
         """
@@ -263,8 +331,8 @@ class TestBaseQueries:
 
         if len(output) == row_count:
             file_name = 'base_queries_test_where_greater_than.json'
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_where_mid_day(self):
         """
@@ -292,8 +360,8 @@ class TestBaseQueries:
 
         if len(output) == row_count: 
             file_name = 'base_queries_test_where_mid_day.json' 
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_where_end_day(self):
         """
@@ -344,15 +412,15 @@ class TestBaseQueries:
                 auth=self.config['auth'], timeout=self.config['timeout'])
         row_count = int(output[0]['count(*)'])
 
-        query = "select timestamp, value from ping_sensor where timestamp <= '2021-07-21T23:59:59Z' OR timestamp >= '2021-07-23T00:00:00's order by timestamp"
+        query = "select timestamp, value from ping_sensor where timestamp <= '2021-07-21T23:59:59Z' OR timestamp >= '2021-07-23T00:00:00' order by timestamp"
         output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
                 auth=self.config['auth'], timeout=self.config['timeout'])
         assert len(output) == row_count, 'Failed Query: %s' % cmd % query
 
         if len(output) == row_count:
             file_name = 'base_queries_test_where_or.json'
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_where_variable(self):
         """
@@ -366,12 +434,18 @@ class TestBaseQueries:
         query = "select count(*) from ping_sensor where device_name='VM Lit SL NMS'"
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
-        assert int(output[0]['count(*)']) == 5049, 'Failed Query: %s' % self.cmd % query 
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+        else: 
+            assert int(output[0]['count(*)']) == 5049, 'Failed Query: %s' % self.cmd % query 
 
 
         query = "select min(timestamp), max(timestamp), min(value), avg(value), max(value) from ping_sensor where device_name='VM Lit SL NMS'"
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output)
+            return 
         if self.config['convert_timezone'] == 'true':
             assert support.convert.convert_timezone(query=self.cmd % query, timestamp=output[0]['min(timestamp)']) == '2021-07-21 22:18:58.765161', 'Failed Query: %s' % self.cmd % query
             assert support.convert.convert_timezone(query=self.cmd % query, timestamp=output[0]['max(timestamp)']) == '2021-07-23 01:59:14.737836', 'Failed Query: %s' % self.cmd % query
@@ -408,9 +482,8 @@ class TestBaseQueries:
 
         if len(output) == row_count:
             file_name = 'base_queries_test_where_mid_day_and_variable.json'
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name,
-                               self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_where_end_day_and_variable(self):
         """
@@ -524,14 +597,16 @@ class TestBaseQueries:
         query = "select device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value) from ping_sensor group by device_name"
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output, order_by='device_name')
+            return 
+        if self.config['convert_timezone'] == 'true':
+            output = support.convert.convert_rows(query=self.cmd % query, rows=output)
         for row in output: 
             for result in expect_results:
                 if row['device_name'] == result['device_name']: 
                     for key in row:
-                        if 'timestamp' in key and self.config['convert_timezone'] == 'true':
-                            assert support.convert.convert_timezone(query=self.cmd % query, timestamp=row[key]) == result[key], 'Failed Query: %s' % self.cmd % query 
-                        else: 
-                            assert row[key] == result[key], 'Failed Query: %s' % self.cmd % query 
+                        assert row[key] == result[key], 'Failed Query: %s' % self.cmd % query 
 
     # basic complex queries
 
@@ -557,14 +632,16 @@ class TestBaseQueries:
         query = "select device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor where timestamp >= '2021-07-22T13:00:00Z' AND timestamp <= '2021-07-22T16:00:00Z' group by device_name" 
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output, order_by='device_name')
+            return 
+        if self.config['convert_timezone'] == 'true':
+            output = support.convert.convert_rows(query=self.cmd % query, rows=output)
         for row in output: 
             for result in expect_results:
                 if row['device_name'] == result['device_name']: 
                     for key in row:
-                        if 'timestamp' in key and self.config['convert_timezone'] == 'true':
-                            assert support.convert.convert_timezone(query=self.cmd % query, timestamp=row[key]) == result[key], 'Failed Query: %s' % self.cmd % query 
-                        else: 
-                            assert row[key] == result[key], 'Failed Query: %s' % self.cmd % query
+                        assert row[key] == result[key], 'Failed Query: %s' % self.cmd % query
 
     def test_complex_query_end_day(self): 
         """
@@ -587,14 +664,16 @@ class TestBaseQueries:
         query = "select device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor where timestamp >= '2021-07-21T22:00:00Z' AND timestamp <= '2021-07-22T01:00:00Z' group by device_name" 
         output = rest.get.get_json(conn=self.config['query_conn'], query=self.cmd % query, remote=True, 
                 auth=self.config['auth'], timeout=self.config['timeout']) 
+        if support.file.ORACLE is not None: 
+            self.check_oracle(query=self.cmd % query, output=output, order_by='device_name')
+            return 
+        if self.config['convert_timezone'] == 'true':
+            output = support.convert.convert_rows(query=self.cmd % query, rows=output)
         for row in output: 
             for result in expect_results:
                 if row['device_name'] == result['device_name']: 
                     for key in row:
-                        if 'timestamp' in key and self.config['convert_timezone'] == 'true':
-                            assert support.convert.convert_timezone(query=self.cmd % query, timestamp=row[key]) == result[key], 'Failed Query: %s' % self.cmd % query 
-                        else: 
-                            assert row[key] == result[key], 'Failed Query: %s' % self.cmd % query 
+                        assert row[key] == result[key], 'Failed Query: %s' % self.cmd % query 
 
 
     # increments
@@ -614,13 +693,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 10, 30, 60]:
-            query = "select increments(minute, %s, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout']) 
+        increments = [1, 10, 30, 60]
+        queries = ["select increments(minute, %s, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_increments_minute%s.json' % increment  
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_increments_hour(self):
         """
@@ -636,13 +716,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 6, 12, 24]:
-            query = "select increments(hour, %s, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout']) 
+        increments = [1, 6, 12, 24]
+        queries = ["select increments(hour, %s, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_increments_hour%s.json' % increment  
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_increments_day(self):
         """
@@ -658,13 +739,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 3, 5, 7]:
-            query = "select increments(day, %s, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                                       auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 3, 5, 7]
+        queries = ["select increments(day, %s, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor order by min(timestamp);" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_increments_day%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_increments_group_by(self):
         """
@@ -680,13 +762,14 @@ class TestBaseQueries:
         else:
             cmd = self.cmd
 
-        for increment in ['minute', 'hour', 'day']:
-            query = "select increments(%s, 1, timestamp), device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor group by device_name order by min(timestamp);" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                                       auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = ['minute', 'hour', 'day']
+        queries = ["select increments(%s, 1, timestamp), device_name, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor group by device_name order by min(timestamp);" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_increments_group_by_%s.json' % increment
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_increments_where_mid_day(self):
         """
@@ -702,13 +785,14 @@ class TestBaseQueries:
         else:
             cmd = self.cmd
 
-        for increment in ['minute', 'hour', 'day']:
-            query = "select increments(%s, 1, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor where timestamp >= '2021-07-22T13:00:00Z' AND timestamp <= '2021-07-22T16:00:00Z' order by min(timestamp);" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                                       auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = ['minute', 'hour', 'day']
+        queries = ["select increments(%s, 1, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor where timestamp >= '2021-07-22T13:00:00Z' AND timestamp <= '2021-07-22T16:00:00Z' order by min(timestamp);" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_increments_where_mid_day_%s.json' % increment
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_increments_where_between_days(self):
         """
@@ -724,13 +808,14 @@ class TestBaseQueries:
         else:
             cmd = self.cmd
 
-        for increment in ['minute', 'hour', 'day']:
-            query = "select increments(%s, 1, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor where timestamp >= '2021-07-22T13:00:00Z' AND timestamp <= '2021-07-22T16:00:00Z' order by min(timestamp);" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                                       auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = ['minute', 'hour', 'day']
+        queries = ["select increments(%s, 1, timestamp), min(timestamp), max(timestamp), min(value), avg(value), max(value), count(*) from ping_sensor where timestamp >= '2021-07-22T13:00:00Z' AND timestamp <= '2021-07-22T16:00:00Z' order by min(timestamp);" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_increments_where_between_days_%s.json' % increment
-            support.file.write_file(query=cmd % query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=cmd % query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_minute(self):
         """
@@ -746,13 +831,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 10, 30, 60]:
-            query = "select timestamp, value from ping_sensor where period(minute, %s, now(), timestamp) order by timestamp;" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 10, 30, 60]
+        queries = ["select timestamp, value from ping_sensor where period(minute, %s, now(), timestamp) order by timestamp;" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_period_minute%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_hour(self):
         """
@@ -768,13 +854,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 6, 12, 24]:
-            query = "select timestamp, value from ping_sensor where period(hour, %s, now(), timestamp) order by timestamp;" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 6, 12, 24]
+        queries = ["select timestamp, value from ping_sensor where period(hour, %s, now(), timestamp) order by timestamp;" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_period_hour%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_day(self):
         """
@@ -790,13 +877,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 3, 5, 7]:
-            query = "select timestamp, value from ping_sensor where period(day, %s, now(), timestamp) order by timestamp;" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 3, 5, 7]
+        queries = ["select timestamp, value from ping_sensor where period(day, %s, now(), timestamp) order by timestamp;" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_period_day%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_group(self):
         """
@@ -812,14 +900,14 @@ class TestBaseQueries:
         else:
             cmd = self.cmd
 
-        for interval in ['minute', 'hour', 'day']:
-            query = "SELECT device_name, parentelement, webid, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(value) from ping_sensor where period(%s, 1, now(), timestamp) group by device_name, parentelement, webid order by min(timestamp)" % interval
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        intervals = ['minute', 'hour', 'day']
+        queries = ["SELECT device_name, parentelement, webid, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(value) from ping_sensor where period(%s, 1, now(), timestamp) group by device_name, parentelement, webid order by min(timestamp)" % interval for interval in intervals]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for interval, query, output in zip(intervals, queries, outputs):
             file_name = 'base_queries_test_period_group_%s.json' % interval
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name,
-                               self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_historic_minute(self):
         """
@@ -835,13 +923,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 10, 30, 60]:
-            query = "select timestamp, value from ping_sensor where period(minute, %s, '2021-07-22T15:30:45', timestamp) order by timestamp;" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 10, 30, 60]
+        queries = ["select timestamp, value from ping_sensor where period(minute, %s, '2021-07-22T15:30:45', timestamp) order by timestamp;" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_period_historic_minute%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_historic_hour(self):
         """
@@ -857,13 +946,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 6, 12, 24]:
-            query = "select timestamp, value from ping_sensor where period(hour, %s, '2021-07-22T15:30:45', timestamp) order by timestamp;" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 6, 12, 24]
+        queries = ["select timestamp, value from ping_sensor where period(hour, %s, '2021-07-22T15:30:45', timestamp) order by timestamp;" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_period_historic_hour%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_historic_day(self):
         """
@@ -879,13 +969,14 @@ class TestBaseQueries:
             cmd = self.cmd.replace('format', 'timezone=utc and format')
         else:
             cmd = self.cmd
-        for increment in [1, 3, 5, 7]:
-            query = "select timestamp, value from ping_sensor where period(day, %s, '2021-07-22T15:30:45', timestamp) order by timestamp;" % increment
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        increments = [1, 3, 5, 7]
+        queries = ["select timestamp, value from ping_sensor where period(day, %s, '2021-07-22T15:30:45', timestamp) order by timestamp;" % increment for increment in increments]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for increment, query, output in zip(increments, queries, outputs):
             file_name = 'base_queries_test_period_historic_day%s.json' % increment
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name, self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
 
     def test_period_historic_group(self):
         """
@@ -901,11 +992,11 @@ class TestBaseQueries:
         else:
             cmd = self.cmd
 
-        for interval in ['minute', 'hour', 'day']:
-            query = "SELECT device_name, parentelement, webid, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(value) from ping_sensor where period(%s, 1, '2021-07-22T15:30:45', timestamp) group by device_name, parentelement, webid order by min(timestamp)" % interval
-            output = rest.get.get_json(conn=self.config['query_conn'], query=cmd % query, remote=True,
-                    auth=self.config['auth'], timeout=self.config['timeout'])
+        intervals = ['minute', 'hour', 'day']
+        queries = ["SELECT device_name, parentelement, webid, min(timestamp), max(timestamp), min(value), avg(value), max(value), count(value) from ping_sensor where period(%s, 1, '2021-07-22T15:30:45', timestamp) group by device_name, parentelement, webid order by min(timestamp)" % interval for interval in intervals]
+        outputs = rest.get.gather_queries(conn=self.config['query_conn'], queries=[cmd % query for query in queries], remote=True,
+                auth=self.config['auth'], timeout=self.config['timeout'], max_in_flight=self.config['max_in_flight'])
+        for interval, query, output in zip(intervals, queries, outputs):
             file_name = 'base_queries_test_period_historic_group_%s.json' % interval
-            support.file.write_file(query=query, data=output, results_file=self.config['actual_dir'] + file_name)
-            assert filecmp.cmp(self.config['expect_dir'] + file_name,
-                               self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
\ No newline at end of file
+            assert support.file.compare_file(query=query, data=output, expect_file=self.config['expect_dir'] + file_name,
+                                             results_file=self.config['actual_dir'] + file_name), 'Failed Query: %s' % cmd % query
\ No newline at end of file
@@ -1,16 +1,107 @@
+import asyncio
+import codecs
+import concurrent.futures
+import functools
+import json
+import re
+import threading
+import time
 import requests
+import requests.adapters
 
-def get(conn:str, query:str, remote:str=False, auth:tuple=(), timeout:int=30)->requests.models.Response: 
+POOL_SIZE = 10 # max number of persistent connections kept per conn
+KEEP_ALIVE = True # whether connections are reused between requests
+SESSIONS = {} # conn -> requests.Session shared by the whole (pytest) session
+SESSIONS_LOCK = threading.Lock()
+ROW_SEPARATOR = re.compile(r'[\s,]*') # whitespace & commas between rows of a streamed Query
+VALUE_DELIMITERS = ' \t\n\r,]}' # characters that may follow a complete scalar value
+CACHE_ENABLED = False # whether responses are memoized for the (pytest) session
+CACHE = {} # (conn, command, destination) -> requests.models.Response
+CACHE_STATS = {'hits': 0, 'misses': 0}
+CACHE_LOCK = threading.Lock()
+
+def set_pool(pool_size:int=10, keep_alive:bool=True): 
+    """
+    Set connection pool params - existing sessions are closed so new values take effect
+    :args:
+        pool_size:int - max number of persistent connections per conn
+        keep_alive:bool - whether to reuse connections between requests
+    :global:
+        POOL_SIZE:int - pool_size
+        KEEP_ALIVE:bool - keep_alive
+    """
+    global POOL_SIZE, KEEP_ALIVE
+    close_sessions()
+    POOL_SIZE = pool_size
+    KEEP_ALIVE = keep_alive
+
+def get_session(conn:str)->requests.Session: 
+    """
+    Get (or create) the pooled session for a connection
+    :args:
+        conn:str - connection
+    :params:
+        session:requests.Session - session for conn
+        adapter:requests.adapters.HTTPAdapter - connection pool for session
+    :return:
+        session
+    """
+    with SESSIONS_LOCK: 
+        if conn not in SESSIONS: 
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(pool_connections=1, pool_maxsize=POOL_SIZE)
+            session.mount('http://', adapter)
+            if KEEP_ALIVE is False: 
+                session.headers['Connection'] = 'close'
+            SESSIONS[conn] = session
+        session = SESSIONS[conn]
+
+    return session
+
+def close_sessions(): 
+    """
+    Close all pooled sessions
+    """
+    with SESSIONS_LOCK: 
+        for conn in list(SESSIONS): 
+            try: 
+                SESSIONS.pop(conn).close()
+            except Exception: 
+                pass
+
+def set_cache(enabled:bool=True): 
+    """
+    Enable / disable memoization of (successful) responses - cached responses are dropped either way
+    :args:
+        enabled:bool - whether to memoize responses
+    :global:
+        CACHE_ENABLED:bool - enabled
+    """
+    global CACHE_ENABLED
+    clear_cache()
+    CACHE_ENABLED = enabled
+
+def clear_cache(): 
+    """
+    Drop memoized responses - called after data is ingested (rest.put_data.put_data)
+    """
+    with CACHE_LOCK: 
+        CACHE.clear()
+
+def get(conn:str, query:str, remote:str=False, auth:tuple=(), timeout:int=30, stream:bool=False, cache:bool=True)->requests.models.Response: 
     """
-    Execute GET requests
+    Execute GET requests using the pooled session of conn
     :args:
         conn:str - connection
         query:str - query to execute
         remote:str - whether query is remote or note
         auth:tuple - REST authentication
         timeout:int - timeout 
+        stream:bool - if True, the body is not read until accessed (never cached)
+        cache:bool - if False, the query is always sent (even if CACHE_ENABLED)
     :params: 
         headers:dict - headers to execute 
+        key:tuple - (conn, command, destination) memo key
         r:requests.models.Response - results from request
     :return: 
         r
@@ -22,23 +113,37 @@ def get(conn:str, query:str, remote:str=False, auth:tuple=(), timeout:int=30)->r
     if remote == True: 
         headers['destination'] = 'network'
 
+    key = (conn, query, headers.get('destination'))
+    cache = cache is True and CACHE_ENABLED is True and stream is False
+    if cache is True: 
+        with CACHE_LOCK: 
+            if key in CACHE: 
+                CACHE_STATS['hits'] += 1
+                return CACHE[key]
+
     try: 
-        r = requests.get('http://%s' % conn, headers=headers, auth=auth, timeout=timeout)
+        r = get_session(conn).get('http://%s' % conn, headers=headers, auth=auth, timeout=timeout, stream=stream)
     except Exception as e: 
         assert True == False, 'Failed execute query on %s (Error: %s).\n\tQuery: %s\n' % (conn, e, query)
     else: 
         if int(r.status_code) != 200: 
             assert True == False, 'Failed to execute query on %s due to network error %s.\n\tQuery: %s\n' % (conn, r.status_code, query)
 
+    if cache is True: 
+        with CACHE_LOCK: 
+            CACHE_STATS['misses'] += 1
+            CACHE[key] = r
+
     return r
 
-def get_status(conn:str, auth:tuple=(), timeout:int=30)->bool: 
+def get_status(conn:str, auth:tuple=(), timeout:int=30, cache:bool=True)->bool: 
     """
     Check whether am able to get status
     :args:
         conn:str - connection
         auth:tuple - REST authentication
         timeout:int - timeout 
+        cache:bool - whether a memoized status may be used
     :params: 
         status:bool 
         r:requests.models.Response - results from request
@@ -50,7 +155,7 @@ def get_status(conn:str, auth:tuple=(), timeout:int=30)->bool:
     status = True
     cmd = 'get status'
 
-    r = get(conn=conn, query=cmd, auth=auth, timeout=timeout)
+    r = get(conn=conn, query=cmd, auth=auth, timeout=timeout, cache=cache)
     if r != None: 
         try: 
             output = r.text
@@ -62,7 +167,7 @@ def get_status(conn:str, auth:tuple=(), timeout:int=30)->bool:
 
     return True
 
-def get_json(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30)->list: 
+def get_json(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30, cache:bool=True)->list: 
     """
     Execute GET query & extract results
     :args:
@@ -71,6 +176,7 @@ def get_json(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30
         remote:str - whether query is remote or note
         auth:tuple - REST authentication
         timeout:int - timeout 
+        cache:bool - whether a memoized result may be used (results are decoded per call, so callers may modify them)
     :params: 
         r:requests.models.Response - results from request
         raw_data:dict - raw data 
@@ -79,7 +185,7 @@ def get_json(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30
         output
     """
     output = [] 
-    r = get(conn=conn, query=query, remote=remote, auth=auth, timeout=timeout)
+    r = get(conn=conn, query=query, remote=remote, auth=auth, timeout=timeout, cache=cache)
     if r != None: 
         try: 
             raw_data= r.json()
@@ -93,3 +199,256 @@ def get_json(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30
 
     return output 
 
+def wait_for_count(conn:str, query:str, expected:int, remote:str=True, auth:tuple=(), timeout:int=30, deadline:float=60, 
+                   initial_delay:float=0.05, max_delay:float=2)->float: 
+    """
+    Poll a COUNT query (never cached) with exponential backoff until it returns the expected row count
+    :args:
+        conn:str - connection
+        query:str - COUNT query to execute (ex. sql anylog format=json and stat=false "SELECT COUNT(*) FROM ping_sensor")
+        expected:int - expected row count
+        remote:str - whether query is remote or note
+        auth:tuple - REST authentication
+        timeout:int - timeout per request
+        deadline:float - max number of seconds to wait
+        initial_delay:float - seconds to wait after the first poll, doubled after every poll
+        max_delay:float - max seconds between polls
+    :params:
+        start:float - time polling started
+        count:int - row count of the last poll (None if the query failed - ex. table not created yet)
+        delay:float - seconds until next poll
+    :return:
+        number of seconds until the expected count was visible
+    """
+    start = time.monotonic()
+    delay = initial_delay
+    count = None
+    while True: 
+        try: 
+            output = get_json(conn=conn, query=query, remote=remote, auth=auth, timeout=timeout, cache=False)
+            count = int(list(output[0].values())[0])
+        except (AssertionError, IndexError, ValueError): 
+            count = None
+
+        if count is not None and count >= expected: 
+            if count > expected: 
+                assert True == False, 'Row count %s on %s exceeds expected count %s.\n\tQuery: %s\n' % (count, conn, expected, query)
+            return time.monotonic() - start
+
+        remaining = deadline - (time.monotonic() - start)
+        if remaining <= 0: 
+            assert True == False, 'Row count on %s is %s after %s seconds (expected %s).\n\tQuery: %s\n' % (conn, count, deadline, expected, query)
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, max_delay)
+
+def value_complete(buffer:str, start:int, end:int, eof:bool)->bool:
+    """
+    Whether a value decoded from buffer[start:end] is complete - a value that ends with the buffer may be truncated, and
+    a scalar (number, true, false, null) must also be followed by a delimiter, as a prefix of a number is valid JSON
+    (ex. 2 of 2.5 when a chunk ends with "2.")
+    :args:
+        buffer:str - data read
+        start:int - position of the value
+        end:int - position after the decoded value
+        eof:bool - whether the stream has ended
+    """
+    if eof is True:
+        return True
+    if end == len(buffer):
+        return False
+    return buffer[start] in '{["' or buffer[end] in VALUE_DELIMITERS
+
+def iter_query_rows(chunks, query:str=''):
+    """
+    Incrementally decode a {"Query": [...]} envelope, yielding each row as soon as it is complete
+    :args:
+        chunks - iterable of bytes (or str) making up the response body
+        query:str - query executed
+    :params:
+        decoder:json.JSONDecoder - decodes a single JSON value at a time
+        text_decoder - incremental UTF-8 decoder (a chunk may end mid-character)
+        buffer:str - data read but not yet decoded (from pos)
+        state:str - position within envelope (open, key, colon, value, rows, done)
+        key:str - current envelope key
+        found:bool - whether a Query key was found
+    :yield:
+        rows within Query
+    """
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    chunks = iter(chunks)
+    buffer = ''
+    pos = 0
+    eof = False
+    state = 'open'
+    key = None
+    found = False
+
+    while state != 'done':
+        value = end = None
+        if state == 'rows':
+            # fast path - decode as many complete rows as the buffer holds
+            while True:
+                pos = ROW_SEPARATOR.match(buffer, pos).end()
+                if pos == len(buffer) or buffer[pos] == ']':
+                    break
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    break
+                if value_complete(buffer, pos, end, eof) is False:
+                    break
+                pos = end
+                yield value
+            value = end = None
+
+        while pos < len(buffer) and buffer[pos] in ' \t\n\r':
+            pos += 1
+
+        if pos < len(buffer):
+            char = buffer[pos]
+            if state in ('open', 'colon'):
+                if char != {'open': '{', 'colon': ':'}[state]:
+                    assert True == False, 'Failed to extracted JSON data (Error: unexpected %s).\n\tQuery: %s\n' % (repr(buffer[pos:pos+100]), query)
+                pos += 1
+                state = {'open': 'key', 'colon': 'value'}[state]
+                continue
+            elif char == ',' and state in ('key', 'rows'):
+                pos += 1
+                continue
+            elif char == '}' and state == 'key':
+                state = 'done'
+                continue
+            elif char == ']' and state == 'rows':
+                pos += 1
+                state = 'key'
+                continue
+            elif char == '[' and state == 'value' and key == 'Query':
+                pos += 1
+                found = True
+                state = 'rows'
+                continue
+
+            # decode a complete value - a value that ends with the buffer may be truncated (ex. numbers)
+            try:
+                value, end = decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError as e:
+                if eof is True:
+                    assert True == False, 'Failed to extracted JSON data (Error: %s).\n\tQuery: %s\n' % (e, query)
+            else:
+                if value_complete(buffer, pos, end, eof) is False:
+                    value = end = None
+
+        if end is not None:
+            pos = end
+            if state == 'key':
+                key = value
+                state = 'colon'
+            elif state == 'value':
+                state = 'key'
+            else:
+                yield value
+        elif eof is True:
+            assert True == False, 'Failed to extracted JSON data (Error: incomplete results).\n\tQuery: %s\n' % query
+        else:
+            chunk = next(chunks, None)
+            if chunk is None:
+                eof = True
+                chunk = text_decoder.decode(b'', final=True)
+            elif isinstance(chunk, bytes):
+                chunk = text_decoder.decode(chunk)
+            buffer = buffer[pos:] + chunk
+            pos = 0
+
+    if found is False:
+        assert True == False, 'Failed extract data (Error: %s).\n\tQuery; %s\n' % (buffer[:1000], query)
+
+def get_json_stream(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30, chunk_size:int=65536):
+    """
+    Execute GET query & yield results row by row as they are read off the socket - memory stays flat regardless of
+    the size of the result set
+    :args:
+        conn:str - connection
+        query:str - query to execute
+        remote:str - whether query is remote or note
+        auth:tuple - REST authentication
+        timeout:int - timeout
+        chunk_size:int - number of bytes read from the socket at a time
+    :params:
+        r:requests.models.Response - results from request (body not yet read)
+    :yield:
+        rows within Query
+    """
+    r = get(conn=conn, query=query, remote=remote, auth=auth, timeout=timeout, stream=True)
+    try:
+        for row in iter_query_rows(chunks=r.iter_content(chunk_size=chunk_size), query=query):
+            yield row
+    finally:
+        r.close()
+
+async def get_json_async(conn:str, query:str, remote:str=True, auth:tuple=(), timeout:int=30, semaphore:asyncio.Semaphore=None, cache:bool=True,
+                         executor:concurrent.futures.ThreadPoolExecutor=None, deadline:float=None)->list: 
+    """
+    Execute get_json on a worker thread without blocking the event loop - requests is blocking, so a request whose
+    deadline passes is not interrupted: it runs to completion on its thread (holding its pooled connection until the
+    response is read or the socket times out) & only its result is discarded
+    :args:
+        conn:str - connection
+        query:str - query to execute
+        remote:str - whether query is remote or note
+        auth:tuple - REST authentication
+        timeout:int - socket timeout of the request (connect & between bytes received, including time waiting on the pool)
+        semaphore:asyncio.Semaphore - limits the number of requests in-flight
+        cache:bool - whether a memoized result may be used
+        executor:concurrent.futures.ThreadPoolExecutor - threads executing the requests (default - the loop's default executor)
+        deadline:float - max seconds to wait for the result once the request started (None - bounded only by timeout)
+    :params: 
+        loop:asyncio.AbstractEventLoop - running event loop
+        output:list - data extracted
+    :return: 
+        output
+    """
+    if semaphore is None: 
+        semaphore = asyncio.Semaphore(1)
+
+    loop = asyncio.get_running_loop()
+    async with semaphore: 
+        try: 
+            output = await asyncio.wait_for(loop.run_in_executor(executor, functools.partial(get_json, conn=conn, query=query, remote=remote, auth=auth, timeout=timeout, cache=cache)), timeout=deadline)
+        except asyncio.TimeoutError: 
+            assert True == False, 'Failed to execute query on %s - no result after %s seconds.\n\tQuery: %s\n' % (conn, deadline, query)
+
+    return output 
+
+def gather_queries(conn:str, queries:list, remote:str=True, auth:tuple=(), timeout:int=30, max_in_flight:int=5, cache:bool=True, deadline:float=None)->list: 
+    """
+    Execute independent queries concurrently - on a dedicated pool of max_in_flight threads (the default executor of
+    asyncio is capped at min(32, CPU count + 4) threads)
+    :args:
+        conn:str - connection
+        queries:list - queries to execute
+        remote:str - whether query is remote or note
+        auth:tuple - REST authentication
+        timeout:int - socket timeout per query
+        max_in_flight:int - max number of queries executed at once
+        cache:bool - whether memoized results may be used
+        deadline:float - max seconds to wait for the result of each query (see get_json_async)
+    :params: 
+        executor:concurrent.futures.ThreadPoolExecutor - max_in_flight threads executing the queries
+        outputs:list - data extracted per query
+    :return: 
+        outputs - in the same order as queries
+    """
+    executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(1, max_in_flight))
+
+    async def __gather()->list: 
+        semaphore = asyncio.Semaphore(max_in_flight)
+        return await asyncio.gather(*[get_json_async(conn=conn, query=query, remote=remote, auth=auth, timeout=timeout, semaphore=semaphore, cache=cache,
+                                                     executor=executor, deadline=deadline) for query in queries])
+
+    try: 
+        outputs = asyncio.run(__gather())
+    finally: 
+        executor.shutdown(wait=False, cancel_futures=True) # queries past their deadline complete in the background 
+
+    return outputs 
@@ -1,26 +1,120 @@
+import concurrent.futures
 import os
 import requests
 import sys
+import time
+
+import rest.get
 
 if sys.platform.startswith('win'):
     DATA_DIR = "data\\"
 else:
     DATA_DIR = "data/"
 
-def put_data(file_info:str, conn:str, auth:tuple=(), timeout:int=30):
+def iter_chunks(f, chunk_size:int=65536):
+    """
+    Read file in bounded chunks
+    :args:
+        f - open (binary) file
+        chunk_size:int - max number of bytes per chunk
+    :yield:
+        chunks of file
+    """
+    while True:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+def iter_batches(f, rows_per_request:int):
+    """
+    Read file in batches of rows - a batch always ends on a record (line) boundary
+    :args:
+        f - open (binary) file with one JSON row per line
+        rows_per_request:int - max number of rows per batch
+    :params:
+        batch:list - rows read but not yet yielded
+    :yield:
+        batches of rows (bytes)
+    """
+    batch = []
+    for line in f:
+        if line.strip():
+            batch.append(line.rstrip(b'\r\n'))
+        if len(batch) == rows_per_request:
+            yield b'\n'.join(batch)
+            batch = []
+    if batch:
+        yield b'\n'.join(batch)
+
+def put_file(file_name:str, conn:str, headers:dict, auth:tuple=(), timeout:int=30, rows_per_request:int=0, chunk_size:int=65536)->dict:
+    """
+    PUT a single file from DATA_DIR using the pooled session of conn - the file is streamed, so client memory is
+    bounded by chunk_size (or rows_per_request) regardless of the file size
+    :args:
+        file_name:str - file in DATA_DIR
+        conn:str - REST connection info
+        headers:dict - header for PUT request
+        auth:tuple - REST authentication
+        timeout:int - timeout
+        rows_per_request:int - max number of rows per PUT request (0 - whole file in a single chunked request)
+        chunk_size:int - max number of bytes read at a time when the whole file is sent in a single request
+    :params:
+        full_path:str - DATA_DIR + file_name
+        start:float - time upload started
+        bodies - generator of request bodies, each a generator of chunks (single request) or a batch of rows
+    :return:
+        summary of file - file, status (HTTP status - the first that is not 200, None if failed), bytes, requests,
+        duration (seconds), error
+    """
+    summary = {'file': file_name, 'status': None, 'bytes': 0, 'requests': 0, 'duration': 0, 'error': None}
+    full_path = DATA_DIR + file_name
+    start = time.perf_counter()
+
+    def __count(chunks):
+        for chunk in chunks:
+            summary['bytes'] += len(chunk)
+            yield chunk
+
+    try:
+        with open(full_path, 'rb') as f:
+            if rows_per_request > 0:
+                bodies = __count(iter_batches(f, rows_per_request))
+            else:
+                bodies = iter([__count(iter_chunks(f, chunk_size))])
+            for body in bodies:
+                try:
+                    r = rest.get.get_session(conn).put('http://%s' % conn, headers=headers, auth=auth, timeout=timeout, data=body)
+                except requests.exceptions.RequestException as e:
+                    summary['error'] = 'Failed to POST data from %s on %s (Error: %s)' % (file_name, conn, e)
+                    break
+                summary['requests'] += 1
+                if summary['status'] in (None, 200):
+                    summary['status'] = r.status_code
+    except OSError as e:
+        summary['error'] = 'Failed to read file %s (Error: %s)' % (file_name, e)
+    summary['duration'] = time.perf_counter() - start
+
+    return summary
+
+def put_data(file_info:str, conn:str, auth:tuple=(), timeout:int=30, workers:int=1, rows_per_request:int=0)->dict:
     """
     PUT data in AnyLog - data located in DATA_DIR
-    :args: 
+    :args:
         file_info:str - db_name.sensor_name
         conn:str - REST connection info
         auth:tuple - REST authentication
-        timeout:int - timeout 
-    :params: 
-        headers:dict - header for PUT requests 
-        full_path:str - DATA_DIR + file_name 
-        status:list - whether or not row got inserted 
-    :return: 
-        status 
+        timeout:int - timeout
+        workers:int - number of files uploaded concurrently (bounded by the connection pool of conn - rest.get.set_pool)
+        rows_per_request:int - max number of rows per PUT request (0 - each file is streamed in a single request)
+    :params:
+        headers:dict - header for PUT requests
+        file_names:list - files in DATA_DIR containing file_info
+        status:list - summary per file (see put_file)
+    :notes:
+        memoized rest.get results are dropped once data is ingested
+    :return:
+        status - files (summary per file, in file order), bytes & duration (seconds) of the whole ingest
     """
     headers = {
         'type': 'json',
@@ -30,20 +124,20 @@ def put_data(file_info:str, conn:str, auth:tuple=(), timeout:int=30):
         'Content-Type': 'text/plain'
     }
 
-    for file_name in os.listdir(DATA_DIR):
-        data = []
-        if file_info in file_name:
-            full_path = DATA_DIR + file_name
-            try:
-                with open(full_path, 'r') as f:
-                    try:
-                        data = str(f.read())
-                    except Exception as e:
-                        assert True == False, 'Failed to extract results (Error: %s)' % e
-            except Exception as e:
-                assert True == False, 'Failed to read file %s (Error: %s)' % (file_name, e)
-            else:
-                try:
-                    r = requests.put('http://%s' % conn, headers=headers, auth=auth, timeout=timeout, data=data)
-                except Exception as e:
-                    assert True == False, 'Failed to POST data from %s on %s (Error: %s)' % (file_name, conn, e)
+    file_names = [file_name for file_name in sorted(os.listdir(DATA_DIR)) if file_info in file_name]
+    start = time.perf_counter()
+    try:
+        if workers > 1 and len(file_names) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+                status = list(executor.map(lambda file_name: put_file(file_name=file_name, conn=conn, headers=headers, auth=auth, timeout=timeout, rows_per_request=rows_per_request), file_names))
+        else:
+            status = [put_file(file_name=file_name, conn=conn, headers=headers, auth=auth, timeout=timeout, rows_per_request=rows_per_request) for file_name in file_names]
+    finally:
+        # memoized query results are stale once data is ingested
+        rest.get.clear_cache()
+
+    errors = [summary['error'] for summary in status if summary['error'] is not None]
+    if errors:
+        assert True == False, '\n'.join(errors)
+
+    return {'files': status, 'bytes': sum(summary['bytes'] for summary in status), 'duration': time.perf_counter() - start}
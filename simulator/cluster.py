@@ -0,0 +1,249 @@
+"""
+Local operator cluster - N operator processes (simulator/node.py), each holding a partition of the data, behind a
+query node that fans a query out to the operators & merges the partial results. The query node honors the servers
+header (comma separated operators to query) used by the YAML-driven suites in tests/
+:sample:
+    python3 simulator/cluster.py --operators 5 --port 2049 --data-dir data/ --file-info anylog.ping_sensor \
+        --config-out tests/configs/local_cluster.config.yaml
+"""
+import argparse
+import atexit
+import collections
+import concurrent.futures
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+import zlib
+
+import requests
+import yaml
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import rest.get
+import simulator.merge
+import simulator.node
+import simulator.translate
+
+
+class QueryHandler(simulator.node.NodeHandler):
+    """
+    Query node - no local data; queries are executed on the operators & merged, PUT data is partitioned
+    """
+    def execute(self, dbms:str, query:str, headers)->list:
+        """
+        Fan query out to operators (all, or those in the servers header) & merge results
+        :params:
+            operators:list - operators to query
+            partial:str - query executed by each operator
+            merge_query:str - query executed over the partial results
+            columns:list - columns of the partial results
+        :return:
+            merged rows
+        """
+        operators = self.server.cluster.operators
+        if headers.get('servers'):
+            operators = [server.strip() for server in headers['servers'].split(',') if server.strip()]
+            unknown = [server for server in operators if server not in self.server.cluster.operators]
+            if unknown:
+                raise ValueError('Unknown operator(s): %s' % ', '.join(unknown))
+
+        partial, merge_query, columns = simulator.merge.plan(query)
+        command = 'sql %s format=json and stat=false "%s"' % (dbms, partial)
+
+        start = time.perf_counter()
+        partials = []
+        for rows in self.server.cluster.executor.map(lambda operator: rest.get.get_json(conn=operator, query=command, remote=False), operators):
+            partials += rows
+        fanout = time.perf_counter() - start
+
+        start = time.perf_counter()
+        output = simulator.merge.merge(merge_query=merge_query, columns=columns, partials=partials)
+        self.server.cluster.stats.append({'operators': len(operators), 'rows': len(partials), 'fanout': fanout,
+                                          'merge': time.perf_counter() - start})
+        return output
+
+    def do_PUT(self):
+        try:
+            rows = simulator.node.parse_rows(self.read_body())
+            count = self.server.cluster.insert(dbms=self.headers['dbms'], table=self.headers['table'], rows=rows)
+        except Exception as e:
+            self.reply(400, {'AnyLog.status': 'Failed', 'AnyLog.error': str(e)})
+        else:
+            self.reply(200, {'AnyLog.status': 'Success', 'AnyLog.rows': count})
+
+    do_POST = do_PUT
+
+
+class Cluster:
+    """
+    Operator processes + query node
+    """
+    def __init__(self, operators:int=2, host:str='127.0.0.1', port:int=0, operator_port:int=0, partition_column:str=None):
+        """
+        :args:
+            operators:int - number of operator processes
+            host:str - IP to bind
+            port:int - query node port (0 - any available port)
+            operator_port:int - first operator port, operators use consecutive ports (0 - any available port)
+            partition_column:str - rows are assigned to operators by hash of this column (round robin if not set)
+        :params:
+            self.operators:list - operator connections (ip:port)
+            self.processes:list - operator processes
+            self.server - query node
+            self.stats:collections.deque - fan-out & merge time per query
+        """
+        self.host = host
+        self.partition_column = partition_column
+        self.processes = []
+        self.operators = []
+        self.stats = collections.deque(maxlen=100000)
+        self.next_row = 0
+
+        for i in range(operators):
+            process = subprocess.Popen([sys.executable, os.path.join(ROOT_DIR, 'simulator', 'node.py'), '--host', host,
+                                        '--port', str(operator_port + i if operator_port else 0)],
+                                       stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+            self.processes.append(process)
+        atexit.register(self.stop)
+        for process in self.processes:
+            line = process.stdout.readline()
+            while line and 'running on' not in line:
+                line = process.stdout.readline()
+            if not line:
+                raise RuntimeError('Failed to start operator process')
+            self.operators.append(line.split('running on ')[1].split()[0])
+
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=max(4, operators * 4))
+        self.server = simulator.node.start_node(host=host, port=port, handler=QueryHandler)
+        self.server.cluster = self
+        self.conn = '%s:%s' % self.server.server_address[:2]
+
+    def insert(self, dbms:str, table:str, rows:list)->int:
+        """
+        Partition rows across operators & PUT each partition
+        :return:
+            number of rows inserted
+        """
+        partitions = [[] for operator in self.operators]
+        for row in rows:
+            if self.partition_column is not None:
+                i = zlib.crc32(str(row.get(self.partition_column)).encode()) % len(self.operators)
+            else:
+                i = self.next_row % len(self.operators)
+                self.next_row += 1
+            partitions[i].append(row)
+
+        headers = {'type': 'json', 'dbms': dbms, 'table': table, 'mode': 'file', 'Content-Type': 'text/plain'}
+        for operator, partition in zip(self.operators, partitions):
+            if partition:
+                r = requests.put('http://%s' % operator, headers=headers, timeout=300,
+                                 data='\n'.join(json.dumps(row) for row in partition))
+                if r.status_code != 200:
+                    raise RuntimeError('Failed to insert data on %s: %s' % (operator, r.text))
+        return len(rows)
+
+    def load_dir(self, data_dir:str, file_info:str='')->dict:
+        """
+        Load <dbms>.<table>.*.json files from data_dir
+        :return:
+            file name -> rows inserted
+        """
+        loaded = {}
+        for file_name in sorted(os.listdir(data_dir)):
+            if file_name.endswith('.json') and file_info in file_name:
+                dbms, table = file_name.split('.')[:2]
+                with open(os.path.join(data_dir, file_name), 'r') as f:
+                    loaded[file_name] = self.insert(dbms=dbms, table=table, rows=simulator.node.parse_rows(f.read()))
+        return loaded
+
+    def write_config(self, config_file:str, dbms:str, table:str, min_days_back:int=1, max_days_back:int=10):
+        """
+        Write a config for the YAML-driven suites in tests/ pointing at this cluster. Column types are taken from
+        the first operator
+        """
+        sample = rest.get.get_json(conn=self.operators[0], query='sql %s format=json "SELECT * FROM %s LIMIT 100"' % (dbms, table), remote=False)
+        columns = []
+        for column in (sample[0] if sample else {}):
+            values = [row[column] for row in sample if row[column] is not None]
+            if values and all(simulator.translate.is_timestamp(value) for value in values):
+                col_type = 'timestamp'
+            elif values and all(simulator.merge.typed(value) != value for value in values):
+                col_type = 'numeric'
+            else:
+                col_type = 'string'
+            columns.append({column: col_type})
+
+        config = {
+            'REST': self.conn,
+            'OPERATOR': list(self.operators),
+            'DB': dbms,
+            'TABLE': table,
+            'TABLE COLUMNS': columns,
+            'MIN DAYS BACK': min_days_back,
+            'MAX DAYS BACK': max_days_back
+        }
+        with open(config_file, 'w') as f:
+            f.write('# Config for executing queries against a local cluster (simulator/cluster.py)\n')
+            yaml.safe_dump(config, f, sort_keys=False, default_flow_style=False)
+
+    def stop(self):
+        """
+        Stop query node & operator processes
+        """
+        if getattr(self, 'server', None) is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+        for process in self.processes:
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+        self.processes = []
+
+
+def main():
+    """
+    :positional arguments: none
+    :optional arguments:
+        --operators OPERATORS               number of operator processes
+        --host HOST                         IP to bind
+        --port PORT                         query node port
+        --operator-port OPERATOR_PORT       first operator port (0 - any available port)
+        --partition-column PARTITION_COLUMN partition rows by hash of column (default: round robin)
+        --data-dir DATA_DIR                 directory with <dbms>.<table>.*.json files to load on start
+        --file-info FILE_INFO               only load files containing this value (ex. anylog.ping_sensor)
+        --config-out CONFIG_OUT             write a YAML config for tests/ (requires --file-info <dbms>.<table>)
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--operators', type=int, default=2, help='number of operator processes')
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='IP to bind')
+    parser.add_argument('--port', type=int, default=2049, help='query node port')
+    parser.add_argument('--operator-port', type=int, default=0, help='first operator port (0 - any available port)')
+    parser.add_argument('--partition-column', type=str, default=None, help='partition rows by hash of column (default: round robin)')
+    parser.add_argument('--data-dir', type=str, default=None, help='directory with <dbms>.<table>.*.json files to load on start')
+    parser.add_argument('--file-info', type=str, default='', help='only load files containing this value (ex. anylog.ping_sensor)')
+    parser.add_argument('--config-out', type=str, default=None, help='write a YAML config for tests/ (requires --file-info <dbms>.<table>)')
+    args = parser.parse_args()
+
+    cluster = Cluster(operators=args.operators, host=args.host, port=args.port, operator_port=args.operator_port,
+                      partition_column=args.partition_column)
+    if args.data_dir is not None:
+        for file_name, rows in cluster.load_dir(data_dir=args.data_dir, file_info=args.file_info).items():
+            print('%s: %s rows' % (file_name, rows))
+    if args.config_out is not None:
+        dbms, table = args.file_info.split('.')[:2]
+        cluster.write_config(config_file=args.config_out, dbms=dbms, table=table)
+    print('Query node running on %s with operators: %s' % (cluster.conn, ', '.join(cluster.operators)))
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        cluster.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Split an AnyLog query into a partial query executed by each operator and a merge query executed over the union of
+the partial results (an in-memory SQLite table named partials)
+"""
+import re
+import sqlite3
+
+import simulator.translate
+
+SELECT = re.compile(r'^\s*select\s+(distinct\b\s*)?', re.IGNORECASE)
+CLAUSES = re.compile(r'\b(from|where|group\s+by|order\s+by|limit)\b', re.IGNORECASE)
+ALIAS = re.compile(r'\s+as\s+("[^"]+"|\w+)\s*$', re.IGNORECASE)
+AGGREGATE = re.compile(r'^(count|min|max|sum|avg)\s*\((.*)\)$', re.IGNORECASE | re.DOTALL)
+DISTINCT = re.compile(r'^distinct\b\s*', re.IGNORECASE)
+INCREMENTS = re.compile(r'^increments\(\s*(\w+)\s*,\s*(\d+)\s*,\s*(\w+)\s*\)$', re.IGNORECASE)
+DIRECTION = re.compile(r'\s+(asc|desc)\s*$', re.IGNORECASE)
+BUCKET = '__bucket'
+
+
+def mask(query:str)->str:
+    """
+    Replace quoted literals & text within parentheses with # so clauses and commas can be found at the top level
+    """
+    masked = []
+    depth = 0
+    quote = None
+    for char in query:
+        if quote is not None:
+            masked.append('#')
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+            masked.append('#')
+        elif char == '(':
+            depth += 1
+            masked.append('#')
+        elif char == ')':
+            depth -= 1
+            masked.append('#')
+        else:
+            masked.append(char if depth == 0 else '#')
+    return ''.join(masked)
+
+
+def split_top_level(text:str)->list:
+    """
+    Split text on commas outside of quotes & parentheses
+    """
+    items = []
+    start = 0
+    for match in re.finditer(',', mask(text)):
+        items.append(text[start:match.start()].strip())
+        start = match.end()
+    items.append(text[start:].strip())
+    return [item for item in items if item]
+
+
+def normalize(expr:str)->str:
+    return re.sub(r'\s+', '', expr).lower().strip('"')
+
+
+def parse_query(query:str)->dict:
+    """
+    Split a SELECT statement into its clauses
+    :return:
+        dict with distinct, select (list), from (FROM + WHERE text), group_by (list), order_by (list), limit
+    """
+    query = query.strip().rstrip(';').strip()
+    match = SELECT.match(query)
+    if match is None:
+        raise ValueError('Unsupported query (expected SELECT): %s' % query)
+
+    masked = mask(query)
+    positions = [(clause.start(), re.sub(r'\s+', ' ', clause.group(1).lower())) for clause in CLAUSES.finditer(masked, match.end())]
+    clauses = {}
+    for i, (start, name) in enumerate(positions):
+        end = positions[i + 1][0] if i + 1 < len(positions) else len(query)
+        if name in ('where',) or name in clauses:
+            continue
+        clauses[name] = (start, end)
+    if 'from' not in clauses:
+        raise ValueError('Unsupported query (missing FROM): %s' % query)
+
+    from_end = min([clauses[name][0] for name in ('group by', 'order by', 'limit') if name in clauses] + [len(query)])
+    parsed = {
+        'distinct': match.group(1) is not None,
+        'select': split_top_level(query[match.end():clauses['from'][0]]),
+        'from': query[clauses['from'][0]:from_end].strip(),
+        'group_by': [],
+        'order_by': [],
+        'limit': None
+    }
+    for name, key in (('group by', 'group_by'), ('order by', 'order_by')):
+        if name in clauses:
+            start, end = clauses[name]
+            parsed[key] = split_top_level(query[start:end].split(None, 2)[2] if len(query[start:end].split(None, 2)) > 2 else '')
+    if 'limit' in clauses:
+        start, end = clauses['limit']
+        parsed['limit'] = query[start:end].split(None, 1)[1].strip()
+    return parsed
+
+
+def plan(query:str)->tuple:
+    """
+    Build the partial (per operator) & merge queries
+    :args:
+        query:str - AnyLog query
+    :params:
+        parsed:dict - query clauses
+        outputs:dict - normalized select expression / alias -> output column
+    :return:
+        partial_query, merge_query, columns - columns of partials (None if taken from the results)
+    :notes:
+        COUNT -> SUM of counts, MIN / MAX / SUM -> same function, AVG -> SUM(sum) / SUM(count),
+        COUNT(DISTINCT x) -> distinct x per operator then COUNT(DISTINCT) (only aggregate in query),
+        increments() -> bucket column (not returned), period() is evaluated by each operator
+    """
+    parsed = parse_query(query)
+    items = []
+    for item in parsed['select']:
+        alias = ALIAS.search(mask(item))
+        expr = item[:alias.start()].strip() if alias else item.strip()
+        name = item[alias.start():].split(None, 1)[1].strip().strip('"').lower() if alias else expr.lower()
+        items.append((expr, name))
+
+    aggregated = bool(parsed['group_by'])
+    for expr, name in items:
+        if AGGREGATE.match(expr) or INCREMENTS.match(expr):
+            aggregated = True
+
+    if not aggregated:
+        partial = query
+        merge = 'SELECT %s* FROM partials' % ('DISTINCT ' if parsed['distinct'] else '')
+        if parsed['order_by']:
+            merge += ' ORDER BY ' + ', '.join(order_item(item, {}) for item in parsed['order_by'])
+        if parsed['limit'] is not None:
+            merge += ' LIMIT %s' % parsed['limit']
+        return partial, merge, None
+
+    partial_items = []
+    merge_items = []
+    group_keys = []
+    partial_group_by = list(parsed['group_by'])
+    outputs = {}
+    count_distinct = False
+    aggregates = 0
+    for i, (expr, name) in enumerate(items):
+        aggregate = AGGREGATE.match(expr)
+        increments = INCREMENTS.match(expr)
+        outputs[normalize(expr)] = name
+        outputs[normalize(name)] = name
+        if increments is not None:
+            bucket = simulator.translate.increments_bucket(*increments.groups())
+            partial_items.append('%s AS "%s"' % (bucket, BUCKET))
+            partial_group_by.insert(0, bucket)
+            group_keys.insert(0, '"%s"' % BUCKET)
+        elif aggregate is None:
+            partial_items.append('%s AS "%s"' % (expr, name))
+            merge_items.append('"%s" AS "%s"' % (name, name))
+            group_keys.append('"%s"' % name)
+        else:
+            func, inner = aggregate.group(1).lower(), aggregate.group(2).strip()
+            column = 'p%s' % i
+            if func == 'count' and DISTINCT.match(inner):
+                count_distinct = True
+                inner = DISTINCT.sub('', inner)
+                partial_items.append('%s AS "%s"' % (inner, column))
+                partial_group_by.append(inner)
+                merge_items.append('COUNT(DISTINCT "%s") AS "%s"' % (column, name))
+                continue
+            aggregates += 1
+            if func == 'avg':
+                partial_items.append('SUM(%s) AS "%s_sum", COUNT(%s) AS "%s_count"' % (inner, column, inner, column))
+                merge_items.append('SUM("%s_sum") * 1.0 / SUM("%s_count") AS "%s"' % (column, column, name))
+            else:
+                partial_items.append('%s(%s) AS "%s"' % (func.upper(), inner, column))
+                merge_items.append('%s("%s") AS "%s"' % ('SUM' if func == 'count' else func.upper(), column, name))
+
+    if count_distinct is True and aggregates > 0:
+        raise ValueError('COUNT(DISTINCT) cannot be combined with other aggregates across operators: %s' % query)
+
+    partial = 'SELECT %s %s' % (', '.join(partial_items), parsed['from'])
+    if partial_group_by:
+        partial += ' GROUP BY ' + ', '.join(partial_group_by)
+    merge = 'SELECT %s FROM partials' % ', '.join(merge_items)
+    if group_keys:
+        merge += ' GROUP BY ' + ', '.join(group_keys)
+    if parsed['order_by']:
+        merge += ' ORDER BY ' + ', '.join(order_item(item, outputs) for item in parsed['order_by'])
+    if parsed['limit'] is not None:
+        merge += ' LIMIT %s' % parsed['limit']
+
+    columns = re.findall(r'AS "([^"]+)"(?:,|$)', ', '.join(partial_items))
+    return partial, merge, columns
+
+
+def order_item(item:str, outputs:dict)->str:
+    """
+    Rewrite an ORDER BY item to reference a column of partials
+    """
+    direction = DIRECTION.search(item)
+    expr = item[:direction.start()] if direction else item
+    column = outputs.get(normalize(expr), normalize(expr))
+    return '"%s"%s' % (column, direction.group(0) if direction else '')
+
+
+def typed(value):
+    """
+    Convert a string value returned by an operator to int / float when the conversion is lossless
+    """
+    if isinstance(value, str):
+        for convert in (int, float):
+            try:
+                if str(convert(value)) == value:
+                    return convert(value)
+            except ValueError:
+                pass
+    return value
+
+
+def merge(merge_query:str, columns:list, partials:list)->list:
+    """
+    Execute merge query over the union of partial results
+    :args:
+        merge_query:str - query over partials
+        columns:list - columns of partials (None - taken from rows)
+        partials:list - list of rows (dict) from all operators
+    :return:
+        rows - list of dict with string values
+    """
+    if columns is None:
+        columns = []
+        for row in partials:
+            for column in row:
+                if column not in columns:
+                    columns.append(column)
+        if not columns:
+            return []
+
+    conn = sqlite3.connect(':memory:')
+    try:
+        conn.execute('CREATE TABLE partials (%s)' % ', '.join('"%s"' % column for column in columns))
+        conn.executemany('INSERT INTO partials VALUES (%s)' % ', '.join('?' for column in columns),
+                         [[typed(row.get(column)) for column in columns] for row in partials])
+        cursor = conn.execute(merge_query)
+        names = [column[0] for column in cursor.description]
+        return [{name: (None if value is None else str(value)) for name, value in zip(names, row)} for row in cursor]
+    finally:
+        conn.close()
@@ -0,0 +1,329 @@
+"""
+Local stand-in for an AnyLog REST node backed by SQLite - speaks the same header protocol as rest.get and
+rest.put_data so the suites and client benchmarks can run offline
+:protocol:
+    GET  - command: get status | sql <dbms> format=json [and ...] "<query>"
+           type: info | sql, dbms: <dbms>, details: get status | <query> (YAML-driven suites)
+    PUT  - type: json, dbms: <dbms>, table: <table>, body: JSON rows (one per line or a list)
+:sample:
+    python3 simulator/node.py --port 7849 --data-dir data/ --file-info anylog.ping_sensor
+"""
+import argparse
+import http.server
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+import threading
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import simulator.translate
+
+
+class Storage:
+    """
+    SQLite storage - one database file per dbms, one connection per (thread, dbms)
+    """
+    def __init__(self, db_dir:str=None):
+        """
+        :args:
+            db_dir:str - directory for database files (temporary directory if not set)
+        :params:
+            self.db_dir:str - db_dir
+            self.tables:dict - (dbms, table) -> {column: type}
+            self.write_lock:threading.Lock - serializes table changes & inserts
+            self.local:threading.local - per-thread connections
+        """
+        if db_dir is None:
+            db_dir = tempfile.mkdtemp(prefix='anylog_node_')
+        os.makedirs(db_dir, exist_ok=True)
+        self.db_dir = db_dir
+        self.tables = {}
+        self.write_lock = threading.Lock()
+        self.local = threading.local()
+
+    def connect(self, dbms:str)->sqlite3.Connection:
+        """
+        Get connection to dbms for the current thread
+        """
+        if not hasattr(self.local, 'conns'):
+            self.local.conns = {}
+        if dbms not in self.local.conns:
+            conn = sqlite3.connect(os.path.join(self.db_dir, '%s.db' % dbms), timeout=30, check_same_thread=False)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=OFF')
+            self.local.conns[dbms] = conn
+        return self.local.conns[dbms]
+
+    def __column_type(self, values:list)->str:
+        """
+        Infer SQLite column type from sample values
+        :return:
+            INTEGER, REAL or TEXT
+        """
+        values = [value for value in values if value is not None]
+        if values and all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+            return 'INTEGER'
+        for value in values:
+            if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+                return 'TEXT'
+            if isinstance(value, str):
+                try:
+                    float(value)
+                except ValueError:
+                    return 'TEXT'
+        return 'REAL' if values else 'TEXT'
+
+    def insert(self, dbms:str, table:str, rows:list)->int:
+        """
+        Insert rows, creating the table & new columns as needed. Timestamps are stored as 'YYYY-MM-DD HH:MM:SS.ffffff'
+        :args:
+            dbms:str - logical database
+            table:str - table name
+            rows:list - list of dict
+        :return:
+            number of rows inserted
+        """
+        if not rows:
+            return 0
+        columns = []
+        for row in rows:
+            for column in row:
+                if column not in columns:
+                    columns.append(column)
+
+        with self.write_lock:
+            conn = self.connect(dbms)
+            schema = self.tables.setdefault((dbms, table), {})
+            if not schema:
+                for name, col_type in conn.execute('SELECT name, type FROM pragma_table_info(?)', (table,)):
+                    schema[name] = col_type
+            new_columns = [column for column in columns if column not in schema]
+            for column in new_columns:
+                sample = [row.get(column) for row in rows[:1000]]
+                col_type = self.__column_type(sample)
+                if not schema:
+                    conn.execute('CREATE TABLE IF NOT EXISTS "%s" ("%s" %s)' % (table, column, col_type))
+                else:
+                    conn.execute('ALTER TABLE "%s" ADD COLUMN "%s" %s' % (table, column, col_type))
+                schema[column] = col_type
+                if any(simulator.translate.is_timestamp(value) for value in sample[:10]):
+                    conn.execute('CREATE INDEX IF NOT EXISTS "%s_%s" ON "%s" ("%s")' % (table, column, table, column))
+
+            values = []
+            for row in rows:
+                record = []
+                for column in columns:
+                    value = row.get(column)
+                    if simulator.translate.is_timestamp(value):
+                        value = simulator.translate.normalize_timestamp(value)
+                    elif isinstance(value, (dict, list)):
+                        value = json.dumps(value)
+                    record.append(value)
+                values.append(record)
+            conn.executemany('INSERT INTO "%s" (%s) VALUES (%s)' % (table, ', '.join('"%s"' % column for column in columns),
+                                                                    ', '.join('?' for column in columns)), values)
+            conn.commit()
+
+        return len(rows)
+
+    def load_file(self, file_name:str)->int:
+        """
+        Insert a data file named <dbms>.<table>.*.json
+        :return:
+            number of rows inserted
+        """
+        dbms, table = os.path.basename(file_name).split('.')[:2]
+        with open(file_name, 'r') as f:
+            return self.insert(dbms=dbms, table=table, rows=parse_rows(f.read()))
+
+    def period_end(self, dbms:str, table:str, column:str, anchor:str)->str:
+        """
+        Latest timestamp at or before anchor - the end of a period()
+        """
+        row = self.connect(dbms).execute('SELECT MAX("%s") FROM "%s" WHERE "%s" <= ?' % (column, table, column),
+                                         (simulator.translate.normalize_timestamp(anchor),)).fetchone()
+        return row[0]
+
+    def query(self, dbms:str, query:str)->list:
+        """
+        Execute AnyLog query
+        :args:
+            dbms:str - logical database
+            query:str - AnyLog SQL
+        :return:
+            rows - list of dict with (lower case) column names and string values, as returned by AnyLog
+        """
+        conn = self.connect(dbms)
+        sql = simulator.translate.translate(query, period_end=lambda table, column, anchor: self.period_end(dbms, table, column, anchor))
+        cursor = conn.execute(sql)
+        columns = [column[0].lower() for column in cursor.description]
+        return [{column: (None if value is None else str(value)) for column, value in zip(columns, row)} for row in cursor]
+
+
+def parse_rows(data:str)->list:
+    """
+    Parse PUT body - either a JSON list or JSON objects one per line (concatenated objects are also accepted)
+    """
+    data = data.strip()
+    if data.startswith('['):
+        return json.loads(data)
+    rows = []
+    decoder = json.JSONDecoder()
+    pos = 0
+    while pos < len(data):
+        row, pos = decoder.raw_decode(data, pos)
+        rows.append(row)
+        while pos < len(data) and data[pos] in ' \t\r\n,':
+            pos += 1
+    return rows
+
+
+class NodeHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Request handler - self.server.storage holds the data
+    """
+    protocol_version = 'HTTP/1.1' # allow keep-alive
+    disable_nagle_algorithm = True
+
+    def log_message(self, *args):
+        if self.server.verbose is True:
+            http.server.BaseHTTPRequestHandler.log_message(self, *args)
+
+    def reply(self, status:int, body, content_type:str='application/json'):
+        """
+        Send response
+        :args:
+            status:int - HTTP status
+            body - dict/list (sent as JSON) or str
+        """
+        if not isinstance(body, str):
+            body = json.dumps(body)
+        body = body.encode()
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def read_body(self)->str:
+        """
+        Read request body - either Content-Length or chunked transfer encoding
+        """
+        if 'chunked' in self.headers.get('Transfer-Encoding', '').lower():
+            data = []
+            while True:
+                size = int(self.rfile.readline().split(b';')[0].strip(), 16)
+                if size == 0:
+                    while self.rfile.readline() not in (b'\r\n', b'\n', b''):
+                        pass
+                    break
+                data.append(self.rfile.read(size))
+                self.rfile.readline()
+            return b''.join(data).decode()
+        return self.rfile.read(int(self.headers.get('Content-Length', 0))).decode()
+
+    def status(self)->str:
+        return 'AnyLog@%s:%s running' % self.server.server_address[:2]
+
+    def execute(self, dbms:str, query:str, headers)->list:
+        """
+        Execute query - overwritten by nodes that query other nodes
+        """
+        return self.server.storage.query(dbms=dbms, query=query)
+
+    def do_GET(self):
+        command = self.headers.get('command')
+        try:
+            if command is not None:
+                if command.strip().lower() == 'get status':
+                    self.reply(200, self.status(), content_type='text/plain')
+                    return
+                dbms, options, query = simulator.translate.parse_command(command)
+                if dbms is None:
+                    self.reply(400, {'err_code': 400, 'err_text': 'Unsupported command: %s' % command})
+                    return
+            elif self.headers.get('type', '').lower() == 'info':
+                self.reply(200, {'Status': self.status()})
+                return
+            elif self.headers.get('type', '').lower() == 'sql':
+                dbms, query = self.headers.get('dbms'), self.headers.get('details', '')
+            else:
+                self.reply(400, {'err_code': 400, 'err_text': 'Missing command'})
+                return
+            self.reply(200, {'Query': self.execute(dbms=dbms, query=query, headers=self.headers)})
+        except Exception as e:
+            self.reply(400, {'err_code': 400, 'err_text': str(e)})
+
+    def do_PUT(self):
+        try:
+            rows = parse_rows(self.read_body())
+            count = self.server.storage.insert(dbms=self.headers['dbms'], table=self.headers['table'], rows=rows)
+        except Exception as e:
+            self.reply(400, {'AnyLog.status': 'Failed', 'AnyLog.error': str(e)})
+        else:
+            self.reply(200, {'AnyLog.status': 'Success', 'AnyLog.rows': count})
+
+    do_POST = do_PUT
+
+
+def start_node(host:str='127.0.0.1', port:int=0, db_dir:str=None, handler=NodeHandler, verbose:bool=False)->http.server.ThreadingHTTPServer:
+    """
+    Start node in a background thread
+    :args:
+        host:str - IP to bind
+        port:int - port to bind (0 - any available port)
+        db_dir:str - directory for SQLite files
+        handler - request handler class
+        verbose:bool - log requests
+    :params:
+        server:http.server.ThreadingHTTPServer - node (server.storage holds the data)
+    :return:
+        server
+    """
+    server = http.server.ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    server.request_queue_size = 128
+    server.storage = Storage(db_dir=db_dir)
+    server.verbose = verbose
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    """
+    :positional arguments: none
+    :optional arguments:
+        --host HOST             IP to bind
+        --port PORT             port to bind
+        --db-dir DB_DIR         directory for SQLite files (default: temporary directory)
+        --data-dir DATA_DIR     directory with <dbms>.<table>.*.json files to load on start
+        --file-info FILE_INFO   only load files containing this value (ex. anylog.ping_sensor)
+        --verbose               log requests
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--host', type=str, default='127.0.0.1', help='IP to bind')
+    parser.add_argument('--port', type=int, default=7849, help='port to bind')
+    parser.add_argument('--db-dir', type=str, default=None, help='directory for SQLite files (default: temporary directory)')
+    parser.add_argument('--data-dir', type=str, default=None, help='directory with <dbms>.<table>.*.json files to load on start')
+    parser.add_argument('--file-info', type=str, default='', help='only load files containing this value (ex. anylog.ping_sensor)')
+    parser.add_argument('--verbose', action='store_true', help='log requests')
+    args = parser.parse_args()
+
+    server = start_node(host=args.host, port=args.port, db_dir=args.db_dir, verbose=args.verbose)
+    if args.data_dir is not None:
+        for file_name in sorted(os.listdir(args.data_dir)):
+            if file_name.endswith('.json') and args.file_info in file_name:
+                print('%s: %s rows' % (file_name, server.storage.load_file(os.path.join(args.data_dir, file_name))), flush=True)
+    print('AnyLog stand-in node running on %s:%s (db dir: %s)' % (server.server_address[0], server.server_address[1], server.storage.db_dir), flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
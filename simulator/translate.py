@@ -0,0 +1,179 @@
+"""
+Translate AnyLog commands & SQL into SQLite SQL for the local stand-in node
+"""
+import datetime
+import re
+
+from dateutil.relativedelta import relativedelta
+
+SQL_COMMAND = re.compile(r'^\s*sql\s+(\S+)\s+(.*?)\s*"(.*)"\s*$', re.IGNORECASE | re.DOTALL)
+ISO_TIMESTAMP = re.compile(r"'(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}(?::\d{2}(?:\.\d+)?)?)Z?'")
+TIMESTAMP_VALUE = re.compile(r'^\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(\.\d+)?Z?$')
+NOW = re.compile(r'\bnow\(\s*\)', re.IGNORECASE)
+INCREMENTS = re.compile(r'\bincrements\(\s*(\w+)\s*,\s*(\d+)\s*,\s*(\w+)\s*\)\s*,?\s*', re.IGNORECASE)
+PERIOD = re.compile(r"\bperiod\(\s*(\w+)\s*,\s*(\d+)\s*,\s*('[^']*'|now\(\s*\))\s*,\s*(\w+)\s*\)", re.IGNORECASE)
+FROM_TABLE = re.compile(r'\bfrom\s+(\w+)', re.IGNORECASE)
+GROUP_BY = re.compile(r'\bgroup\s+by\b', re.IGNORECASE)
+QUERY_END = re.compile(r'\s*(\border\s+by\b|\blimit\b|;|$)', re.IGNORECASE)
+
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+# SQLite expression per time unit - the bucket a timestamp (stored as 'YYYY-MM-DD HH:MM:SS.ffffff') falls into
+INCREMENTS_BUCKETS = {
+    'second': "substr(%(col)s, 1, 17) || (CAST(substr(%(col)s, 18, 2) AS INTEGER) / %(n)s)",
+    'minute': "substr(%(col)s, 1, 14) || (CAST(substr(%(col)s, 15, 2) AS INTEGER) / %(n)s)",
+    'hour': "substr(%(col)s, 1, 11) || (CAST(substr(%(col)s, 12, 2) AS INTEGER) / %(n)s)",
+    'day': "substr(%(col)s, 1, 8) || (CAST(substr(%(col)s, 9, 2) AS INTEGER) / %(n)s)",
+    'week': "strftime('%%Y', %(col)s) || (CAST(strftime('%%W', %(col)s) AS INTEGER) / %(n)s)",
+    'month': "substr(%(col)s, 1, 5) || ((CAST(substr(%(col)s, 6, 2) AS INTEGER) - 1) / %(n)s)",
+    'year': "CAST(substr(%(col)s, 1, 4) AS INTEGER) / %(n)s"
+}
+
+PERIOD_UNITS = {
+    'second': lambda n: relativedelta(seconds=n),
+    'minute': lambda n: relativedelta(minutes=n),
+    'hour': lambda n: relativedelta(hours=n),
+    'day': lambda n: relativedelta(days=n),
+    'week': lambda n: relativedelta(weeks=n),
+    'month': lambda n: relativedelta(months=n),
+    'year': lambda n: relativedelta(years=n)
+}
+
+
+def parse_command(command:str)->tuple:
+    """
+    Split an AnyLog sql command
+    :args:
+        command:str - command (ex. sql anylog format=json and stat=false "SELECT COUNT(*) FROM ping_sensor")
+    :params:
+        match:re.Match - parsed command
+        options:dict - key=value pairs between the database name & the query
+    :return:
+        dbms, options, query - (None, {}, None) if command is not a sql command
+    """
+    match = SQL_COMMAND.match(command)
+    if match is None:
+        return None, {}, None
+
+    options = {}
+    for option in re.split(r'\s+and\s+', match.group(2).strip(), flags=re.IGNORECASE):
+        if '=' in option:
+            key, value = option.split('=', 1)
+            options[key.strip().lower()] = value.strip()
+
+    return match.group(1), options, match.group(3)
+
+
+def normalize_timestamp(value:str)->str:
+    """
+    Convert an ISO timestamp (2021-07-21T22:16:24.652293Z) to the stored format (2021-07-21 22:16:24.652293)
+    :args:
+        value:str - timestamp
+    :return:
+        normalized timestamp
+    """
+    return value.replace('T', ' ').rstrip('Z')
+
+
+def is_timestamp(value)->bool:
+    """
+    Check whether value is a timestamp string
+    """
+    return isinstance(value, str) and TIMESTAMP_VALUE.match(value) is not None
+
+
+def utc_now()->str:
+    """
+    Current UTC time in stored timestamp format
+    """
+    return datetime.datetime.now(datetime.timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+
+def parse_timestamp(value:str)->datetime.datetime:
+    """
+    Convert a (normalized) timestamp string to datetime
+    """
+    value = normalize_timestamp(value)
+    if '.' not in value:
+        value += '.0'
+    if value.count(':') == 1:
+        value = value.replace('.', ':00.', 1)
+    return datetime.datetime.strptime(value, TIMESTAMP_FORMAT)
+
+
+def period_range(unit:str, units:int, end:str)->tuple:
+    """
+    Calculate the range of a period() - from end back N time units
+    :args:
+        unit:str - time unit (minute, hour, day, ...)
+        units:int - number of time units
+        end:str - latest timestamp in period
+    :return:
+        start, end
+    """
+    if unit.lower() not in PERIOD_UNITS:
+        raise ValueError('Unsupported period time unit: %s' % unit)
+    start = parse_timestamp(end) - PERIOD_UNITS[unit.lower()](units)
+    return start.strftime(TIMESTAMP_FORMAT), normalize_timestamp(end)
+
+
+def increments_bucket(unit:str, units:int, column:str)->str:
+    """
+    SQLite expression for the increments() bucket of a column
+    :args:
+        unit:str - time unit (minute, hour, day, ...)
+        units:int - number of time units per bucket
+        column:str - timestamp column
+    :return:
+        SQLite expression
+    """
+    if unit.lower() not in INCREMENTS_BUCKETS:
+        raise ValueError('Unsupported increments time unit: %s' % unit)
+    return INCREMENTS_BUCKETS[unit.lower()] % {'col': column, 'n': int(units)}
+
+
+def translate(query:str, period_end=None)->str:
+    """
+    Translate AnyLog SQL into SQLite SQL
+    :args:
+        query:str - AnyLog query
+        period_end - callable(table, column, anchor) returning the latest timestamp <= anchor (None if no data)
+    :params:
+        table:str - table in FROM
+        bucket:str - SQLite expression for increments()
+    :return:
+        SQLite query
+    :notes:
+        - ISO timestamps in literals are converted to the stored format & now() to the current UTC time
+        - increments(unit, n, col) is removed from the select list and its bucket becomes the first GROUP BY column
+        - period(unit, n, anchor, col) becomes a range from the latest timestamp at or before anchor back n units
+    """
+    query = ISO_TIMESTAMP.sub(lambda match: "'%s %s'" % (match.group(1), match.group(2)), query)
+    match = FROM_TABLE.search(query)
+    table = match.group(1) if match is not None else None
+
+    def __period(match)->str:
+        unit, units, anchor, column = match.groups()
+        anchor = utc_now() if anchor.lower().startswith('now') else anchor.strip("'")
+        end = period_end(table, column, anchor) if period_end is not None else anchor
+        if end is None:
+            return '0'
+        start, end = period_range(unit, int(units), end)
+        return "(%s >= '%s' AND %s <= '%s')" % (column, start, column, end)
+
+    query = PERIOD.sub(__period, query)
+    query = NOW.sub("'%s'" % utc_now(), query)
+
+    match = INCREMENTS.search(query)
+    if match is not None:
+        unit, units, column = match.groups()
+        bucket = increments_bucket(unit, units, column)
+        query = query[:match.start()] + query[match.end():]
+        group_by = GROUP_BY.search(query)
+        if group_by is not None:
+            query = query[:group_by.end()] + ' %s,' % bucket + query[group_by.end():]
+        else:
+            end = QUERY_END.search(query, FROM_TABLE.search(query).end())
+            query = query[:end.start()] + ' GROUP BY %s' % bucket + query[end.start():]
+
+    return query
@@ -0,0 +1,232 @@
+"""
+Memory-mapped columnar form of expect files - each column of an expect file is stored as a typed array (timestamps as
+int64 microseconds since epoch, values as float64) in <expect_dir>/columnar/<sha256>.col & memory-mapped once per
+content, so load cost does not grow with the number of tests. Files are built on first load (from expect_dir or the
+golden store - see support/golden.py) & period windows derived from a wider window are slices of its arrays.
+Only expect files whose columns all round-trip losslessly (timestamp -> int64, value -> float64) have a columnar form
+:file format:
+    MAGIC, header (JSON line: rows & per column name, dtype, offset) padded to ALIGNMENT, column arrays (little endian)
+:sample:
+    python3 support/columnar.py --expect-dir expect
+"""
+import argparse
+import datetime
+import json
+import os
+import sys
+
+import numpy
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import support.golden
+import support.manifest
+
+MAGIC = b'ALCOL1\n'
+ALIGNMENT = 64
+COLUMNAR_DIR = 'columnar' # built on demand - not part of the repository
+TIMESTAMP_DTYPE = 'datetime64[us]'
+COLUMNS = {} # sha256 -> columns (None if expect file has no columnar form), loaded once per session
+
+
+def timestamp_strings(timestamps:numpy.ndarray)->numpy.ndarray:
+    """
+    Format int64 microseconds as expect file timestamps (YYYY-MM-DD HH:MM:SS.ffffff)
+    """
+    return numpy.char.replace(numpy.datetime_as_string(timestamps.astype(TIMESTAMP_DTYPE), unit='us'), 'T', ' ')
+
+
+def to_columns(rows:list, lossless:bool=True)->dict:
+    """
+    Convert rows into typed arrays - columns containing timestamp in their name as int64 microseconds, others float64
+    :args:
+        rows:list - rows (dict of column -> value as str)
+        lossless:bool - require values to round-trip (expect files), results only need to be parsed
+    :return:
+        column -> array - None if a column cannot be converted (ex. device names, timestamps w/o sub-seconds if lossless)
+    """
+    if not rows:
+        return None
+    columns = {}
+    for column in rows[0]:
+        try:
+            strings = numpy.array([row[column] for row in rows], dtype=str)
+            if 'timestamp' in column:
+                array = strings.astype(TIMESTAMP_DTYPE).astype(numpy.int64)
+                if lossless is True and not numpy.array_equal(timestamp_strings(array), strings):
+                    return None
+            else:
+                array = strings.astype(numpy.float64)
+                if lossless is True and [repr(value) for value in array.tolist()] != strings.tolist():
+                    return None
+        except (KeyError, TypeError, ValueError):
+            return None
+        columns[column] = array
+    return columns
+
+
+def columnar_file(expect_dir:str, sha256:str)->str:
+    """
+    Path of the columnar form of an expect file
+    """
+    return os.path.join(expect_dir, COLUMNAR_DIR, '%s.col' % sha256)
+
+
+def write_columns(columns:dict, file_name:str):
+    """
+    Write columns into file_name (see file format)
+    """
+    header = {'rows': len(next(iter(columns.values()))), 'columns': []}
+    offset = 0
+    for column, array in columns.items():
+        header['columns'].append({'name': column, 'dtype': array.dtype.newbyteorder('<').str, 'offset': offset})
+        offset += array.nbytes
+    header = MAGIC + json.dumps(header).encode() + b'\n'
+    header += b' ' * (-len(header) % ALIGNMENT)
+
+    os.makedirs(os.path.dirname(file_name), exist_ok=True)
+    try:
+        with open(file_name + '.tmp', 'wb') as f:
+            f.write(header)
+            for array in columns.values():
+                f.write(array.astype(array.dtype.newbyteorder('<')).tobytes())
+        os.replace(file_name + '.tmp', file_name)
+    except Exception as e:
+        assert True == False, 'Failed to write columnar file: %s (Error: %s)' % (file_name, e)
+
+
+def read_columns(file_name:str)->dict:
+    """
+    Memory-map a columnar file
+    :params:
+        data:numpy.memmap - whole file (read-only)
+    :return:
+        column -> array (read-only views of the mapped file)
+    """
+    data = numpy.memmap(file_name, dtype=numpy.uint8, mode='r')
+    header_end = bytes(data[:4096]).index(b'\n', len(MAGIC))
+    assert bytes(data[:len(MAGIC)]) == MAGIC, 'Invalid columnar file: %s' % file_name
+    header = json.loads(bytes(data[len(MAGIC):header_end]))
+    start = header_end + 1 + (-(header_end + 1) % ALIGNMENT)
+    return {column['name']: numpy.frombuffer(data, dtype=column['dtype'], count=header['rows'], offset=start + column['offset'])
+            for column in header['columns']}
+
+
+def load(expect_file:str)->dict:
+    """
+    Columns of expect file - memory-mapped (built on first use), shared by expect files with the same content
+    :args:
+        expect_file:str - expect file (expect_dir + test file name)
+    :params:
+        entry:dict - manifest entry of expect file
+        window:tuple - widest window, unit & count if expect file is a derived period window
+    :return:
+        column -> array - None if expect file has no columnar form
+    """
+    expect_dir = os.path.dirname(expect_file)
+    entry = support.manifest.get_entry(expect_file)
+    window = support.golden.period_window(expect_file)
+    if entry is None and os.path.isfile(expect_file): # changed since the manifest was built (sha256 unknown) - compared by hash
+        return None
+    if (entry is None or 'derived' in entry) and window is not None and support.golden.exists(window[0]):
+        columns = load(window[0])
+        if columns is None or 'timestamp' not in columns:
+            return None
+        timestamps = columns['timestamp']
+        if not len(timestamps):
+            return columns
+        start = timestamps[-1] - window[2] * (support.golden.PERIOD_UNITS[window[1]] // datetime.timedelta(microseconds=1))
+        first = int(numpy.searchsorted(timestamps, start, side='left'))
+        return {column: array[first:] for column, array in columns.items()}
+    if entry is None or not support.golden.exists(expect_file):
+        return None
+
+    sha256 = entry['sha256']
+    if sha256 not in COLUMNS:
+        file_name = columnar_file(expect_dir, sha256)
+        if not os.path.isfile(file_name):
+            with support.golden.open_expect(expect_file, 'r') as f:
+                columns = to_columns([json.loads(line) for line in f if line.strip()])
+            if columns is None:
+                COLUMNS[sha256] = None
+                return None
+            write_columns(columns, file_name)
+        COLUMNS[sha256] = read_columns(file_name)
+    return COLUMNS[sha256]
+
+
+def compare(data:list, expect_file:str)->dict:
+    """
+    Typed (vectorized) comparison of results with an expect file
+    :args:
+        data:list - results
+        expect_file:str - expect file
+    :return:
+        rows (expect & actual), mismatches (column -> number of rows that differ), first (index of first row that
+        differs, None if identical) - None if expect file or results have no columnar form. Results must round-trip
+        losslessly as expect files do (ex. 2 instead of 2.0 has none), so a difference in formatting is not hidden by
+        parsing & is left to the hash comparison
+    """
+    expect = load(expect_file)
+    if expect is None:
+        return None
+    rows = len(next(iter(expect.values()))) if expect else 0
+    actual = to_columns(data) if data else {column: array[:0] for column, array in expect.items()}
+    if actual is None or list(actual) != list(expect):
+        return None
+
+    size = min(rows, len(data))
+    differs = numpy.zeros(size, dtype=bool)
+    mismatches = {}
+    for column in expect:
+        column_differs = expect[column][:size] != actual[column][:size]
+        mismatches[column] = int(column_differs.sum()) + abs(rows - len(data))
+        differs |= column_differs
+    first = int(numpy.argmax(differs)) if differs.any() else (size if rows != len(data) else None)
+    return {'rows': {'expect': rows, 'actual': len(data)}, 'mismatches': mismatches, 'first': first}
+
+
+def format_comparison(comparison:dict, data:list, expect_file:str)->str:
+    """
+    Human readable report of a typed comparison (see compare) - rows, mismatches per column & the first row that differs
+    """
+    lines = ['rows: expect %s, actual %s (columnar)' % (comparison['rows']['expect'], comparison['rows']['actual'])]
+    mismatches = {column: count for column, count in comparison['mismatches'].items() if count}
+    if mismatches:
+        lines.append('mismatches per column: %s' % ', '.join('%s=%s' % (column, count) for column, count in
+                                                           sorted(mismatches.items(), key=lambda item: -item[1])))
+    first = comparison['first']
+    if first is not None:
+        expect = load(expect_file)
+        if first < comparison['rows']['expect']:
+            row = {column: (timestamp_strings(array[first:first + 1])[0] if 'timestamp' in column else repr(float(array[first])))
+                   for column, array in expect.items()}
+            lines.append('  expect row %s: %s' % (first, json.dumps(row)))
+        if first < len(data):
+            lines.append('  actual row %s: %s' % (first, json.dumps(data[first])))
+    return '\n'.join(lines)
+
+
+def main():
+    """
+    Build the columnar form of all expect files in expect_dir (the manifest)
+    :optional arguments:
+        --expect-dir EXPECT_DIR     directory with expect files
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--expect-dir', type=str, default='expect', help='directory with expect files')
+    args = parser.parse_args()
+
+    expect_dir = os.path.expandvars(os.path.expanduser(args.expect_dir))
+    built = 0
+    for file_name in sorted(support.manifest.load_manifest(expect_dir)):
+        if load(os.path.join(expect_dir, file_name)) is not None:
+            built += 1
+    print('%s of %s expect files have a columnar form (%s)' % (built, len(support.manifest.load_manifest(expect_dir)),
+                                                             os.path.join(expect_dir, COLUMNAR_DIR)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,11 @@
 import datetime
+import functools
 from dateutil import tz
 
+EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+DIGITS = '0123456789'
+OFFSET_CACHE_SIZE = 16384 # hours of local time whose UTC offset is cached (~1.9 years)
+
 
 def convert_timezone(query:str, timestamp:str)->str: 
     """
@@ -17,6 +22,15 @@ def convert_timezone(query:str, timestamp:str)->str:
     :return:
         utc_time
     """
+    # fast path - fixed YYYY-MM-DD HH:MM:SS.ffffff layout & an hour w/o DST transition 
+    if (len(timestamp) > 20 and timestamp[13] == ':' and timestamp[16] == ':' and timestamp[19] == '.' and '.' not in timestamp[20:]
+            and timestamp[14] in '012345' and timestamp[15] in DIGITS and timestamp[17] in '012345' and timestamp[18] in DIGITS): 
+        hour = hour_offset(timestamp[:13])
+        if hour is not None and hour[2] is True: 
+            if hour[3] is not None: 
+                return hour[3] + timestamp[13:]
+            return format_seconds(hour[0] + int(timestamp[14:16]) * 60 + int(timestamp[17:19]) - hour[1]) + timestamp[19:]
+
     # remove sub-seconds
     subseconds = timestamp.split('.')[-1]
     timestamp = timestamp.split('.')[0]
@@ -36,4 +50,130 @@ def convert_timezone(query:str, timestamp:str)->str:
     except Exception as e:
         assert True == False, 'Failed to convert datetime back to string (Error: %s).\n\tQuery: %s\n' % (e, query)
 
-    return utc_time
\ No newline at end of file
+    return utc_time
+
+
+def parse_timestamp(timestamp:str)->int: 
+    """
+    Parse the YYYY-MM-DD HH:MM:SS part of a timestamp w/o strptime 
+    :args: 
+        timestamp:str - timestamp 
+    :return: 
+        local time as seconds since 1970-01-01 00:00:00 (sub-seconds ignored) - None if timestamp has another layout
+    """
+    if len(timestamp) < 19 or timestamp[4] != '-' or timestamp[7] != '-' or timestamp[10] != ' ' or timestamp[13] != ':' or timestamp[16] != ':': 
+        return None 
+    digits = timestamp[0:4] + timestamp[5:7] + timestamp[8:10] + timestamp[11:13] + timestamp[14:16] + timestamp[17:19]
+    if not (digits.isascii() and digits.isdigit()): 
+        return None 
+    try: 
+        hour, minute, second = int(timestamp[11:13]), int(timestamp[14:16]), int(timestamp[17:19])
+        days = datetime.date(int(timestamp[0:4]), int(timestamp[5:7]), int(timestamp[8:10])).toordinal() - EPOCH_ORDINAL
+    except ValueError: 
+        return None 
+    if hour > 23 or minute > 59 or second > 59: 
+        return None 
+    return days * 86400 + hour * 3600 + minute * 60 + second 
+
+
+def format_seconds(seconds:int)->str: 
+    """
+    Format seconds since 1970-01-01 00:00:00 as YYYY-MM-DD HH:MM:SS w/o strftime 
+    """
+    days, seconds = divmod(seconds, 86400)
+    date = datetime.date.fromordinal(days + EPOCH_ORDINAL)
+    return '%04d-%02d-%02d %02d:%02d:%02d' % (date.year, date.month, date.day, seconds // 3600, seconds // 60 % 60, seconds % 60)
+
+
+def utc_offset(local_seconds:int)->int: 
+    """
+    UTC offset of a local time (as convert_timezone interprets it)
+    :args: 
+        local_seconds:int - local time as seconds since 1970-01-01 00:00:00 
+    :return: 
+        offset in seconds (local time - UTC) 
+    """
+    local_time = datetime.datetime(1970, 1, 1) + datetime.timedelta(seconds=local_seconds)
+    return int((local_time - local_time.astimezone(tz.tzutc()).replace(tzinfo=None)).total_seconds())
+
+
+@functools.lru_cache(maxsize=OFFSET_CACHE_SIZE)
+def hour_offset(local_hour:str)->tuple: 
+    """
+    UTC offset of an hour of local time (LRU cached) 
+    :args: 
+        local_hour:str - YYYY-MM-DD HH 
+    :return: 
+        local hour as seconds since 1970-01-01 00:00:00, offset in seconds (at the start of the hour), whether the offset
+        is the same for the whole hour (no DST transition), UTC hour (YYYY-MM-DD HH) if the offset is whole hours - None
+        if local_hour has another layout 
+    """
+    seconds = parse_timestamp(local_hour + ':00:00')
+    if seconds is None: 
+        return None 
+    offset = utc_offset(seconds)
+    exact = offset == utc_offset(seconds + 3599)
+    return seconds, offset, exact, format_seconds(seconds - offset)[:13] if exact is True and offset % 3600 == 0 else None 
+
+
+def convert_timezones(query:str, timestamps:list)->list: 
+    """
+    Convert a column of timestamps to UTC in one vectorized pass - the UTC offset is computed once per hour of local time
+    (DST segments) & applied to all timestamps in that hour, hours containing a DST transition are converted per timestamp.
+    Requires numpy - if it is not installed, each timestamp is converted by convert_timezone 
+    :args: 
+        query:str - query executed
+        timestamps:list - timestamps to convert 
+    :params: 
+        parts:numpy.ndarray - timestamp w/o sub-seconds, '.' & sub-seconds 
+        seconds:numpy.ndarray - local time as seconds since epoch
+        hours:numpy.ndarray - distinct hours of local time (index - hour of each timestamp)
+        offsets:numpy.ndarray - UTC offset per hour 
+        exact:numpy.ndarray - whether the offset is the same for the whole hour 
+    :return:
+        UTC timestamps (as convert_timezone) 
+    """
+    if not timestamps: 
+        return []
+    try: 
+        import numpy # optional - without it timestamps are converted one by one (offsets cached per hour, see hour_offset)
+    except ImportError: 
+        return [convert_timezone(query=query, timestamp=timestamp) for timestamp in timestamps]
+    try: 
+        parts = numpy.char.partition(numpy.array(timestamps, dtype=str), '.')
+        seconds = parts[:, 0].astype('datetime64[s]').astype(numpy.int64)
+    except Exception as e: 
+        assert True == False, 'Failed to convert string to datetime (Error: %s).\n\tQuery: %s\n' % (e, query)
+
+    hours, index = numpy.unique(seconds // 3600, return_inverse=True)
+    offsets = numpy.empty(len(hours), dtype=numpy.int64)
+    exact = numpy.empty(len(hours), dtype=bool)
+    try: 
+        for i, hour in enumerate(hours.tolist()): 
+            offsets[i] = utc_offset(hour * 3600)
+            exact[i] = offsets[i] == utc_offset(hour * 3600 + 3599)
+    except Exception as e: 
+        assert True == False, 'Failed to convert datetime back to string (Error: %s).\n\tQuery: %s\n' % (e, query)
+
+    utc_time = numpy.datetime_as_string((seconds - offsets[index]).astype('datetime64[s]'), unit='s')
+    utc_time = numpy.char.add(numpy.char.add(numpy.char.replace(utc_time, 'T', ' '), parts[:, 1]), parts[:, 2]).tolist()
+    for i in numpy.flatnonzero(~exact[index]).tolist(): 
+        utc_time[i] = convert_timezone(query=query, timestamp=timestamps[i])
+    return utc_time
+
+
+def convert_rows(query:str, rows:list)->list: 
+    """
+    Convert timestamp columns (columns containing timestamp in their name) of a result set to UTC 
+    :args: 
+        query:str - query executed
+        rows:list - results 
+    :return:
+        rows with timestamp columns converted (see convert_timezones) 
+    """
+    rows = [dict(row) for row in rows]
+    for column in (rows[0] if rows else []): 
+        if 'timestamp' in column: 
+            for row, timestamp in zip(rows, convert_timezones(query=query, timestamps=[row[column] for row in rows])): 
+                row[column] = timestamp 
+    return rows 
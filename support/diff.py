@@ -0,0 +1,111 @@
+"""
+Row-level diff of results against an expect file - a single merge pass keyed on a timestamp column (both sides are
+ordered by it), the expect file is streamed so memory is bounded by the number of reported rows
+"""
+import json
+
+import support.golden
+import support.manifest
+
+
+def iter_file(expect_file:str):
+    """
+    Yield rows of an expect file (one JSON row per line) - from expect_dir or the golden store
+    """
+    try:
+        with support.golden.open_expect(expect_file, 'r') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+    except Exception as e:
+        assert True == False, 'Failed to read expect file: %s (Error: %s)' % (expect_file, e)
+
+
+def diff_rows(expect_rows, actual_rows, key:str=None, max_rows:int=10)->dict:
+    """
+    Merge-diff two row sequences ordered by key
+    :args:
+        expect_rows - iterable of expected rows
+        actual_rows - iterable of actual rows
+        key:str - column both sides are ordered by (None - first column containing timestamp, rows are compared
+                  by position if there is none)
+        max_rows:int - max number of rows reported per kind (changed, missing, extra)
+    :params:
+        expect, actual:dict - current row of each side (None once exhausted)
+    :return:
+        key, rows (expect & actual row count), changed / missing / extra (counts & first max_rows rows),
+        columns (column -> number of mismatches)
+    """
+    diff = {'key': key, 'rows': {'expect': 0, 'actual': 0}, 'changed': 0, 'missing': 0, 'extra': 0, 'columns': {},
+            'first_changed': [], 'first_missing': [], 'first_extra': []}
+    expect_rows = iter(expect_rows)
+    actual_rows = iter(actual_rows)
+
+    def __next(rows, side:str)->dict:
+        row = next(rows, None)
+        if row is not None:
+            diff['rows'][side] += 1
+        return row
+
+    expect = __next(expect_rows, 'expect')
+    actual = __next(actual_rows, 'actual')
+    if diff['key'] is None:
+        diff['key'] = support.manifest.timestamp_column(expect or actual or {})
+    key = diff['key']
+    position = 0
+
+    while expect is not None or actual is not None:
+        if expect is not None and actual is not None:
+            expect_key = expect.get(key) if key is not None else position
+            actual_key = actual.get(key) if key is not None else position
+        if actual is None or (expect is not None and str(expect_key) < str(actual_key)):
+            diff['missing'] += 1
+            if len(diff['first_missing']) < max_rows:
+                diff['first_missing'].append(expect)
+            expect = __next(expect_rows, 'expect')
+        elif expect is None or str(expect_key) > str(actual_key):
+            diff['extra'] += 1
+            if len(diff['first_extra']) < max_rows:
+                diff['first_extra'].append(actual)
+            actual = __next(actual_rows, 'actual')
+        else:
+            columns = [column for column in list(expect) + [column for column in actual if column not in expect]
+                       if expect.get(column) != actual.get(column)]
+            if columns:
+                diff['changed'] += 1
+                for column in columns:
+                    diff['columns'][column] = diff['columns'].get(column, 0) + 1
+                if len(diff['first_changed']) < max_rows:
+                    diff['first_changed'].append({'expect': expect, 'actual': actual, 'columns': columns})
+            expect = __next(expect_rows, 'expect')
+            actual = __next(actual_rows, 'actual')
+            position += 1
+
+    return diff
+
+
+def diff_file(expect_file:str, data:list, key:str=None, max_rows:int=10)->dict:
+    """
+    Diff results against an expect file (see diff_rows)
+    """
+    return diff_rows(expect_rows=iter_file(expect_file), actual_rows=data, key=key, max_rows=max_rows)
+
+
+def format_diff(diff:dict)->str:
+    """
+    Human readable diff report
+    """
+    lines = ['rows: expect %s, actual %s (key: %s) - changed: %s, missing: %s, extra: %s' % (
+        diff['rows']['expect'], diff['rows']['actual'], diff['key'], diff['changed'], diff['missing'], diff['extra'])]
+    if diff['columns']:
+        lines.append('mismatches per column: %s' % ', '.join('%s=%s' % (column, count) for column, count in
+                                                           sorted(diff['columns'].items(), key=lambda item: -item[1])))
+    for row in diff['first_changed']:
+        lines.append('  changed %s' % ', '.join('%s: %s -> %s' % (column, json.dumps(row['expect'].get(column)),
+                                                                  json.dumps(row['actual'].get(column))) for column in row['columns']))
+        lines.append('          expect %s' % json.dumps(row['expect']))
+    for row in diff['first_missing']:
+        lines.append('  missing %s' % json.dumps(row))
+    for row in diff['first_extra']:
+        lines.append('  extra   %s' % json.dumps(row))
+    return '\n'.join(lines)
@@ -1,8 +1,19 @@
 import ast 
 import configparser 
+import gzip
+import hashlib
+import itertools
 import json
 import os 
 
+import support.diff
+import support.golden
+import support.manifest
+
+EXPECT_DIGESTS = {} # expect file -> (size, mtime, sha256, row count), computed once per session
+ORACLE = None # reference engine (support.oracle.Table, loaded only if enabled) - if set, results are compared with it instead of expect files
+COLUMNAR = False # whether expect files with a columnar form are compared with it (see set_columnar)
+
 def read_config(config_file:str)->dict: 
     """
     Read configuration file
@@ -39,26 +50,193 @@ def read_config(config_file:str)->dict:
     return data 
 
 
-def write_file(query:str, data:list, results_file:str)->bool: 
+def set_columnar(enabled:bool=True)->bool: 
     """
-    Write to results file
+    Compare results with the memory-mapped columnar form of expect files that have one (see support/columnar.py) - 
+    typed, vectorized comparison instead of hashing JSON lines. Requires numpy 
+    :args: 
+        enabled:bool - whether to use the columnar form 
+    :global: 
+        COLUMNAR:bool - enabled (False if numpy is not installed) 
+    :return: 
+        COLUMNAR 
+    """
+    global COLUMNAR
+    if enabled is True: 
+        try: 
+            from support import columnar
+        except ImportError as e: 
+            print('Columnar comparison disabled (Error: %s)' % e)
+            enabled = False 
+    COLUMNAR = enabled 
+    return COLUMNAR 
+
+
+def write_file(query:str, data:list, results_file:str, compress:bool=False, batch_size:int=1024, buffer_size:int=1048576)->bool: 
+    """
+    Write to results file - rows are encoded in batches into a reusable buffer which is written in large blocks 
+    (the file is identical to writing json.dumps(row) per line) 
     :args: 
         query:str - query executed
         data:list - list data 
         results_file:str - results file 
-    :params:
+        compress:bool - gzip results file (also if results_file ends with .gz) 
+        batch_size:int - rows encoded per batch 
+        buffer_size:int - bytes buffered before a write 
+    :params: 
+        encode - JSON encoder (as used by json.dumps with default args) 
+        buffer:bytearray - encoded rows not yet written 
         status:bool 
     :return: 
         status
     """
+    encode = json.JSONEncoder().encode 
+    rows = iter(data)
+    buffer = bytearray()
     try:
-        with open(results_file, 'w') as f: 
-            for row in data: 
+        with (gzip.open(results_file, 'wb', compresslevel=6) if compress is True or results_file.endswith('.gz') else open(results_file, 'wb')) as f: 
+            while True: 
+                batch = list(itertools.islice(rows, batch_size))
+                if not batch: 
+                    break 
                 try: 
-                    f.write(json.dumps(row) + '\n')
+                    buffer += (os.linesep.join(map(encode, batch)) + os.linesep).encode()
                 except Exception as e: 
                     assert True == False, 'Failed to write line to file - %s(Error: %s).\n\tQuery: %s\n' % (results_file, e, query)
+                if len(buffer) >= buffer_size: 
+                    f.write(buffer)
+                    del buffer[:]
+            f.write(buffer)
     except Exception as e: 
         assert True == False, 'Failed to open file: %s.\n\tQuery: %s (Error: %s)' % (results_file, e, query)
+    return True 
+
+
+def expect_digest(expect_file:str)->tuple: 
+    """
+    Get sha256 & row count of an expect file - the file is read once per session (again only if it changes)
+    :args: 
+        expect_file:str - expect file 
+    :params: 
+        version:tuple - size & mtime of expect_file (None, None if it is only in the golden store) 
+        digest - sha256 of expect_file
+        rows:int - number of lines in expect_file 
+    :return: 
+        sha256 (hex), row count - (None, None) if expect_file does not exist 
+    """
+    try: 
+        stat = os.stat(expect_file)
+        version = (stat.st_size, stat.st_mtime)
+    except OSError: 
+        if not support.golden.exists(expect_file): 
+            return None, None 
+        version = (None, None) # stored or derived expect file (see support/golden.py) 
 
+    cached = EXPECT_DIGESTS.get(expect_file) 
+    if cached is None or cached[:2] != version: 
+        digest = hashlib.sha256()
+        rows = 0 
+        try: 
+            with support.golden.open_expect(expect_file, 'rb') as f: 
+                for chunk in iter(lambda: f.read(1048576), b''): 
+                    digest.update(chunk)
+                    rows += chunk.count(b'\n')
+        except Exception as e: 
+            assert True == False, 'Failed to read expect file: %s (Error: %s)' % (expect_file, e)
+        cached = EXPECT_DIGESTS[expect_file] = version + (digest.hexdigest(), rows)
 
+    return cached[2], cached[3]
+
+
+def compare_file(query:str, data:list, expect_file:str, results_file:str)->bool: 
+    """
+    Compare results with an expect file without writing them - rows are serialized as by write_file & hashed in
+    memory. results_file is written only if the results differ (& removed if they match). If ORACLE is set, results
+    are compared with the results of the reference engine instead (see support/oracle.py). If COLUMNAR is set, expect
+    files with a columnar form are compared as typed arrays (see support/columnar.py) 
+    :args: 
+        query:str - query executed
+        data:list - list data 
+        expect_file:str - expect file 
+        results_file:str - results file 
+    :params:
+        entry:dict - manifest entry of expect_file (expect_file is not read if there is one)
+        comparison:dict - typed comparison with the columnar form of expect_file (None if it has none) 
+        reason:str - why results were rejected by the manifest check (row count, first & last timestamp, column ranges)
+        digest - sha256 of serialized rows 
+        rows:int - number of rows 
+        status:bool 
+    :return: 
+        status - True if results are identical to expect_file (if not, a row-level diff is printed)
+    """
+    if ORACLE is not None: 
+        try: 
+            reason = ORACLE.verify(query=query, data=data)
+        except ValueError: # query shape not supported by the reference engine - compare with expect file 
+            pass 
+        else: 
+            if reason is None: 
+                if os.path.isfile(results_file): 
+                    os.remove(results_file)
+                return True 
+            print('%s: %s (reference engine)' % (os.path.basename(expect_file), reason))
+            write_file(query=query, data=data, results_file=results_file)
+            return False 
+
+    entry = support.manifest.get_entry(expect_file)
+    if entry is not None: 
+        reason = support.manifest.check(entry, data)
+        if reason is not None: 
+            print('%s: %s' % (os.path.basename(expect_file), reason))
+            report_diff(query=query, data=data, expect_file=expect_file, results_file=results_file)
+            return False 
+
+    if COLUMNAR is True: 
+        from support import columnar # requires numpy - imported only if COLUMNAR is set 
+        comparison = columnar.compare(data=data, expect_file=expect_file)
+        if comparison is not None: # None - expect file or results have no columnar form (compared by hash) 
+            if comparison['first'] is None: 
+                if os.path.isfile(results_file): 
+                    os.remove(results_file)
+                return True 
+            report_diff(query=query, data=data, expect_file=expect_file, results_file=results_file, comparison=comparison)
+            return False 
+
+    digest = hashlib.sha256()
+    rows = 0 
+    for row in data: 
+        try: 
+            digest.update((json.dumps(row) + os.linesep).encode())
+        except Exception as e: 
+            assert True == False, 'Failed to serialize row (Error: %s).\n\tQuery: %s\n' % (e, query)
+        rows += 1
+
+    status = (digest.hexdigest(), rows) == ((entry['sha256'], entry['rows']) if entry is not None else expect_digest(expect_file))
+    if status is True: 
+        if os.path.isfile(results_file): 
+            os.remove(results_file)
+    else: 
+        report_diff(query=query, data=data, expect_file=expect_file, results_file=results_file)
+
+    return status 
+
+
+def report_diff(query:str, data:list, expect_file:str, results_file:str, max_rows:int=10, comparison:dict=None): 
+    """
+    Write results file & print a row-level diff against expect file (first max_rows changed / missing / extra rows
+    & mismatches per column) - or, given a columnar comparison, its mismatches per column & first row that differs
+    :args: 
+        query:str - query executed
+        data:list - list data 
+        expect_file:str - expect file 
+        results_file:str - results file 
+        max_rows:int - max number of rows reported per kind
+        comparison:dict - typed comparison with the columnar form of expect file (see support.columnar.compare)
+    """
+    write_file(query=query, data=data, results_file=results_file)
+    if comparison is not None: 
+        from support import columnar
+        print('%s vs. %s\n%s' % (expect_file, results_file, columnar.format_comparison(comparison, data=data, expect_file=expect_file)))
+        return 
+    if support.golden.exists(expect_file): 
+        print('%s vs. %s\n%s' % (expect_file, results_file, support.diff.format_diff(support.diff.diff_file(expect_file=expect_file, data=data, max_rows=max_rows))))
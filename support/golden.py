@@ -0,0 +1,285 @@
+"""
+Content-addressed golden store - each distinct expect file is stored once, gzip compressed, as
+<expect_dir>/objects/<sha256>.json.gz & test names (expect file names) are mapped to the sha256 by the manifest
+(see support/manifest.py). Expect files present in expect_dir take precedence over the store.
+
+Period windows (period_minute*, period_hour*, period_day* ...) are nested windows over the same timestamp ordered rows,
+only the widest window of each family is stored - narrower windows are derived on demand by binary search of the
+timestamps of the widest one (a new window length costs no storage). Increments (increments_minute*, increments_hour*,
+increments_day* ...) are derived from a per-minute rollup of all rows of the data set (see support/rollup.py) - an
+expect file is derived only if the rollup reproduces it exactly (pack checks the sha256), a new interval needs none
+:sample:
+    python3 support/golden.py --expect-dir expect pack --remove   # store expect files (& remove them)
+    python3 support/golden.py --expect-dir expect unpack          # restore expect files from the store
+"""
+import argparse
+import bisect
+import datetime
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import support.manifest
+
+# prefix of period window expect files -> widest window of the family (narrower windows are derived from it)
+PERIOD_FAMILIES = {
+    'base_queries_test_period_': 'base_queries_test_period_day7.json',
+    'base_queries_test_period_historic_': 'base_queries_test_period_historic_day7.json'
+}
+PERIOD_UNITS = {'minute': datetime.timedelta(minutes=1), 'hour': datetime.timedelta(hours=1),
+                'day': datetime.timedelta(days=1), 'week': datetime.timedelta(weeks=1)}
+PERIOD_PATTERN = re.compile(r'^(.+_)(%s)(\d+)\.json$' % '|'.join(PERIOD_UNITS))
+TIMESTAMP_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+PERIOD_SOURCES = {} # widest window -> (lines, timestamps), read once per session
+# prefix of increments expect files -> expect file with all rows of the data set (timestamp & value)
+INCREMENTS_FAMILIES = {
+    'base_queries_test_increments_': 'base_queries_test_period_day7.json'
+}
+INCREMENTS_PATTERN = re.compile(r'^(.+_)(minute|hour|day|week|month|year)(\d+)\.json$') # units derivable from minute cells
+ROLLUPS = {} # source -> support.rollup.Rollup, built once per session
+
+
+def stored_file(expect_file:str)->str:
+    """
+    Stored object of expect file - None if expect file is not in the store
+    """
+    entry = support.manifest.load_manifest(os.path.dirname(expect_file)).get(os.path.basename(expect_file))
+    if entry is not None:
+        file_name = support.manifest.object_file(os.path.dirname(expect_file), entry['sha256'])
+        if os.path.isfile(file_name):
+            return file_name
+    return None
+
+
+def period_window(expect_file:str)->tuple:
+    """
+    Period window of expect file
+    :return:
+        widest window of the family (expect file), unit, count - None if expect file is not a derivable window
+    """
+    match = PERIOD_PATTERN.match(os.path.basename(expect_file))
+    if match is None or match.group(1) not in PERIOD_FAMILIES:
+        return None
+    source = os.path.join(os.path.dirname(expect_file), PERIOD_FAMILIES[match.group(1)])
+    if os.path.basename(source) == os.path.basename(expect_file):
+        return None
+    return source, match.group(2), int(match.group(3))
+
+
+def derive_period(expect_file:str)->bytes:
+    """
+    Derive a period window from the widest window of its family - the window ends with the last row & starts
+    count * unit before it (inclusive), the first row is found by binary search of the sorted timestamps
+    :args:
+        expect_file:str - expect file of the window
+    :params:
+        lines:list - rows (bytes) of the widest window
+        timestamps:list - timestamp of each row (sorted)
+        start:str - first timestamp of the window
+    :return:
+        content of expect file - None if it cannot be derived
+    """
+    window = period_window(expect_file)
+    if window is None:
+        return None
+    source, unit, count = window
+    if source not in PERIOD_SOURCES:
+        if not (os.path.isfile(source) or stored_file(source) is not None):
+            return None
+        lines = read_expect(source).splitlines(keepends=True)
+        timestamps = [json.loads(line)['timestamp'] for line in lines]
+        if timestamps != sorted(timestamps):
+            return None
+        PERIOD_SOURCES[source] = (lines, timestamps)
+    lines, timestamps = PERIOD_SOURCES[source]
+    if not lines:
+        return b''
+    start = (datetime.datetime.strptime(timestamps[-1], TIMESTAMP_FORMAT) - count * PERIOD_UNITS[unit]).strftime(TIMESTAMP_FORMAT)
+    return b''.join(lines[bisect.bisect_left(timestamps, start):])
+
+
+def increments_window(expect_file:str)->tuple:
+    """
+    Increments of expect file
+    :return:
+        expect file with all rows of the data set, unit, units - None if expect file is not derivable increments
+    """
+    match = INCREMENTS_PATTERN.match(os.path.basename(expect_file))
+    if match is None or match.group(1) not in INCREMENTS_FAMILIES:
+        return None
+    return os.path.join(os.path.dirname(expect_file), INCREMENTS_FAMILIES[match.group(1)]), match.group(2), int(match.group(3))
+
+
+def derive_increments(expect_file:str)->bytes:
+    """
+    Derive increments(unit, units, timestamp) results by merging adjacent cells of the per-minute rollup of the data set
+    :args:
+        expect_file:str - expect file of the increments
+    :return:
+        content of expect file - None if it cannot be derived
+    """
+    window = increments_window(expect_file)
+    if window is None:
+        return None
+    source, unit, units = window
+    if source not in ROLLUPS:
+        if not (os.path.isfile(source) or stored_file(source) is not None):
+            return None
+        from support import rollup # requires numpy - imported only when increments are derived
+        ROLLUPS[source] = rollup.build([json.loads(line) for line in read_expect(source).splitlines() if line.strip()])
+    encode = json.JSONEncoder().encode
+    return ''.join(encode(row) + '\n' for row in ROLLUPS[source].result(unit, units)).encode()
+
+
+def derive(expect_file:str)->bytes:
+    """
+    Derive expect file - from a wider period window or the rollup of the data set (None if it cannot be derived)
+    """
+    data = derive_period(expect_file)
+    return data if data is not None else derive_increments(expect_file)
+
+
+def source_file(expect_file:str)->str:
+    """
+    Expect file an expect file is derived from - None if it cannot be derived
+    """
+    window = period_window(expect_file) or increments_window(expect_file)
+    return window[0] if window is not None else None
+
+
+def exists(expect_file:str)->bool:
+    """
+    Whether expect file exists - in expect_dir, in the store or derived (from a wider period window or the data set)
+    """
+    if os.path.isfile(expect_file) or stored_file(expect_file) is not None:
+        return True
+    source = source_file(expect_file)
+    return source is not None and (os.path.isfile(source) or stored_file(source) is not None)
+
+
+def open_expect(expect_file:str, mode:str='rb'):
+    """
+    Open expect file by name - from expect_dir if present, otherwise from the store or derived (see derive)
+    :args:
+        expect_file:str - expect file (expect_dir + test file name)
+        mode:str - rb or r
+    :return:
+        file object
+    """
+    if os.path.isfile(expect_file):
+        return open(expect_file, mode)
+    file_name = stored_file(expect_file)
+    if file_name is not None:
+        return gzip.open(file_name, 'rb' if mode == 'rb' else 'rt')
+    data = derive(expect_file)
+    if data is None:
+        raise FileNotFoundError('Expect file %s not found (nor in store)' % expect_file)
+    return io.BytesIO(data) if mode == 'rb' else io.StringIO(data.decode())
+
+
+def read_expect(expect_file:str)->bytes:
+    """
+    Content of expect file
+    """
+    with open_expect(expect_file, 'rb') as f:
+        return f.read()
+
+
+def pack(expect_dir:str, remove:bool=False)->dict:
+    """
+    Store expect files in expect_dir - rebuilds the manifest (the index of the store), writes an object per distinct
+    content (except expect files derived from a wider period window or the data set) & removes objects no longer
+    referenced
+    :args:
+        expect_dir:str - directory with expect files
+        remove:bool - remove expect files once stored
+    :return:
+        stats - files, objects, derived (files), bytes (expect files) & stored_bytes (objects)
+    """
+    manifest = support.manifest.build_manifest(expect_dir)
+    os.makedirs(os.path.join(expect_dir, support.manifest.OBJECTS_DIR), exist_ok=True)
+    PERIOD_SOURCES.clear()
+    ROLLUPS.clear()
+
+    stats = {'files': len(manifest), 'objects': 0, 'derived': 0, 'bytes': 0, 'stored_bytes': 0}
+    objects = set()
+    for file_name, entry in sorted(manifest.items()):
+        expect_file = os.path.join(expect_dir, file_name)
+        stats['bytes'] += entry['size']
+        entry.pop('derived', None)
+        derived = derive(expect_file)
+        if derived is not None and hashlib.sha256(derived).hexdigest() == entry['sha256']:
+            entry['derived'] = os.path.basename(source_file(expect_file))
+            stats['derived'] += 1
+            continue
+        stored = support.manifest.object_file(expect_dir, entry['sha256'])
+        if entry['sha256'] not in objects:
+            objects.add(entry['sha256'])
+            if not os.path.isfile(stored):
+                with open(stored, 'wb') as f:
+                    f.write(gzip.compress(read_expect(expect_file), compresslevel=9, mtime=0))
+            stats['stored_bytes'] += os.path.getsize(stored)
+    support.manifest.write_manifest(expect_dir, manifest=manifest)
+
+    if remove is True:
+        for file_name in manifest:
+            if os.path.isfile(os.path.join(expect_dir, file_name)):
+                os.remove(os.path.join(expect_dir, file_name))
+
+    for file_name in os.listdir(os.path.join(expect_dir, support.manifest.OBJECTS_DIR)):
+        if file_name.split('.')[0] not in objects:
+            os.remove(os.path.join(expect_dir, support.manifest.OBJECTS_DIR, file_name))
+    stats['objects'] = len(objects)
+    return stats
+
+
+def unpack(expect_dir:str)->int:
+    """
+    Restore expect files from the store (existing files are kept)
+    :return:
+        number of files restored
+    """
+    restored = 0
+    for file_name in sorted(support.manifest.load_manifest(expect_dir)):
+        expect_file = os.path.join(expect_dir, file_name)
+        if not os.path.isfile(expect_file):
+            data = read_expect(expect_file)
+            with open(expect_file, 'wb') as f:
+                f.write(data)
+            restored += 1
+    return restored
+
+
+def main():
+    """
+    :positional arguments:
+        action      pack - store expect files, unpack - restore expect files from store
+    :optional arguments:
+        --expect-dir EXPECT_DIR     directory with expect files
+        --remove                    (pack) remove expect files once stored
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('action', type=str, choices=['pack', 'unpack'], help='pack - store expect files, unpack - restore expect files from store')
+    parser.add_argument('--expect-dir', type=str, default='expect', help='directory with expect files')
+    parser.add_argument('--remove', action='store_true', help='(pack) remove expect files once stored')
+    args = parser.parse_args()
+
+    expect_dir = os.path.expandvars(os.path.expanduser(args.expect_dir))
+    if args.action == 'pack':
+        stats = pack(expect_dir, remove=args.remove)
+        print('%s files (%.1f MB) stored as %s objects (%.1f MB), %s derived' % (
+            stats['files'], stats['bytes'] / 1e6, stats['objects'], stats['stored_bytes'] / 1e6, stats['derived']))
+    else:
+        print('%s files restored' % unpack(expect_dir))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,250 @@
+"""
+Manifest of the expect (golden) directory - per expect file: sha256, size, row count, first & last timestamp and
+per-column min / max. The manifest is loaded once per session, so results can be rejected (wrong row count, first /
+last timestamp or a value outside the range of its column) without reading the expect file
+:sample:
+    python3 support/manifest.py --expect-dir expect
+"""
+import argparse
+import hashlib
+import json
+import os
+
+MANIFEST_FILE = 'manifest.json'
+MANIFESTS = {} # expect_dir -> manifest, loaded once per session
+ENTRY_VERSIONS = {} # expect file -> (size, mtime, entry sha256, matches entry), checked once per version of the file
+OBJECTS_DIR = 'objects' # content-addressed store of expect files (see support/golden.py)
+
+
+def column_range(values:list)->list:
+    """
+    Min & max of (string) column values - numeric if all values are numeric
+    :return:
+        [min, max] as they appear in the file
+    """
+    values = [value for value in values if value is not None]
+    if not values:
+        return [None, None]
+    try:
+        numbers = [float(value) for value in values]
+    except (TypeError, ValueError):
+        values = [str(value) for value in values]
+        return [min(values), max(values)]
+    return [values[numbers.index(min(numbers))], values[numbers.index(max(numbers))]]
+
+
+def timestamp_column(row:dict)->str:
+    """
+    First column of row containing timestamp in its name (ex. timestamp, min(timestamp))
+    """
+    for column in row:
+        if 'timestamp' in column:
+            return column
+    return None
+
+
+def file_entry(expect_file:str)->dict:
+    """
+    Scan an expect file (one JSON row per line)
+    :args:
+        expect_file:str - expect file
+    :params:
+        digest - sha256 of file
+        columns:dict - column -> values
+    :return:
+        sha256, size, rows, timestamp column, first & last timestamp, columns (column -> [min, max])
+    """
+    digest = hashlib.sha256()
+    columns = {}
+    rows = []
+    try:
+        with open(expect_file, 'rb') as f:
+            for line in f:
+                digest.update(line)
+                if line.strip():
+                    rows.append(json.loads(line))
+    except Exception as e:
+        assert True == False, 'Failed to read expect file: %s (Error: %s)' % (expect_file, e)
+
+    for row in rows:
+        for column in row:
+            columns.setdefault(column, []).append(row[column])
+    column = timestamp_column(rows[0]) if rows else None
+
+    return {
+        'sha256': digest.hexdigest(),
+        'size': os.path.getsize(expect_file),
+        'rows': len(rows),
+        'timestamp_column': column,
+        'first_timestamp': rows[0][column] if column is not None else None,
+        'last_timestamp': rows[-1][column] if column is not None else None,
+        'columns': {name: column_range(values) for name, values in columns.items()}
+    }
+
+
+def object_file(expect_dir:str, sha256:str)->str:
+    """
+    Path of an expect file stored by content (see support/golden.py)
+    """
+    return os.path.join(expect_dir, OBJECTS_DIR, '%s.json.gz' % sha256)
+
+
+def build_manifest(expect_dir:str)->dict:
+    """
+    Build manifest for all JSON files in expect_dir - entries of files only in the store (or derived from a wider
+    period window) are kept
+    :return:
+        file name -> entry (see file_entry)
+    """
+    manifest = {file_name: file_entry(os.path.join(expect_dir, file_name)) for file_name in sorted(os.listdir(expect_dir))
+                if file_name.endswith('.json') and file_name != MANIFEST_FILE}
+    MANIFESTS.pop(os.path.abspath(expect_dir), None)
+    for file_name, entry in load_manifest(expect_dir).items():
+        if file_name not in manifest and (os.path.isfile(object_file(expect_dir, entry['sha256'])) or 'derived' in entry):
+            manifest[file_name] = entry
+    return dict(sorted(manifest.items()))
+
+
+def write_manifest(expect_dir:str, manifest:dict=None)->str:
+    """
+    Build (unless given) & write manifest into expect_dir
+    :return:
+        manifest file
+    """
+    manifest_file = os.path.join(expect_dir, MANIFEST_FILE)
+    if manifest is None:
+        manifest = build_manifest(expect_dir)
+    try:
+        with open(manifest_file, 'w') as f:
+            json.dump(manifest, f, indent=1, sort_keys=True)
+            f.write('\n')
+    except Exception as e:
+        assert True == False, 'Failed to write manifest: %s (Error: %s)' % (manifest_file, e)
+    MANIFESTS[os.path.abspath(expect_dir)] = manifest
+    return manifest_file
+
+
+def load_manifest(expect_dir:str)->dict:
+    """
+    Load manifest of expect_dir (once per session)
+    :return:
+        manifest - empty if expect_dir has no manifest
+    """
+    expect_dir = os.path.abspath(expect_dir)
+    if expect_dir not in MANIFESTS:
+        manifest = {}
+        manifest_file = os.path.join(expect_dir, MANIFEST_FILE)
+        if os.path.isfile(manifest_file):
+            try:
+                with open(manifest_file, 'r') as f:
+                    manifest = json.load(f)
+            except Exception as e:
+                assert True == False, 'Failed to read manifest: %s (Error: %s)' % (manifest_file, e)
+        MANIFESTS[expect_dir] = manifest
+    return MANIFESTS[expect_dir]
+
+
+def file_sha256(expect_file:str)->str:
+    """
+    sha256 of a file (read in blocks)
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(expect_file, 'rb') as f:
+            for chunk in iter(lambda: f.read(1048576), b''):
+                digest.update(chunk)
+    except Exception as e:
+        assert True == False, 'Failed to read expect file: %s (Error: %s)' % (expect_file, e)
+    return digest.hexdigest()
+
+
+def get_entry(expect_file:str)->dict:
+    """
+    Manifest entry of expect file - None if there is no entry or the file changed since the manifest was built. A file
+    in expect_dir is re-hashed whenever its size or mtime changes (at most once per version of the file & entry), so
+    edits that keep the size are detected
+    :params:
+        version:tuple - size & mtime of expect_file & sha256 of its entry
+        cached:tuple - version & whether expect_file matched the entry (see ENTRY_VERSIONS)
+    :return:
+        entry - unchanged if expect_file is only in the store (or derived)
+    """
+    entry = load_manifest(os.path.dirname(expect_file)).get(os.path.basename(expect_file))
+    if entry is None:
+        return None
+    try:
+        stat = os.stat(expect_file)
+    except OSError:
+        return entry
+    version = (stat.st_size, stat.st_mtime, entry['sha256'])
+    cached = ENTRY_VERSIONS.get(expect_file)
+    if cached is None or cached[:3] != version:
+        fresh = stat.st_size == entry['size'] and file_sha256(expect_file) == entry['sha256']
+        cached = ENTRY_VERSIONS[expect_file] = version + (fresh,)
+    return entry if cached[3] is True else None
+
+
+def value_range(bounds:list)->tuple:
+    """
+    Recorded [min, max] of a column as comparable values - floats if both bounds are numeric, else strings
+    :return:
+        min, max, convert (float or str)
+    """
+    try:
+        return float(bounds[0]), float(bounds[1]), float
+    except (TypeError, ValueError):
+        return str(bounds[0]), str(bounds[1]), str
+
+
+def check(entry:dict, data:list)->str:
+    """
+    Check of results against a manifest entry - row count, first & last timestamp (O(1)), then every value against the
+    [min, max] recorded for its column (a value outside the range of the expect file means results differ)
+    :args:
+        entry:dict - manifest entry
+        data:list - results
+    :return:
+        reason results differ from expect file (None if not rejected)
+    """
+    if len(data) != entry['rows']:
+        return 'row count %s != %s' % (len(data), entry['rows'])
+    column = entry['timestamp_column']
+    if data and column is not None:
+        if data[0].get(column) != entry['first_timestamp']:
+            return 'first %s %s != %s' % (column, data[0].get(column), entry['first_timestamp'])
+        if data[-1].get(column) != entry['last_timestamp']:
+            return 'last %s %s != %s' % (column, data[-1].get(column), entry['last_timestamp'])
+    for column, bounds in entry.get('columns', {}).items():
+        if None in bounds:
+            continue
+        low, high, convert = value_range(bounds)
+        for row in data:
+            value = row.get(column)
+            if value is None:
+                continue
+            try:
+                value = convert(value)
+            except (TypeError, ValueError):
+                return '%s %s not numeric (range %s - %s)' % (column, value, bounds[0], bounds[1])
+            if value < low or value > high:
+                return '%s %s out of range %s - %s' % (column, row.get(column), bounds[0], bounds[1])
+    return None
+
+
+def main():
+    """
+    :positional arguments: none
+    :optional arguments:
+        --expect-dir EXPECT_DIR     directory with expect files
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--expect-dir', type=str, default='expect', help='directory with expect files')
+    args = parser.parse_args()
+
+    expect_dir = os.path.expandvars(os.path.expanduser(args.expect_dir))
+    manifest_file = write_manifest(expect_dir)
+    print('%s: %s files' % (manifest_file, len(load_manifest(expect_dir))))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,574 @@
+"""
+Reference query engine - loads data/<dbms>.<table>.*.json into typed arrays & evaluates the suite's query shapes with
+vectorized NumPy code, so expected results follow the data set (of any size) instead of frozen expect files & literals.
+Results are formatted as returned by a node (lower case column names, string values)
+:supported:
+    SELECT [DISTINCT] columns, COUNT(*) / COUNT([DISTINCT] col) / MIN / MAX / AVG / SUM(col) [AS alias],
+           increments(unit, n, timestamp)
+    FROM table [WHERE ...] [GROUP BY columns] [ORDER BY columns [ASC | DESC]] [LIMIT n]
+    WHERE - column <op> literal (=, !=, <>, <, <=, >, >=), AND / OR / NOT, parentheses,
+            period(unit, n, anchor | now(), timestamp)
+:sample:
+    python3 support/oracle.py --data-dir data --file-info anylog.ping_sensor "select count(*) from ping_sensor"
+"""
+import argparse
+import json
+import math
+import os
+import re
+import sys
+
+import numpy
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import simulator.merge
+import simulator.node
+import simulator.translate
+
+FROM_WHERE = re.compile(r'^from\s+(\w+)(?:\s+where\s+(.*))?$', re.IGNORECASE | re.DOTALL)
+TOKEN = re.compile(r"\s*(?:('[^']*')|(-?\d+(?:\.\d+)?(?:e[+-]?\d+)?)\b|(<>|!=|<=|>=|=|<|>)|([(),])|(\w+))", re.IGNORECASE)
+COMPARE = {
+    '=': numpy.equal, '!=': numpy.not_equal, '<>': numpy.not_equal,
+    '<': numpy.less, '<=': numpy.less_equal, '>': numpy.greater, '>=': numpy.greater_equal
+}
+FLIP = {'<': '>', '<=': '>=', '>': '<', '>=': '<='}
+TIMESTAMP_DTYPE = 'datetime64[us]'
+TABLES = {} # (data_dir, file_info) -> Table, loaded once per session
+
+
+def to_timestamps(strings)->numpy.ndarray:
+    """
+    Convert (normalized) timestamp strings to int64 microseconds since epoch
+    """
+    return numpy.asarray(strings, dtype=str).astype(TIMESTAMP_DTYPE).astype(numpy.int64)
+
+
+def column_kind(values:list)->str:
+    """
+    Kind of a column - integer, real, timestamp or text (None values are ignored)
+    """
+    values = [value for value in values if value is not None]
+    if values and all(isinstance(value, int) and not isinstance(value, bool) for value in values):
+        return 'integer'
+    if values and all(isinstance(value, str) for value in values) and all(simulator.translate.is_timestamp(value) for value in values):
+        return 'timestamp'
+    for value in values:
+        if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+            return 'text'
+        if isinstance(value, str):
+            try:
+                float(value)
+            except ValueError:
+                return 'text'
+    return 'real' if values else 'text'
+
+
+def make_column(values:list)->dict:
+    """
+    Typed column
+    :args:
+        values:list - column values of all rows (None if missing)
+    :return:
+        kind, valid (bool array), values (int64 for integer & timestamp - microseconds, float64 for real, int64 sort
+        codes for text), strings (timestamp & text - values as stored by a node)
+    """
+    kind = column_kind(values)
+    valid = numpy.array([value is not None for value in values], dtype=bool)
+    column = {'kind': kind, 'valid': valid, 'strings': None}
+    if kind == 'integer':
+        column['values'] = numpy.array([0 if value is None else value for value in values], dtype=numpy.int64)
+    elif kind == 'real':
+        column['values'] = numpy.array([0.0 if value is None else float(value) for value in values], dtype=numpy.float64)
+    else:
+        strings = [value for value in values]
+        if kind == 'timestamp':
+            strings = [simulator.translate.normalize_timestamp(value) if value is not None else '1970-01-01 00:00:00' for value in strings]
+        else:
+            strings = [value if isinstance(value, str) else ('' if value is None else json.dumps(value)) for value in strings]
+        column['strings'] = numpy.array(strings, dtype=str)
+        if kind == 'timestamp':
+            column['values'] = to_timestamps(column['strings'])
+        else:
+            column['values'] = numpy.unique(column['strings'], return_inverse=True)[1].astype(numpy.int64).reshape(-1)
+    return column
+
+
+def format_values(kind:str, values:numpy.ndarray, valid:numpy.ndarray, strings:numpy.ndarray=None)->list:
+    """
+    Format typed values as returned by a node (None for NULL)
+    """
+    if kind in ('timestamp', 'text'):
+        formatted = strings.tolist()
+    elif kind in ('integer', 'count'):
+        formatted = [str(value) for value in values.astype(numpy.int64).tolist()]
+    else:
+        formatted = [str(value) for value in values.astype(numpy.float64).tolist()]
+    return [value if is_valid else None for value, is_valid in zip(formatted, valid.tolist())]
+
+
+def increments_keys(timestamps:numpy.ndarray, unit:str, units:int)->numpy.ndarray:
+    """
+    increments(unit, units, timestamp) bucket of each timestamp (as the node - see simulator/translate.py)
+    :args:
+        timestamps:numpy.ndarray - datetime64 timestamps
+        unit:str - second, minute, hour, day, week, month or year
+        units:int - time units per bucket
+    :return:
+        int64 bucket keys (ordered by time)
+    """
+    unit = unit.lower()
+    if unit == 'second':
+        return timestamps.astype('datetime64[m]').astype(numpy.int64) * 60 + timestamps.astype('datetime64[s]').astype(numpy.int64) % 60 // units
+    if unit == 'minute':
+        return timestamps.astype('datetime64[h]').astype(numpy.int64) * 60 + timestamps.astype('datetime64[m]').astype(numpy.int64) % 60 // units
+    if unit == 'hour':
+        return timestamps.astype('datetime64[D]').astype(numpy.int64) * 24 + timestamps.astype('datetime64[h]').astype(numpy.int64) % 24 // units
+    if unit == 'day':
+        months = timestamps.astype('datetime64[M]')
+        days = (timestamps.astype('datetime64[D]') - months.astype('datetime64[D]')).astype(numpy.int64) + 1 # day of month
+        return months.astype(numpy.int64) * 32 + days // units
+    if unit == 'week':
+        years = timestamps.astype('datetime64[Y]')
+        days = timestamps.astype('datetime64[D]').astype(numpy.int64)
+        yday = days - years.astype('datetime64[D]').astype(numpy.int64)
+        weekday = (days + 3) % 7 # Monday = 0
+        return years.astype(numpy.int64) * 54 + (yday + 7 - weekday) // 7 // units
+    if unit == 'month':
+        months = timestamps.astype('datetime64[M]').astype(numpy.int64)
+        return months // 12 * 12 + months % 12 // units
+    if unit == 'year':
+        return (timestamps.astype('datetime64[Y]').astype(numpy.int64) + 1970) // units
+    raise ValueError('Unsupported increments time unit: %s' % unit)
+
+
+class Table:
+    """
+    Table loaded into typed arrays (one per column)
+    """
+    def __init__(self, table:str, rows:list):
+        """
+        :args:
+            table:str - table name
+            rows:list - rows (dict of column -> value)
+        :params:
+            self.table:str - table name
+            self.rows:int - number of rows
+            self.columns:dict - column -> typed column (see make_column)
+        """
+        names = []
+        for row in rows:
+            for column in row:
+                if column not in names:
+                    names.append(column)
+        self.table = table
+        self.rows = len(rows)
+        self.columns = {column.lower(): make_column([row.get(column) for row in rows]) for column in names}
+
+    def column(self, name:str)->dict:
+        name = name.strip().strip('"').lower()
+        if name not in self.columns:
+            raise ValueError('Unknown column %s in table %s' % (name, self.table))
+        return self.columns[name]
+
+    def where(self, condition:str)->numpy.ndarray:
+        """
+        Evaluate a WHERE condition
+        :args:
+            condition:str - condition
+        :params:
+            tokens:list - (kind, text) - kind: string, number, op, punct or word
+        :return:
+            bool array (row matches condition)
+        """
+        tokens = []
+        pos = 0
+        condition = condition.strip()
+        while pos < len(condition):
+            match = TOKEN.match(condition, pos)
+            if match is None or match.end() == pos:
+                raise ValueError('Unsupported condition: %s' % condition)
+            kind = ['string', 'number', 'op', 'punct', 'word'][match.lastindex - 1]
+            tokens.append((kind, match.group(match.lastindex)))
+            pos = match.end()
+            while pos < len(condition) and condition[pos].isspace():
+                pos += 1
+        tokens.append(('end', ''))
+        position = [0]
+
+        def __peek()->tuple:
+            return tokens[position[0]]
+
+        def __next()->tuple:
+            token = tokens[position[0]]
+            position[0] += 1
+            return token
+
+        def __expect(text:str):
+            token = __next()
+            if token[1].lower() != text:
+                raise ValueError('Unsupported condition (expected %s): %s' % (text, condition))
+
+        def __or()->numpy.ndarray:
+            mask = __and()
+            while __peek()[0] == 'word' and __peek()[1].lower() == 'or':
+                __next()
+                mask = mask | __and()
+            return mask
+
+        def __and()->numpy.ndarray:
+            mask = __not()
+            while __peek()[0] == 'word' and __peek()[1].lower() == 'and':
+                __next()
+                mask = mask & __not()
+            return mask
+
+        def __not()->numpy.ndarray:
+            if __peek()[0] == 'word' and __peek()[1].lower() == 'not':
+                __next()
+                return ~__not()
+            return __primary()
+
+        def __primary()->numpy.ndarray:
+            token = __next()
+            if token == ('punct', '('):
+                mask = __or()
+                __expect(')')
+                return mask
+            if token[0] == 'word' and token[1].lower() == 'period' and __peek() == ('punct', '('):
+                __next()
+                unit = __next()[1]
+                __expect(',')
+                units = int(__next()[1])
+                __expect(',')
+                anchor = __next()
+                if anchor[0] == 'word' and anchor[1].lower() == 'now':
+                    __expect('(')
+                    __expect(')')
+                    anchor = simulator.translate.utc_now()
+                else:
+                    anchor = anchor[1].strip("'")
+                __expect(',')
+                column = __next()[1]
+                __expect(')')
+                return self.period(unit, units, anchor, column)
+            operator = __next()
+            operand = __next()
+            if operator[0] != 'op':
+                raise ValueError('Unsupported condition: %s' % condition)
+            if token[0] == 'word':
+                return self.compare(token[1], operator[1], operand)
+            if operand[0] == 'word':
+                return self.compare(operand[1], FLIP.get(operator[1], operator[1]), token)
+            raise ValueError('Unsupported condition: %s' % condition)
+
+        mask = __or()
+        if __peek()[0] != 'end':
+            raise ValueError('Unsupported condition: %s' % condition)
+        return mask
+
+    def compare(self, name:str, operator:str, literal:tuple)->numpy.ndarray:
+        """
+        Compare a column with a literal (NULL never matches)
+        :args:
+            name:str - column
+            operator:str - comparison operator
+            literal:tuple - (string | number, text)
+        """
+        column = self.column(name)
+        value = literal[1].strip("'") if literal[0] == 'string' else literal[1]
+        if column['kind'] == 'timestamp':
+            values, value = column['values'], to_timestamps([simulator.translate.normalize_timestamp(value)])[0]
+        elif column['kind'] in ('integer', 'real'):
+            values, value = column['values'], float(value)
+        else:
+            values = column['strings']
+        return COMPARE[operator](values, value) & column['valid']
+
+    def period(self, unit:str, units:int, anchor:str, name:str)->numpy.ndarray:
+        """
+        period(unit, units, anchor, column) - from the latest timestamp at or before anchor back units time units
+        """
+        column = self.column(name)
+        before = column['valid'] & (column['values'] <= to_timestamps([simulator.translate.normalize_timestamp(anchor)])[0])
+        if not before.any():
+            return numpy.zeros(self.rows, dtype=bool)
+        end = column['strings'][numpy.flatnonzero(before)[numpy.argmax(column['values'][before])]]
+        start, end = simulator.translate.period_range(unit, units, str(end))
+        start, end = to_timestamps([start, end])
+        return column['valid'] & (column['values'] >= start) & (column['values'] <= end)
+
+    def bucket(self, unit:str, units:int, name:str)->numpy.ndarray:
+        """
+        increments(unit, units, column) bucket of each row (see increments_keys)
+        """
+        return increments_keys(self.column(name)['values'].astype(TIMESTAMP_DTYPE), unit, units)
+
+    def query(self, query:str)->list:
+        """
+        Evaluate a query
+        :args:
+            query:str - query (or sql command - sql <dbms> format=json "<query>")
+        :params:
+            parsed:dict - query clauses (see simulator.merge.parse_query)
+            mask:numpy.ndarray - rows matching WHERE
+            items:list - select items - (name, expression, kind, argument)
+            keys:list - group keys - increments bucket, GROUP BY columns (DISTINCT - select columns)
+            outputs:list - output columns - (name, kind, values, valid, strings)
+        :return:
+            rows - list of dict (column -> value as str), as returned by a node
+        """
+        if simulator.translate.SQL_COMMAND.match(query) is not None:
+            query = simulator.translate.parse_command(query)[2]
+        parsed = simulator.merge.parse_query(query)
+        match = FROM_WHERE.match(parsed['from'])
+        if match is None or match.group(1).lower() != self.table.lower():
+            raise ValueError('Unsupported query (FROM %s expected): %s' % (self.table, query))
+        mask = self.where(match.group(2)) if match.group(2) else numpy.ones(self.rows, dtype=bool)
+
+        items = []
+        buckets = []
+        for item in parsed['select']:
+            alias = simulator.merge.ALIAS.search(item)
+            expression = item[:alias.start()].strip() if alias is not None else item.strip()
+            name = alias.group(1).strip('"').lower() if alias is not None else expression.lower()
+            increments = simulator.merge.INCREMENTS.match(expression)
+            aggregate = simulator.merge.AGGREGATE.match(expression)
+            if increments is not None:
+                buckets.append(self.bucket(increments.group(1), int(increments.group(2)), increments.group(3)))
+            elif aggregate is not None:
+                argument = aggregate.group(2).strip()
+                distinct = simulator.merge.DISTINCT.match(argument) is not None
+                argument = simulator.merge.DISTINCT.sub('', argument).strip().strip('()').strip()
+                function = aggregate.group(1).lower() + (' distinct' if distinct else '')
+                items.append((name, simulator.merge.normalize(expression), function, argument))
+            elif expression == '*':
+                items += [(column, column, None, column) for column in self.columns]
+            else:
+                items.append((name, simulator.merge.normalize(expression), None, expression.strip('()').strip()))
+
+        selected = len(items)
+        for item in parsed['order_by']:
+            direction = simulator.merge.DIRECTION.search(item)
+            expression = (item[:direction.start()] if direction is not None else item).strip()
+            aggregate = simulator.merge.AGGREGATE.match(expression)
+            if aggregate is not None and simulator.merge.normalize(expression) not in [normalized for name, normalized, function, argument in items]:
+                items.append(('__order_%s' % len(items), simulator.merge.normalize(expression), aggregate.group(1).lower(), aggregate.group(2).strip()))
+
+        group_by = [item[3] for item in items[:selected] if item[2] is None] if parsed['distinct'] else []
+        for expression in parsed['group_by']:
+            matches = [item for item in items if simulator.merge.normalize(expression) in (item[0], item[1]) and item[2] is None]
+            group_by.append(matches[0][3] if matches else expression)
+        keys = list(buckets)
+        for name in group_by:
+            keys += [self.column(name)['valid'], self.column(name)['values']] # NULL first
+        aggregated = bool(keys) or any(item[2] is not None for item in items)
+
+        rows = numpy.flatnonzero(mask)
+        if aggregated is True:
+            outputs = self.aggregate(items, keys, bool(keys), rows, appearance=parsed['distinct'] and not parsed['group_by'] and not buckets)
+        else:
+            outputs = []
+            for name, expression, function, argument in items:
+                column = self.column(argument)
+                outputs.append((name, column['kind'], column['values'][rows], column['valid'][rows],
+                                column['strings'][rows] if column['strings'] is not None else None))
+
+        order = self.order(parsed['order_by'], items, outputs, rows if aggregated is False else None)
+        if parsed['limit'] is not None:
+            order = order[:int(parsed['limit'])]
+        columns = [format_values(kind, values[order], valid[order], strings[order] if strings is not None else None)
+                   for name, kind, values, valid, strings in outputs]
+        names = [output[0] for output in outputs]
+        return [dict(zip(names[:selected], row[:selected])) for row in zip(*columns)] if columns else []
+
+    def verify(self, query:str, data:list, order_by:str=None, rel_tol:float=1e-9)->str:
+        """
+        Compare results of a query with the rows computed by the engine (see compare)
+        :args:
+            query:str - query (or sql command)
+            data:list - results
+            order_by:str - column both sides are sorted by before the comparison (GROUP BY results in any order)
+            rel_tol:float - relative tolerance of numeric values
+        :return:
+            reason results differ (None if they match) - ValueError if the query shape is not supported
+        """
+        expect = self.query(query)
+        if order_by is not None:
+            expect = sorted(expect, key=lambda row: str(row.get(order_by)))
+            data = sorted(data, key=lambda row: str(row.get(order_by)))
+        return compare(expect=expect, data=data, rel_tol=rel_tol)
+
+    def aggregate(self, items:list, keys:list, grouped:bool, rows:numpy.ndarray, appearance:bool=False)->list:
+        """
+        Aggregate rows per group
+        :args:
+            items:list - select items (see query)
+            keys:list - group key arrays (all rows)
+            grouped:bool - whether the query groups rows (no rows - no groups, otherwise a single group)
+            rows:numpy.ndarray - rows matching WHERE
+            appearance:bool - number groups in order of first appearance (SELECT DISTINCT) rather than key order
+        :params:
+            groups:numpy.ndarray - group of each row (groups are numbered in key order)
+            order:numpy.ndarray - rows ordered by group
+            starts:numpy.ndarray - position in order of the first row of each group
+        :return:
+            output columns - (name, kind, values, valid, strings)
+        """
+        groups = numpy.zeros(len(rows), dtype=numpy.int64)
+        for key in keys:
+            values, inverse = numpy.unique(key[rows], return_inverse=True)
+            groups = numpy.unique(groups * len(values) + inverse.reshape(-1), return_inverse=True)[1].reshape(-1)
+        count = int(groups.max()) + 1 if len(rows) else (0 if grouped else 1)
+        if appearance is True and len(rows):
+            groups = numpy.argsort(numpy.argsort(numpy.unique(groups, return_index=True)[1]))[groups]
+        order = numpy.argsort(groups, kind='stable')
+        starts = numpy.searchsorted(groups[order], numpy.arange(count))
+        sizes = numpy.bincount(groups, minlength=count)
+
+        outputs = []
+        for name, expression, function, argument in items:
+            if function == 'count' and argument == '*':
+                outputs.append((name, 'count', sizes, numpy.ones(count, dtype=bool), None))
+                continue
+            column = self.column(argument)
+            valid = column['valid'][rows]
+            if function is None:
+                first = rows[order[numpy.minimum(starts, max(len(rows) - 1, 0))]] if len(rows) else numpy.zeros(count, dtype=numpy.int64)
+                outputs.append((name, column['kind'], column['values'][first], column['valid'][first] & (sizes > 0),
+                                column['strings'][first] if column['strings'] is not None else None))
+            elif function == 'count':
+                outputs.append((name, 'count', numpy.bincount(groups, weights=valid, minlength=count), numpy.ones(count, dtype=bool), None))
+            elif function == 'count distinct':
+                codes = numpy.unique(column['values'][rows][valid], return_inverse=True)[1].reshape(-1)
+                pairs = numpy.unique(numpy.stack([groups[valid], codes]), axis=1) if valid.any() else numpy.zeros((2, 0), dtype=numpy.int64)
+                outputs.append((name, 'count', numpy.bincount(pairs[0], minlength=count), numpy.ones(count, dtype=bool), None))
+            elif function in ('min', 'max'):
+                candidates = numpy.lexsort((column['values'][rows][valid], groups[valid]))
+                by_value, value_groups = rows[valid][candidates], groups[valid][candidates]
+                found = numpy.bincount(value_groups, minlength=count) > 0
+                positions = numpy.searchsorted(value_groups, numpy.arange(count), side='left' if function == 'min' else 'right')
+                if function == 'max':
+                    positions = positions - 1
+                picked = by_value[numpy.clip(positions, 0, max(len(by_value) - 1, 0))] if len(by_value) else numpy.zeros(count, dtype=numpy.int64)
+                outputs.append((name, column['kind'], column['values'][picked], found,
+                                column['strings'][picked] if column['strings'] is not None else None))
+            elif function in ('sum', 'avg'):
+                if column['kind'] not in ('integer', 'real'):
+                    raise ValueError('Unsupported %s of %s column %s' % (function, column['kind'], argument))
+                values = numpy.where(valid, column['values'][rows], 0)[order]
+                totals = numpy.add.reduceat(values, numpy.minimum(starts, max(len(values) - 1, 0))) if len(values) else numpy.zeros(count, dtype=values.dtype)
+                totals = numpy.where(sizes > 0, totals, 0)
+                counts = numpy.bincount(groups, weights=valid, minlength=count)
+                if function == 'sum':
+                    outputs.append((name, column['kind'], totals, counts > 0, None))
+                else:
+                    outputs.append((name, 'real', totals / numpy.maximum(counts, 1), counts > 0, None))
+            else:
+                raise ValueError('Unsupported aggregate function: %s' % function)
+        return outputs
+
+    def order(self, order_by:list, items:list, outputs:list, rows:numpy.ndarray=None)->numpy.ndarray:
+        """
+        ORDER BY - stable sort of the output rows (NULL first in ascending order)
+        :args:
+            order_by:list - ORDER BY items
+            items:list - select items
+            outputs:list - output columns
+            rows:numpy.ndarray - rows of the output (not aggregated queries - ORDER BY may use columns not selected)
+        :return:
+            output row order
+        """
+        size = len(outputs[0][2]) if outputs else 0
+        sort_keys = []
+        for item in order_by:
+            direction = simulator.merge.DIRECTION.search(item)
+            expression = simulator.merge.normalize(item[:direction.start()] if direction is not None else item)
+            matches = [i for i, (name, normalized, function, argument) in enumerate(items) if expression in (name, normalized)]
+            if matches:
+                values, valid = outputs[matches[0]][2], outputs[matches[0]][3]
+            elif rows is not None:
+                column = self.column(expression)
+                values, valid = column['values'][rows], column['valid'][rows]
+            else:
+                raise ValueError('Unsupported ORDER BY: %s' % item)
+            ranks = numpy.where(valid, numpy.unique(values, return_inverse=True)[1].reshape(-1), -1) if size else numpy.zeros(0, dtype=numpy.int64)
+            sort_keys.append(-ranks if direction is not None and direction.group(1).lower() == 'desc' else ranks)
+        if not sort_keys:
+            return numpy.arange(size)
+        return numpy.lexsort(sort_keys[::-1])
+
+
+def compare(expect:list, data:list, rel_tol:float=1e-9)->str:
+    """
+    Compare results with the results computed by the reference engine - numeric values are compared with a relative
+    tolerance (the node & the engine may sum floats in a different order)
+    :args:
+        expect:list - rows computed by the reference engine
+        data:list - results
+        rel_tol:float - relative tolerance of numeric values
+    :return:
+        reason results differ (None if they match)
+    """
+    if len(data) != len(expect):
+        return 'row count %s != %s' % (len(data), len(expect))
+    for i, (expect_row, row) in enumerate(zip(expect, data)):
+        if list(row) != list(expect_row):
+            return 'row %s: columns %s != %s' % (i, list(row), list(expect_row))
+        for column, value in row.items():
+            if value == expect_row[column]:
+                continue
+            try:
+                if math.isclose(float(value), float(expect_row[column]), rel_tol=rel_tol):
+                    continue
+            except (TypeError, ValueError):
+                pass
+            return 'row %s: %s %s != %s' % (i, column, value, expect_row[column])
+    return None
+
+
+def load_table(data_dir:str, file_info:str)->Table:
+    """
+    Load data files (<dbms>.<table>.*.json) containing file_info - once per session
+    :args:
+        data_dir:str - directory with data files
+        file_info:str - db_name.table_name
+    :return:
+        Table
+    """
+    key = (os.path.abspath(data_dir), file_info)
+    if key not in TABLES:
+        rows = []
+        for file_name in sorted(os.listdir(data_dir)):
+            if file_name.endswith('.json') and file_info in file_name:
+                try:
+                    with open(os.path.join(data_dir, file_name), 'r') as f:
+                        rows += simulator.node.parse_rows(f.read())
+                except Exception as e:
+                    assert True == False, 'Failed to read data file: %s (Error: %s)' % (file_name, e)
+        TABLES[key] = Table(table=file_info.split('.')[1], rows=rows)
+    return TABLES[key]
+
+
+def main():
+    """
+    :positional arguments:
+        query       query to evaluate
+    :optional arguments:
+        --data-dir DATA_DIR         directory with data files
+        --file-info FILE_INFO       db_name.table_name
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('query', type=str, help='query to evaluate')
+    parser.add_argument('--data-dir', type=str, default=os.path.join(ROOT_DIR, 'data'), help='directory with data files')
+    parser.add_argument('--file-info', type=str, default='anylog.ping_sensor', help='db_name.table_name')
+    args = parser.parse_args()
+
+    for row in load_table(os.path.expandvars(os.path.expanduser(args.data_dir)), args.file_info).query(args.query):
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
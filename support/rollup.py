@@ -0,0 +1,155 @@
+"""
+Per-minute rollup cube of a (timestamp, value) series - count, sum, min & max of value & first / last timestamp of
+each minute, built once from the data set. Every increments(unit, n, timestamp) bucket of minute, hour, day, week,
+month or year is a run of adjacent minutes, so the expected result of any interval is a merge of adjacent cells -
+O(cells) instead of a pass over the rows (or an expect file per interval)
+:sample:
+    python3 support/rollup.py --expect-dir expect --unit minute --units 15
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if ROOT_DIR not in sys.path:
+    sys.path.insert(0, ROOT_DIR)
+
+import support.golden
+import support.oracle
+
+CELL = 60000000 # microseconds per cell (minute)
+UNITS = ['minute', 'hour', 'day', 'week', 'month', 'year'] # increments units derivable from minute cells
+
+
+class Rollup:
+    """
+    Per-minute cells of a (timestamp, value) series (one array per measure, cells ordered by time)
+    """
+    def __init__(self, timestamps:numpy.ndarray, values:numpy.ndarray, strings:numpy.ndarray):
+        """
+        :args:
+            timestamps:numpy.ndarray - int64 microseconds since epoch of each row
+            values:numpy.ndarray - float64 value of each row
+            strings:numpy.ndarray - timestamp of each row as stored by a node
+        :params:
+            order:numpy.ndarray - rows ordered by timestamp
+            starts:numpy.ndarray - position in order of the first row of each cell
+            self.minutes:numpy.ndarray - minutes since epoch of each cell
+            self.count, self.sum, self.min, self.max:numpy.ndarray - measures of each cell
+            self.first, self.last:numpy.ndarray - first & last timestamp (string) of each cell
+        """
+        order = numpy.argsort(timestamps, kind='stable')
+        minutes = timestamps[order] // CELL
+        starts = numpy.flatnonzero(numpy.diff(minutes, prepend=minutes[:1] - 1) != 0) if len(minutes) else numpy.zeros(0, dtype=numpy.int64)
+        ends = numpy.append(starts[1:], len(minutes))
+        values = values[order].astype(numpy.float64)
+
+        self.rows = len(timestamps)
+        self.minutes = minutes[starts]
+        self.count = ends - starts
+        self.sum = numpy.add.reduceat(values, starts) if len(starts) else numpy.zeros(0)
+        self.min = numpy.minimum.reduceat(values, starts) if len(starts) else numpy.zeros(0)
+        self.max = numpy.maximum.reduceat(values, starts) if len(starts) else numpy.zeros(0)
+        self.first = strings[order][starts]
+        self.last = strings[order][ends - 1]
+
+    def increments(self, unit:str, units:int)->dict:
+        """
+        Merge adjacent cells into increments(unit, units, timestamp) buckets
+        :args:
+            unit:str - minute, hour, day, week, month or year
+            units:int - time units per bucket
+        :params:
+            keys:numpy.ndarray - bucket of each cell (non-decreasing - cells are ordered by time)
+            starts:numpy.ndarray - first cell of each bucket
+        :return:
+            measures of each bucket (ordered by time) - count, sum, min, max, avg, first & last
+        """
+        if unit.lower() not in UNITS:
+            raise ValueError('increments by %s cannot be derived from minute cells' % unit)
+        if not len(self.minutes):
+            return {'count': self.count, 'sum': self.sum, 'min': self.min, 'max': self.max, 'avg': self.sum,
+                    'first': self.first, 'last': self.last}
+        keys = support.oracle.increments_keys(self.minutes.astype('datetime64[m]'), unit, units)
+        starts = numpy.flatnonzero(numpy.diff(keys, prepend=keys[:1] - 1) != 0)
+        ends = numpy.append(starts[1:], len(keys))
+        count = numpy.add.reduceat(self.count, starts)
+        total = numpy.add.reduceat(self.sum, starts)
+        return {'count': count, 'sum': total, 'min': numpy.minimum.reduceat(self.min, starts),
+                'max': numpy.maximum.reduceat(self.max, starts), 'avg': total / count,
+                'first': self.first[starts], 'last': self.last[ends - 1]}
+
+    def result(self, unit:str, units:int, timestamp:str='timestamp', value:str='value')->list:
+        """
+        Expected result of
+            select increments(unit, units, timestamp), min(timestamp), max(timestamp), min(value), avg(value),
+            max(value), count(*) from table order by min(timestamp)
+        formatted as returned by a node
+        """
+        buckets = self.increments(unit, units)
+        columns = [('min(%s)' % timestamp, buckets['first'].tolist()),
+                   ('max(%s)' % timestamp, buckets['last'].tolist()),
+                   ('min(%s)' % value, [str(measure) for measure in buckets['min'].tolist()]),
+                   ('avg(%s)' % value, [str(measure) for measure in buckets['avg'].tolist()]),
+                   ('max(%s)' % value, [str(measure) for measure in buckets['max'].tolist()]),
+                   ('count(*)', [str(measure) for measure in buckets['count'].tolist()])]
+        names = [name for name, measures in columns]
+        return [dict(zip(names, row)) for row in zip(*[measures for name, measures in columns])]
+
+
+def build(rows:list, timestamp:str='timestamp', value:str='value')->Rollup:
+    """
+    Rollup of rows (dict of column -> value - ex. an expect file or data file rows)
+    :args:
+        rows:list - rows
+        timestamp:str - timestamp column
+        value:str - numeric column
+    """
+    strings = numpy.array([row[timestamp] for row in rows], dtype=str)
+    timestamps = support.oracle.to_timestamps(numpy.char.replace(strings, 'T', ' ')) if len(strings) else numpy.zeros(0, dtype=numpy.int64)
+    return Rollup(timestamps=timestamps, values=numpy.array([float(row[value]) for row in rows], dtype=numpy.float64), strings=strings)
+
+
+def from_table(table:support.oracle.Table, timestamp:str='timestamp', value:str='value')->Rollup:
+    """
+    Rollup of a table loaded by the reference engine (see support/oracle.py)
+    """
+    timestamps, values = table.column(timestamp), table.column(value)
+    valid = timestamps['valid'] & values['valid']
+    return Rollup(timestamps=timestamps['values'][valid], values=values['values'][valid], strings=timestamps['strings'][valid])
+
+
+def main():
+    """
+    Print the expected increments rows of a data set
+    :optional arguments:
+        --expect-dir EXPECT_DIR     directory with expect files (the data set is read from SOURCE)
+        --source SOURCE             expect file with all rows (timestamp & value) of the data set
+        --data-dir DATA_DIR         directory with data files (used instead of the expect file if set)
+        --file-info FILE_INFO       db_name.table_name of data files
+        --unit UNIT                 increments time unit
+        --units UNITS               time units per bucket
+    """
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--expect-dir', type=str, default='expect', help='directory with expect files (the data set is read from SOURCE)')
+    parser.add_argument('--source', type=str, default='base_queries_test_period_day7.json', help='expect file with all rows (timestamp & value) of the data set')
+    parser.add_argument('--data-dir', type=str, default=None, help='directory with data files (used instead of the expect file if set)')
+    parser.add_argument('--file-info', type=str, default='anylog.ping_sensor', help='db_name.table_name of data files')
+    parser.add_argument('--unit', type=str, default='minute', choices=UNITS, help='increments time unit')
+    parser.add_argument('--units', type=int, default=1, help='time units per bucket')
+    args = parser.parse_args()
+
+    if args.data_dir is not None:
+        rollup = from_table(support.oracle.load_table(os.path.expandvars(os.path.expanduser(args.data_dir)), args.file_info))
+    else:
+        with support.golden.open_expect(os.path.join(os.path.expandvars(os.path.expanduser(args.expect_dir)), args.source), 'r') as f:
+            rollup = build([json.loads(line) for line in f if line.strip()])
+    for row in rollup.result(args.unit, args.units):
+        print(json.dumps(row))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,427 @@
+"""
+Mergeable aggregate states - verify that the result of the REST node (combined) is the merge of the results of each
+operator (partials). Result values are typed (int, float or timestamp) & each aggregate column (<function>_<col> or
+<function>) is merged as its state: COUNT & SUM are added, MIN / MAX reduced, AVG merged as a (sum, count) pair &
+variance via Welford / Chan (count, mean, M2). States hold one array per measure with one element per group, so
+partials are merged with vectorized operations however many groups they have. DISTINCT values are merged as
+Distinct (exact hash set) or HyperLogLog (approximate, fixed memory) sketches
+:sample:
+   mismatches = aggregate_state.verify(combined=results['Query'], partials=[results['Query'] for results in operators])
+   assert mismatches == [], mismatches
+"""
+import hashlib
+import itertools
+import math
+import re
+
+import numpy
+
+FUNCTIONS = ['min', 'max', 'avg', 'sum', 'count']
+ALIAS = re.compile(r'^(%s)(?:_(.+))?$' % '|'.join(FUNCTIONS), re.IGNORECASE)
+TIMESTAMP = re.compile(r'^\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(\.\d+)?Z?$')
+TIMESTAMP_DTYPE = 'datetime64[us]'
+BATCH = 65536 # values hashed per batch by HyperLogLog.update
+
+
+def parse_value(value):
+   """
+   Typed value of a result value
+   :return:
+      int, float, numpy.datetime64 (timestamps) or str - None for NULL
+   """
+   if value is None or isinstance(value, (int, float)):
+      return value
+   value = str(value).strip()
+   try:
+      return int(value)
+   except ValueError:
+      pass
+   try:
+      return float(value)
+   except ValueError:
+      pass
+   if TIMESTAMP.match(value) is not None:
+      return numpy.datetime64(value.replace(' ', 'T').rstrip('Z'), 'us')
+   return value
+
+
+def parse_column(values:list)->tuple:
+   """
+   Typed array of result values (parsed by numpy - not value by value)
+   :args:
+      values:list - values of a column (None for NULL)
+   :return:
+      kind (integer, real or timestamp), values (int64 - timestamps as microseconds, or float64), valid (not NULL)
+   """
+   valid = numpy.array([value is not None for value in values], dtype=bool)
+   strings = numpy.array([str(value).strip() for value in values if value is not None], dtype=str)
+   parsed = None
+   for kind, dtype in (('integer', numpy.int64), ('real', numpy.float64)):
+      try:
+         parsed = strings.astype(dtype)
+         break
+      except (ValueError, OverflowError):
+         continue
+   if parsed is None:
+      kind = 'timestamp'
+      try:
+         parsed = numpy.char.rstrip(numpy.char.replace(strings, ' ', 'T'), 'Z').astype(TIMESTAMP_DTYPE).astype(numpy.int64)
+      except ValueError:
+         raise ValueError('Not a numeric or timestamp column: %s' % strings[:5].tolist())
+   array = numpy.zeros(len(values), dtype=parsed.dtype)
+   array[valid] = parsed
+   return kind, array, valid
+
+
+def column_kind(kinds:list)->str:
+   """
+   Kind of a state from the kinds of its measures - timestamp, real (if any measure is real) or integer
+   """
+   if 'timestamp' in kinds:
+      return 'timestamp'
+   return 'real' if 'real' in kinds else 'integer'
+
+
+def aggregate_column(name:str)->tuple:
+   """
+   Function & column of an aggregate column name - (count, None) for count, (min, col) for min_col ... None if name
+   is not an aggregate column (group by key)
+   """
+   match = ALIAS.match(name)
+   if match is None:
+      return None
+   return match.group(1).lower(), match.group(2)
+
+
+def result_name(function:str, column:str)->str:
+   return function if column is None else '%s_%s' % (function, column)
+
+
+class AggregateState:
+   """
+   Aggregate state of a column for a number of groups - one array per measure (one element per group)
+   """
+   def __init__(self, size:int, kind:str='real'):
+      """
+      :args:
+         size:int - number of groups
+         kind:str - integer, real or timestamp (min & max are int64 microseconds) - sums are int64 for integer columns
+      :params:
+         self.count:numpy.ndarray - number of values
+         self.sum:numpy.ndarray - sum of values
+         self.min, self.max:numpy.ndarray - min & max (valid where self.found)
+         self.mean, self.m2:numpy.ndarray - mean & sum of squared differences from the mean (Welford) - NaN if unknown
+      """
+      self.size = size
+      self.kind = kind
+      dtype = numpy.float64 if kind == 'real' else numpy.int64
+      self.count = numpy.zeros(size, dtype=numpy.int64)
+      self.sum = numpy.zeros(size, dtype=dtype)
+      self.min = numpy.zeros(size, dtype=dtype)
+      self.max = numpy.zeros(size, dtype=dtype)
+      self.found = numpy.zeros(size, dtype=bool)
+      self.mean = numpy.zeros(size, dtype=numpy.float64)
+      self.m2 = numpy.zeros(size, dtype=numpy.float64)
+
+   def update(self, groups:numpy.ndarray, values:numpy.ndarray):
+      """
+      Add raw values (values[i] belongs to group groups[i])
+      """
+      batch = AggregateState(self.size, self.kind)
+      values = values.astype(self.sum.dtype)
+      batch.count = numpy.bincount(groups, minlength=self.size).astype(numpy.int64)
+      numpy.add.at(batch.sum, groups, values)
+      batch.found = batch.count > 0
+      batch.min[batch.found] = numpy.iinfo(numpy.int64).max if self.kind != 'real' else numpy.inf
+      batch.max[batch.found] = numpy.iinfo(numpy.int64).min if self.kind != 'real' else -numpy.inf
+      numpy.minimum.at(batch.min, groups, values)
+      numpy.maximum.at(batch.max, groups, values)
+      batch.mean = numpy.divide(batch.sum, batch.count, out=numpy.zeros(self.size), where=batch.found)
+      batch.m2 = numpy.bincount(groups, weights=(values - batch.mean[groups]) ** 2, minlength=self.size)
+      self.merge(batch)
+
+   def merge(self, other:'AggregateState'):
+      """
+      Merge the state of the same groups (ex. of another operator) - variance by Chan's parallel update
+      """
+      count = self.count + other.count
+      delta = other.mean - self.mean
+      weight = numpy.divide(other.count, count, out=numpy.zeros(self.size), where=count > 0)
+      self.m2 = self.m2 + other.m2 + delta ** 2 * self.count * weight
+      self.mean = self.mean + delta * weight
+      self.min = numpy.where(other.found & (~self.found | (other.min < self.min)), other.min, self.min)
+      self.max = numpy.where(other.found & (~self.found | (other.max > self.max)), other.max, self.max)
+      self.found = self.found | other.found
+      self.sum = self.sum + other.sum
+      self.count = count
+
+   def result(self, function:str)->tuple:
+      """
+      Value of an aggregate function per group
+      :args:
+         function:str - count, sum, min, max, avg, variance or stddev
+      :return:
+         values (numpy.ndarray), found (groups with values - the others are NULL)
+      """
+      if function == 'count':
+         return self.count, numpy.ones(self.size, dtype=bool)
+      if function in ('min', 'max', 'sum'):
+         return getattr(self, function), self.found
+      if function == 'avg':
+         return numpy.divide(self.sum, numpy.maximum(self.count, 1)), self.found
+      if function in ('variance', 'stddev'):
+         variance = numpy.divide(self.m2, numpy.maximum(self.count, 1))
+         return (numpy.sqrt(variance) if function == 'stddev' else variance), self.found
+      raise ValueError('Unsupported aggregate function: %s' % function)
+
+
+def partial_state(rows:list, groups:numpy.ndarray, column:str, size:int, kind:str)->AggregateState:
+   """
+   State of a column from aggregated rows (ex. one operator's results) - the row of each group may hold count, sum,
+   min, max & avg of column (<function>_<column>), AVG is turned into a sum if the row has count but no sum.
+   The variance of aggregated rows is unknown (NaN)
+   :args:
+      rows:list - rows
+      groups:numpy.ndarray - group of each row
+      column:str - column (None - count)
+      size:int - number of groups
+      kind:str - kind of the state (see column_kind)
+   """
+   state = AggregateState(size, kind)
+   state.m2[:] = numpy.nan
+   if not rows:
+      return state
+   measures = {}
+   for function in FUNCTIONS:
+      name = result_name(function, column)
+      if name in rows[0]:
+         measures[function] = parse_column([row.get(name) for row in rows])[1:]
+   if 'sum' not in measures and 'avg' in measures and 'count' in measures:
+      measures['sum'] = (measures['avg'][0] * measures['count'][0], measures['avg'][1])
+   for function in ('sum', 'min', 'max'):
+      if function in measures:
+         values, valid = measures[function]
+         getattr(state, function)[groups[valid]] = values[valid].astype(state.sum.dtype)
+         state.found[groups[valid]] = True
+   if 'count' in measures:
+      state.count[groups] = measures['count'][0]
+   else:
+      state.count[groups] = state.found[groups]
+   state.mean = numpy.divide(state.sum, state.count, out=numpy.zeros(size), where=state.count > 0)
+   return state
+
+
+def merge(states:list)->AggregateState:
+   """
+   Merge the states of the same groups
+   """
+   merged = AggregateState(states[0].size, states[0].kind)
+   for state in states:
+      merged.merge(state)
+   return merged
+
+
+def format_value(value, kind:str)->str:
+   if kind == 'timestamp':
+      return str(numpy.datetime64(int(value), 'us')).replace('T', ' ')
+   return str(value)
+
+
+def verify(combined:list, partials:list, rel_tol:float=1e-9, abs_tol:float=1e-9, max_rows:int=10)->list:
+   """
+   Verify the result of the REST node is the merge of the results of the operators - rows are matched by their group
+   by columns (columns that are not aggregates), every aggregate column of the combined rows is compared with the
+   merge of the same (or derivable) columns of the partial rows - ex. avg_col with sum(sum_col) / sum(count_col)
+   :args:
+      combined:list - rows of the REST node
+      partials:list - rows of each operator
+      rel_tol:float - relative tolerance of floats (AVG & SUM of floats depend on the order values are added)
+      abs_tol:float - absolute tolerance of floats
+      max_rows:int - max number of mismatches reported per column
+   :params:
+      keys:list - group by columns
+      groups:dict - group (tuple of key values) -> index
+      state:AggregateState - merged state of a column (one element per group)
+   :return:
+      mismatches - empty if combined is the merge of partials (or neither has rows)
+   """
+   combined = combined or []
+   partials = [rows or [] for rows in partials]
+   sample = combined[:1] + [rows[0] for rows in partials if rows]
+   if not sample:
+      return []
+   keys = [name for name in sample[0] if aggregate_column(name) is None]
+   groups = {}
+   combined_groups = numpy.array([groups.setdefault(tuple(row.get(key) for key in keys), len(groups)) for row in combined], dtype=numpy.int64)
+   partial_groups = [numpy.array([groups.setdefault(tuple(row.get(key) for key in keys), len(groups)) for row in rows], dtype=numpy.int64)
+                     for rows in partials]
+
+   mismatches = []
+   partial_rows = sum(len(rows) for rows in partials)
+   if not combined or not partial_rows:
+      mismatches.append('combined: %s rows, operators: %s rows' % (len(combined), partial_rows))
+   if len(set(combined_groups.tolist())) != len(combined_groups):
+      mismatches.append('combined: duplicate groups')
+   missing = set(numpy.concatenate(partial_groups).tolist() if partial_groups else []) - set(combined_groups.tolist())
+   if missing:
+      mismatches += ['group %s of operators not in combined' % (key,) for key, group in groups.items() if group in missing][:max_rows]
+
+   columns = {}
+   for name in sample[0]:
+      if aggregate_column(name) is not None:
+         columns.setdefault(aggregate_column(name)[1], []).append(aggregate_column(name)[0])
+   for column, functions in columns.items():
+      expected = {function: parse_column([row.get(result_name(function, column)) for row in combined]) for function in functions}
+      kinds = [expected[function][0] for function in functions if function != 'count']
+      for rows in partials:
+         for function in ('min', 'max', 'sum', 'avg'):
+            if rows and result_name(function, column) in rows[0]:
+               kinds.append(parse_column([rows[0].get(result_name(function, column))])[0])
+      kind = column_kind(kinds)
+      state = merge([partial_state(rows, group_list, column, len(groups), kind) for rows, group_list in zip(partials, partial_groups)])
+
+      for function in functions:
+         expected_kind, expected_values, expected_valid = expected[function]
+         merged, found = state.result(function)
+         merged, found = merged[combined_groups], found[combined_groups]
+         if expected_kind == 'real' or merged.dtype == numpy.float64:
+            difference = numpy.abs(expected_values.astype(numpy.float64) - merged.astype(numpy.float64))
+            scale = numpy.maximum(numpy.abs(expected_values.astype(numpy.float64)), numpy.abs(merged.astype(numpy.float64)))
+            equal = difference <= numpy.maximum(rel_tol * scale, abs_tol)
+         else:
+            equal = expected_values == merged
+         equal = numpy.where(expected_valid & found, equal, expected_valid == found)
+         name = result_name(function, column)
+         for i in numpy.flatnonzero(~equal)[:max_rows].tolist():
+            mismatches.append('%s%s: combined %s != merged %s' % (
+               name, ' (%s)' % ', '.join(str(combined[i].get(key)) for key in keys) if keys else '', combined[i].get(name),
+               format_value(merged[i], kind if function in ('min', 'max') else 'real') if found[i] else None))
+   return mismatches
+
+
+class Distinct:
+   """
+   Exact distinct sketch - a hash set of (normalized) values, merged by union
+   """
+   def __init__(self, values=None):
+      self.values = set()
+      if values is not None:
+         self.update(values)
+
+   def __eq__(self, other:'Distinct')->bool:
+      return self.values == other.values
+
+   def update(self, values):
+      """
+      Add values (any iterable - ex. a stream of DISTINCT results)
+      """
+      self.values.update(normalize_distinct(value) for value in values)
+
+   def merge(self, other:'Distinct'):
+      self.values |= other.values
+
+   def count(self)->int:
+      return len(self.values)
+
+
+class HyperLogLog:
+   """
+   Approximate distinct sketch - 2^precision registers holding the max rank (leading zeros + 1) of the 64 bit hashes
+   routed to each register, merged by element-wise max. Memory is fixed (one byte per register) & the relative standard
+   error of count is 1.04 / sqrt(2^precision). Sketches of the same values have the same registers
+   """
+   def __init__(self, values=None, error:float=0.01, precision:int=None):
+      """
+      :args:
+         values - values to add (any iterable)
+         error:float - relative standard error of count (sets the precision if precision is not set)
+         precision:int - log2 of the number of registers (4 - 18)
+      :params:
+         self.registers:numpy.ndarray - max rank per register
+      """
+      if precision is None:
+         precision = int(math.ceil(math.log2((1.04 / error) ** 2)))
+      self.precision = min(max(precision, 4), 18)
+      self.size = 1 << self.precision
+      self.error = 1.04 / math.sqrt(self.size)
+      self.registers = numpy.zeros(self.size, dtype=numpy.uint8)
+      if values is not None:
+         self.update(values)
+
+   def __eq__(self, other:'HyperLogLog')->bool:
+      return self.precision == other.precision and numpy.array_equal(self.registers, other.registers)
+
+   def update(self, values):
+      """
+      Add values (any iterable - ex. a stream of DISTINCT results), hashed in batches of BATCH values
+      """
+      values = iter(values)
+      while True:
+         hashes = numpy.fromiter((hash_value(value) for value in itertools.islice(values, BATCH)), dtype=numpy.uint64)
+         if not len(hashes):
+            break
+         index = (hashes >> numpy.uint64(64 - self.precision)).astype(numpy.int64)
+         remainder = hashes & numpy.uint64((1 << (64 - self.precision)) - 1)
+         rank = (64 - self.precision) - bit_length(remainder) + 1
+         numpy.maximum.at(self.registers, index, rank.astype(numpy.uint8))
+
+   def merge(self, other:'HyperLogLog'):
+      if other.precision != self.precision:
+         raise ValueError('Cannot merge HyperLogLog sketches of precision %s & %s' % (self.precision, other.precision))
+      numpy.maximum(self.registers, other.registers, out=self.registers)
+
+   def count(self)->int:
+      """
+      Estimated number of distinct values - linear counting of empty registers for small cardinalities
+      """
+      alpha = {16: 0.673, 32: 0.697, 64: 0.709}.get(self.size, 0.7213 / (1 + 1.079 / self.size))
+      estimate = alpha * self.size ** 2 / numpy.sum(numpy.power(2.0, -self.registers.astype(numpy.float64)))
+      zeros = int(numpy.count_nonzero(self.registers == 0))
+      if estimate <= 2.5 * self.size and zeros > 0:
+         estimate = self.size * math.log(self.size / zeros)
+      return int(round(estimate))
+
+
+def distinct_sketch(cardinality:int, limit:int=100000, error:float=0.01):
+   """
+   Distinct sketch for an expected number of distinct values
+   :args:
+      cardinality:int - expected number of distinct values
+      limit:int - max cardinality counted exactly
+      error:float - relative standard error of HyperLogLog
+   :return:
+      Distinct if cardinality <= limit, else HyperLogLog
+   """
+   if cardinality <= limit:
+      return Distinct()
+   return HyperLogLog(error=error)
+
+
+def bit_length(values:numpy.ndarray)->numpy.ndarray:
+   """
+   Number of significant bits of each uint64 value (0 for 0)
+   """
+   values = values.copy()
+   length = numpy.zeros(len(values), dtype=numpy.int64)
+   for shift in (32, 16, 8, 4, 2, 1):
+      high = values >= numpy.uint64(1 << shift)
+      length[high] += shift
+      values[high] >>= numpy.uint64(shift)
+   return length + (values > 0)
+
+
+def hash_value(value)->int:
+   """
+   64 bit hash of a (normalized) distinct value - stable across processes (unlike hash())
+   """
+   return int.from_bytes(hashlib.blake2b(normalize_distinct(value).encode(), digest_size=8).digest(), 'little')
+
+
+def normalize_distinct(value)->str:
+   """
+   Distinct value as compared by a node - numbers by value (1 & 1.0 are equal), other values as strings
+   """
+   value = parse_value(value)
+   if isinstance(value, float) and value.is_integer():
+      value = int(value)
+   return str(value)
@@ -0,0 +1,157 @@
+"""
+Timestamp histogram of a table - fine grained increments buckets (min & max timestamp, row count per bucket) pulled
+once, so COUNT(*) of rows matching timestamp thresholds (<, <=, =, >=, > combined by AND / OR) is answered locally:
+rows are ordered by timestamp, each threshold is a rank found by binary search of the bucket bounds & cumulative counts,
+each condition a range of ranks
+:query:
+   SELECT increments(minute, 1, timestamp), MIN(timestamp) AS min_ts, MAX(timestamp) AS max_ts, COUNT(*) AS count FROM table;
+"""
+import bisect
+import datetime
+import re
+
+QUERY = "SELECT increments(%s, 1, %s), MIN(%s) AS min_ts, MAX(%s) AS max_ts, COUNT(*) AS count FROM %s;"
+CONDITION = re.compile(r"(\w+)\s*(<=|>=|=|<|>)\s*'([^']*)'")
+CONJUNCTION = re.compile(r'\b(and|or)\b', re.IGNORECASE)
+BUCKET_START = { # increments unit -> fields reset to get the start of the bucket of a timestamp
+   'second': {'microsecond': 0},
+   'minute': {'second': 0, 'microsecond': 0},
+   'hour': {'minute': 0, 'second': 0, 'microsecond': 0},
+   'day': {'hour': 0, 'minute': 0, 'second': 0, 'microsecond': 0},
+   'month': {'day': 1, 'hour': 0, 'minute': 0, 'second': 0, 'microsecond': 0},
+   'year': {'month': 1, 'day': 1, 'hour': 0, 'minute': 0, 'second': 0, 'microsecond': 0}
+}
+
+
+def histogram_query(table:str, unit:str='minute', column:str='timestamp')->str:
+   """
+   Query of the histogram of a table
+   :args:
+      table:str - table name
+      unit:str - increments time unit (bucket width)
+      column:str - timestamp column
+   """
+   return QUERY % (unit, column, column, column, table)
+
+
+def truncate(timestamp:datetime.datetime, unit:str='minute')->datetime.datetime:
+   """
+   Start of the bucket of a timestamp - a threshold at a bucket boundary never falls inside a bucket, so its count is
+   answered by the histogram (unless a row is exactly at the boundary)
+   :args:
+      timestamp:datetime.datetime - threshold
+      unit:str - increments time unit of the histogram (timestamp is returned as is for other units - ex. week)
+   """
+   return timestamp.replace(**BUCKET_START.get(unit, {}))
+
+
+def normalize(timestamp:str)->str:
+   """
+   Timestamp as YYYY-MM-DD HH:MM:SS.ffffff (so timestamps compare as strings)
+   """
+   timestamp = str(timestamp).strip().replace('T', ' ').rstrip('Z')
+   if '.' not in timestamp:
+      return timestamp + '.000000'
+   seconds, fraction = timestamp.split('.', 1)
+   return '%s.%s' % (seconds, fraction[:6].ljust(6, '0'))
+
+
+def where_conditions(query:str, column:str='timestamp')->tuple:
+   """
+   Timestamp conditions of a COUNT(*) query
+   :args:
+      query:str - query (ex. SELECT COUNT(*) AS count FROM t WHERE timestamp > 'x' AND timestamp < 'y';)
+      column:str - timestamp column
+   :return:
+      conditions (list of (operator, timestamp)) & conjunction (AND / OR) - None if the WHERE clause is not a
+      conjunction or disjunction of conditions on column
+   """
+   where = re.split(r'\bwhere\b', query, maxsplit=1, flags=re.IGNORECASE)
+   if len(where) != 2:
+      return None
+   where = where[1].strip().rstrip(';')
+   conditions = CONDITION.findall(where)
+   conjunctions = set(conjunction.upper() for conjunction in CONJUNCTION.findall(where))
+   remainder = CONJUNCTION.sub('', CONDITION.sub('', where)).strip()
+   if not conditions or remainder or len(conjunctions) > 1 or any(name.lower() != column.lower() for name, operator, value in conditions):
+      return None
+   return [(operator, value) for name, operator, value in conditions], conjunctions.pop() if conjunctions else 'AND'
+
+
+class Histogram:
+   """
+   Buckets ordered by time - bounds & cumulative row counts
+   """
+   def __init__(self, rows:list):
+      """
+      :args:
+         rows:list - histogram query results (min_ts, max_ts, count per bucket)
+      :params:
+         self.lower:list - first timestamp of each bucket (sorted)
+         self.upper:list - last timestamp of each bucket (sorted)
+         self.cumulative:list - rows in buckets before each bucket (& total)
+      """
+      buckets = sorted((normalize(row['min_ts']), normalize(row['max_ts']), int(row['count'])) for row in rows)
+      self.lower = [bucket[0] for bucket in buckets]
+      self.upper = [bucket[1] for bucket in buckets]
+      self.cumulative = [0]
+      for bucket in buckets:
+         self.cumulative.append(self.cumulative[-1] + bucket[2])
+      self.total = self.cumulative[-1]
+
+   def rank(self, timestamp:str, inclusive:bool=False)->int:
+      """
+      Number of rows before timestamp (< or, if inclusive, <=)
+      :return:
+         rank - None if timestamp falls inside a bucket (rows of the bucket are on both sides)
+      """
+      timestamp = normalize(timestamp)
+      if inclusive is True:
+         i = bisect.bisect_right(self.upper, timestamp)
+         if i < len(self.lower) and self.lower[i] <= timestamp:
+            return None
+      else:
+         i = bisect.bisect_left(self.upper, timestamp)
+         if i < len(self.lower) and self.lower[i] < timestamp:
+            return None
+      return self.cumulative[i]
+
+   def range(self, operator:str, timestamp:str)->tuple:
+      """
+      Ranks of the rows matching a condition - [start, end)
+      """
+      before, through = self.rank(timestamp), self.rank(timestamp, inclusive=True)
+      if operator == '<':
+         return (0, before) if before is not None else None
+      if operator == '<=':
+         return (0, through) if through is not None else None
+      if operator == '>':
+         return (through, self.total) if through is not None else None
+      if operator == '>=':
+         return (before, self.total) if before is not None else None
+      if operator == '=' and before is not None and through is not None:
+         return before, through
+      return None
+
+   def count(self, conditions:list, conjunction:str='AND')->int:
+      """
+      COUNT(*) of rows matching conditions
+      :args:
+         conditions:list - (operator, timestamp)
+         conjunction:str - AND (intersection of ranges) or OR (union of ranges)
+      :return:
+         row count - None if a threshold falls inside a bucket (the query has to be executed)
+      """
+      ranges = [self.range(operator, timestamp) for operator, timestamp in conditions]
+      if not ranges or None in ranges:
+         return None
+      if conjunction.upper() == 'AND':
+         return max(0, min(end for start, end in ranges) - max(start for start, end in ranges))
+      count = 0
+      covered = 0
+      for start, end in sorted(ranges):
+         start = max(start, covered)
+         if end > start:
+            count += end - start
+            covered = end
+      return count
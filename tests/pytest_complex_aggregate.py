@@ -1,13 +1,19 @@
 import argparse 
+import concurrent.futures
 import datetime 
 import json 
 import os 
 import pytest
 import requests
 import yaml 
+import aggregate_state
+import histogram 
 import read_config 
 
 CONFIG_FILE = '$HOME/AnyLog-Network/tests/rest/configs/default_config.yaml'
+HISTOGRAM_UNIT = 'minute' # histogram bucket width (increments time unit) 
+OPTIONAL_KEYS = ['HISTOGRAM', 'SAMPLE QUERIES'] # config keys of this suite not required by test_keys (see setup_class) 
+AGGREGATES = ['min', 'max', 'avg', 'sum', 'count'] # aggregates of test_combined_aggreggate_col (<function>_<col> columns) 
 
 class TestValidateData: 
    """
@@ -19,10 +25,26 @@ class TestValidateData:
       :param:
          self.timestamp - for SQL oldest query date 
          self.config_info - based on CONFIG_FILE info for REST requets 
+         self.histogram:bool - answer test_count_* thresholds from timestamp histograms (see histogram.py) instead of a
+            query per threshold - HISTOGRAM in CONFIG_FILE (default: false) 
+         self.sample_queries:int - thresholds per test still executed against the nodes (& checked against the
+            histograms) if histogram is set - SAMPLE QUERIES in CONFIG_FILE (default: 1) 
       """
       self.config_info = read_config.read_config(CONFIG_FILE)
       if not self.config_info: 
          exit(1) 
+      self.histogram = self.config_info.get('HISTOGRAM', False) is True 
+      self.sample_queries = int(self.config_info.get('SAMPLE QUERIES', 1))
+      self.histograms = None 
+      self.histogram_stats = {'histogram': 0, 'sampled': 0, 'fallback': 0} 
+
+   def teardown_class(self): 
+      """
+      Print how COUNT(*) thresholds were answered - from the histograms (sampled - also queried) or by the nodes
+      (fallback - the threshold falls inside a bucket)
+      """
+      if self.histogram is True: 
+         print('histogram thresholds: %(histogram)s answered by histograms (%(sampled)s also queried), %(fallback)s fallbacks' % self.histogram_stats)
 
    def setup(self): 
       """
@@ -63,6 +85,135 @@ class TestValidateData:
          print(e) 
          assert False  
 
+   def __execute_operators(self, headers:dict)->list: 
+      """
+      Execute query against each operator concurrently - fan-out time is that of the slowest operator
+      :args: 
+         headers:dict - header (servers is set per operator on a copy)
+      :return: 
+         results per operator, in the order of self.config_info['OPERATOR']
+      """
+      operators = self.config_info['OPERATOR']
+      with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(operators))) as executor: 
+         return list(executor.map(lambda server: self.__execute_query(dict(headers, servers=server)), operators))
+
+   def __threshold(self, delta:datetime.timedelta)->datetime.datetime: 
+      """
+      Timestamp threshold - now minus delta, truncated to the start of its histogram bucket if self.histogram is set (a
+      threshold with seconds & microseconds almost always falls inside an occupied bucket) 
+      :args: 
+         delta:datetime.timedelta - time back from now 
+      """
+      threshold = datetime.datetime.today() - delta 
+      if self.histogram is True: 
+         threshold = histogram.truncate(threshold, unit=HISTOGRAM_UNIT)
+      return threshold 
+
+   def __get_histograms(self)->tuple: 
+      """
+      Timestamp histograms of the table - combined (REST) & per operator, pulled once for all tests. The rows of each
+      histogram must add up to the COUNT(*) of the same node, so counts answered by them are backed by a query 
+      :query: 
+         SELECT increments(HISTOGRAM_UNIT, 1, timestamp), MIN(timestamp) AS min_ts, MAX(timestamp) AS max_ts, COUNT(*) AS count FROM %s;
+         SELECT COUNT(*) AS count FROM %s;
+      :return: 
+         combined histogram, histogram per operator 
+      """
+      if self.histograms is None: 
+         headers = {"type": "sql", "dbms": self.config_info['DB'], "details": histogram.histogram_query(self.config_info['TABLE'], unit=HISTOGRAM_UNIT)}
+         combined = histogram.Histogram(self.__execute_query(headers).get('Query', []))
+         operators = [histogram.Histogram(results.get('Query', [])) for results in self.__execute_operators(headers)]
+         headers['details'] = "SELECT COUNT(*) AS count FROM %s;" % self.config_info['TABLE']
+         assert combined.total == int(self.__execute_query(headers)['Query'][0]['count'])
+         assert [table_histogram.total for table_histogram in operators] == [int(results['Query'][0]['count']) for results in self.__execute_operators(headers)]
+         type(self).histograms = (combined, operators) 
+      return self.histograms 
+
+   def __check_count(self, details:str, sample:bool=True): 
+      """
+      Check COUNT(*) of rows matching timestamp thresholds - the combined result is equal to the sum of the results per
+      operator. If self.histogram is set, counts are taken from the histograms & the query is executed only if sample is
+      set (its results must then also be equal to the histograms) or a threshold falls inside a bucket (a fallback -
+      counted in self.histogram_stats) 
+      :args: 
+         details:str - COUNT(*) query 
+         sample:bool - execute the query against the nodes 
+      :params: 
+         counts:list - combined count & count per operator from the histograms (None if not answered by them) 
+      """
+      counts = None 
+      conditions = histogram.where_conditions(details) if self.histogram is True else None 
+      if conditions is not None: 
+         combined, operators = self.__get_histograms() 
+         counts = [table_histogram.count(*conditions) for table_histogram in [combined] + operators]
+         if None in counts: 
+            counts = None 
+            self.histogram_stats['fallback'] += 1 
+         else: 
+            assert sum(counts[1:]) == counts[0], 'Histogram counts per operator %s do not add up to the combined count %s (%s)' % (counts[1:], counts[0], details)
+            self.histogram_stats['histogram'] += 1 
+            if sample is False: 
+               return 
+            self.histogram_stats['sampled'] += 1 
+
+      headers = {"type": "sql", "dbms": self.config_info['DB'], "details": details}
+      results = self.__execute_query(headers) 
+      try: 
+         expected_results = int(results['Query'][0]['count'])
+      except: 
+         expected_results = results['Query.output.all']
+
+      actual_results = []
+      for results in self.__execute_operators(headers):
+         try: 
+            actual_results.append(int(results['Query'][0]['count']))
+         except: 
+            actual_results.append(results['Query.output.all'])
+
+      if all(isinstance(result, int) for result in actual_results): 
+         assert sum(actual_results) == expected_results 
+      elif all(isinstance(result, str) for result in actual_results): 
+         assert all(result == expected_results for result in actual_results)
+      else:
+         actual_result = 0 
+         for result in actual_results: 
+            if isinstance(result, int): 
+               actual_result += result 
+         assert actual_result == expected_results
+      if counts is not None and isinstance(expected_results, int): 
+         assert expected_results == counts[0] 
+         if all(isinstance(result, int) for result in actual_results): 
+            assert actual_results == counts[1:] 
+
+   def __aggregate_query(self, gcol:str, columns:list)->str: 
+      """
+      Consolidated query - MIN, MAX, AVG, SUM & COUNT of all numeric columns grouped by gcol (one query instead of
+      one per numeric column) 
+      :args: 
+         gcol:str - group by column 
+         columns:list - numeric columns 
+      :return: 
+         SELECT gcol, MIN(col) AS min_col, MAX(col) AS max_col, ..., COUNT(colN) AS count_colN FROM table GROUP BY gcol;
+      """
+      aggregates = ', '.join('%s(%s) AS %s_%s' % (function.upper(), col, function, col) for col in columns for function in AGGREGATES)
+      return "SELECT %s, %s FROM %s GROUP BY %s;" % (gcol, aggregates, self.config_info['TABLE'], gcol)
+
+   def __verify(self, headers:dict)->list: 
+      """
+      Verify the combined result of a query is the merge of the results of each operator (see aggregate_state.verify) -
+      rows are matched by their group by columns & each <function>_<col> column is compared with its merged state 
+      :args: 
+         headers:dict - header 
+      :return: 
+         mismatches - empty if the combined result is the merge of the operators' results 
+      """
+      results = self.__execute_query(headers)
+      operators = self.__execute_operators(headers)
+      try: 
+         return aggregate_state.verify(combined=results['Query'], partials=[operator['Query'] for operator in operators])
+      except Exception as e: 
+         return ['%s (Error: %s)' % (headers['details'], e)]
+
    def __get_count(self): 
       """
       Get raw row cunt
@@ -89,16 +240,17 @@ class TestValidateData:
 
    def test_keys(self): 
       """
-      Test self.config_info is valid
+      Test self.config_info is valid - optional keys (HISTOGRAM, SAMPLE QUERIES) are not required 
       :assert: 
          keys in self.config_info are as expected 
       :assert: 
          validate all relevent keys exit
       """
       config_keys = ['REST', 'OPERATOR', 'DB', 'TABLE', 'TABLE COLUMNS', 'MIN DAYS BACK', 'MAX DAYS BACK']
-      if list(self.config_info.keys()) != config_keys:
+      keys = [key for key in self.config_info.keys() if key not in OPTIONAL_KEYS]
+      if keys != config_keys:
           self.test_fail = True 
-      assert list(self.config_info.keys()) == config_keys 
+      assert keys == config_keys 
       
    def test_combined_aggreggate(self): 
       """
@@ -113,126 +265,38 @@ class TestValidateData:
          count = sum(count)    
       """
       query = "SELECT MIN(%s) AS min_%s, MAX(%s) AS max_%s, AVG(%s) AS avg_%s, SUM(%s) AS sum_%s, COUNT(%s) AS count_%s FROM %s;" 
-      headers = {"type": "sql", "dbms": self.config_info['DB'], 'details': query} 
-      
       ordered_columns = self.__order_columns()
 
       for col in ordered_columns['numeric']: 
-         header = headers 
-         header['details'] = header['details'] % (col, col, col, col, col, col, col, col, col, col, self.config_info['TABLE'])
-
-         results = self.__execute_query(header) 
-         expected_results = results['Query'][0]
-         
-         for result in expected_results: 
-             if '.' in expected_results[result]: 
-                expected_results[result] = float(expected_results[result])
-             else: 
-                expected_results[result] = int(expected_results[result])
-
-         actual_results = {} 
-         for server in self.config_info['OPERATOR']:
-            header['servers'] = server 
-            results = self.__execute_query(header) 
-            for result in results['Query'][0]: 
-                if result not in actual_results: 
-                    actual_results[result] = [] 
-                if '.' in results['Query'][0][result]:
-                   actual_results[result].append(float(results['Query'][0][result]))
-                else: 
-                   actual_results[result].append(int(results['Query'][0][result]))
-
-
-
-         assert min(actual_results['min_%s' % col]) == expected_results['min_%s' % col]
-         assert max(actual_results['max_%s' % col]) == expected_results['max_%s' % col]
-         assert sum(actual_results['sum_%s' % col]) / sum(actual_results['count_%s' % col]) == expected_results['avg_%s' % col]
-         assert sum(actual_results['sum_%s' % col]) == expected_results['sum_%s' % col] 
-         assert sum(actual_results['count_%s' % col]) == expected_results['count_%s' % col]
+         headers = {"type": "sql", "dbms": self.config_info['DB'], 'details': query % (col, col, col, col, col, col, col, col, col, col, self.config_info['TABLE'])} 
+         mismatches = self.__verify(headers)
+         assert mismatches == [], mismatches
 
 
    def test_combined_aggreggate_col(self): 
       """
-      Assert multiple aggregates + col query in a single query
+      Assert multiple aggregates + col query in a single query - all numeric columns are aggregated by one query per
+      group by column (see __aggregate_query), groups are matched by gcol & every <function>_<col> column checked 
       :query: 
-         SELECT col, MIN(num), MAX(num), AVG(num), SUM(num) FROM table_name GROUP BY col ORDER BY col
+         SELECT col, MIN(num1), MAX(num1), AVG(num1), SUM(num1), COUNT(num1), ..., COUNT(numN) FROM table_name GROUP BY col
        :assert: 
          min
          max 
-         avg = sum/count
+         avg = sum(sum)/sum(count)
          sum = sum(sum) 
          count = sum(count)    
       """
-      query = "SELECT %s, MIN(%s) AS min_%s, MAX(%s) AS max_%s, AVG(%s) AS avg_%s, SUM(%s) AS sum_%s, COUNT(%s) AS count_%s FROM %s GROUP BY %s;" 
-      headers = {"type": "sql", "dbms": self.config_info['DB'], 'details': ''} 
-      expected_results = {} 
-      actual_results = {} 
-
       ordered_columns = self.__order_columns()
       group_by_list = [] 
       for col_type in ordered_columns: 
           if col_type != 'numeric': 
               for col in ordered_columns[col_type]: 
                   group_by_list.append(col) 
-                  
-      for col in ordered_columns['numeric']:
-         for gcol in group_by_list:
-            header = headers 
-            header['details'] = query % (gcol, col, col, col, col, col, col, col, col, col, col, self.config_info['TABLE'], gcol)
-
-            results = self.__execute_query(header)
-
-            for result in results['Query']:
-               expected_results[result[gcol]] = {'count_%s' % col: int(result['count_%s' % col])}
-               if '.' in  result['min_%s' % col]:
-                  expected_results[result[gcol]]['min_%s' % col] = float(result['min_%s' % col])
-               else: 
-                  expected_results[result[gcol]]['min_%s' % col] = int(result['min_%s' % col])
-               if '.' in  result['max_%s' % col]:
-                  expected_results[result[gcol]]['max_%s' % col] = float(result['max_%s' % col])
-               else: 
-                  expected_results[result[gcol]]['max_%s' % col] = int(result['max_%s' % col])
- 
-               if '.' in  result['avg_%s' % col]:
-                  expected_results[result[gcol]]['avg_%s' % col] = float(result['min_%s' % col])
-               else: 
-                  expected_results[result[gcol]]['avg_%s' % col] = int(result['min_%s' % col])
-               if '.' in  result['sum_%s' % col]:
-                  expected_results[result[gcol]]['sum_%s' % col] = float(result['max_%s' % col])
-               else: 
-                  expected_results[result[gcol]]['sum_%s' % col] = int(result['sum_%s' % col])
-
-         for server in self.config_info['OPERATOR']:
-            header['servers'] = server 
-            results = self.__execute_query(header)
-            for result in results['Query']: 
-               if result[gcol] not in actual_results: 
-                  actual_results[result[gcol]] = {'min_%s' % col: [], 'max_%s' % col: [], 'avg_%s' % col: [], 'sum_%s' % col: [], 'count_%s' % col: []} 
-
-               actual_results[result[gcol]]['count_%s' % col].append(int(result['count_%s' % col]))
-               if '.' in  result['min_%s' % col]:
-                  actual_results[result[gcol]]['min_%s' % col].append(float(result['min_%s' % col]))
-               else:
-                  actual_results[result[gcol]]['min_%s' % col].append(int(result['min_%s' % col]))
-               if '.' in  result['max_%s' % col]:
-                  actual_results[result[gcol]]['max_%s' % col].append(float(result['max_%s' % col]))
-               else:
-                  actual_results[result[gcol]]['max_%s' % col].append(int(result['max_%s' % col]))
-               if '.' in  result['avg_%s' % col]:
-                  actual_results[result[gcol]]['avg_%s' % col].append(float(result['min_%s' % col]))
-               else:
-                  actual_results[result[gcol]]['avg_%s' % col].append(int(result['min_%s' % col]))
-               if '.' in  result['sum_%s' % col]:
-                  actual_results[result[gcol]]['sum_%s' % col].append(float(result['max_%s' % col]))
-               else:
-                  actual_results[result[gcol]]['sum_%s' % col].append(int(result['sum_%s' % col]))
 
-         for result in actual_results: 
-             assert  result in expected_results
-             assert min(actual_results[result]['min_%s' % col]) == expected_results[result]['min_%s' % col] 
-             assert max(actual_results[result]['max_%s' % col]) == expected_results[result]['max_%s' % col] 
-             assert sum(actual_results[result]['sum_%s' % col]) == expected_results[result]['sum_%s' % col]
-             assert sum(actual_results[result]['count_%s' % col]) == expected_results[result]['count_%s' % col]
+      for gcol in group_by_list:
+         headers = {"type": "sql", "dbms": self.config_info['DB'], 'details': self.__aggregate_query(gcol, ordered_columns['numeric'])} 
+         mismatches = self.__verify(headers)
+         assert mismatches == [], mismatches
 
    def test_count_less_than(self): 
       """
@@ -242,40 +306,15 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp < '%s';" 
       timestamps  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
-      for timestamp in timestamps:
-         headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], timestamp)}
-         results = self.__execute_query(headers) 
-         try: 
-            expected_results = int(results['Query'][0]['count'])
-         except: 
-            expected_results = results['Query.output.all']
-
-         actual_results = []
-         for server in self.config_info['OPERATOR']: 
-            headers['servers'] = server 
-            results = self.__execute_query(headers)
-            try: 
-               actual_results.append(int(results['Query'][0]['count']))
-            except: 
-               actual_results.append(results['Query.output.all'])
-
-         if all(isinstance(result, int) for result in actual_results): 
-            assert sum(actual_results) == expected_results 
-         elif all(isinstance(result, str) for result in actual_results): 
-            assert all(result == expected_results for result in actual_results)
-         else:
-            actual_result = 0 
-            for result in actual_results: 
-               if isinstance(result, int): 
-                  actual_result += result 
-            assert actual_result == expected_results   
+      for i, timestamp in enumerate(timestamps):
+         self.__check_count(query % (self.config_info['TABLE'], timestamp), sample=i < self.sample_queries)
 
    def test_count_less_than_equals(self): 
       """
@@ -285,40 +324,15 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp <= '%s';" 
       timestamps  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
-      for timestamp in timestamps:
-         headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], timestamp)}
-         results = self.__execute_query(headers) 
-         try: 
-            expected_results = int(results['Query'][0]['count'])
-         except: 
-            expected_results = results['Query.output.all']
-
-         actual_results = []
-         for server in self.config_info['OPERATOR']: 
-            headers['servers'] = server 
-            results = self.__execute_query(headers)
-            try: 
-               actual_results.append(int(results['Query'][0]['count']))
-            except: 
-               actual_results.append(results['Query.output.all'])
-
-         if all(isinstance(result, int) for result in actual_results): 
-            assert sum(actual_results) == expected_results 
-         elif all(isinstance(result, str) for result in actual_results): 
-            assert all(result == expected_results for result in actual_results)
-         else:
-            actual_result = 0 
-            for result in actual_results: 
-               if isinstance(result, int): 
-                  actual_result += result 
-            assert actual_result == expected_results
+      for i, timestamp in enumerate(timestamps):
+         self.__check_count(query % (self.config_info['TABLE'], timestamp), sample=i < self.sample_queries)
 
    def test_count_equals(self): 
       """
@@ -328,40 +342,15 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp = '%s';" 
       timestamps  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
-      for timestamp in timestamps:
-         headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], timestamp)}
-         results = self.__execute_query(headers) 
-         try: 
-            expected_results = int(results['Query'][0]['count'])
-         except: 
-            expected_results = results['Query.output.all']
-
-         actual_results = []
-         for server in self.config_info['OPERATOR']: 
-            headers['servers'] = server 
-            results = self.__execute_query(headers)
-            try: 
-               actual_results.append(int(results['Query'][0]['count']))
-            except: 
-               actual_results.append(results['Query.output.all'])
-
-         if all(isinstance(result, int) for result in actual_results): 
-            assert sum(actual_results) == expected_results 
-         elif all(isinstance(result, str) for result in actual_results): 
-            assert all(result == expected_results for result in actual_results)
-         else:
-            actual_result = 0 
-            for result in actual_results: 
-               if isinstance(result, int): 
-                  actual_result += result 
-            assert actual_result == expected_results
+      for i, timestamp in enumerate(timestamps):
+         self.__check_count(query % (self.config_info['TABLE'], timestamp), sample=i < self.sample_queries)
 
    def test_count_greater_than_equals(self): 
       """
@@ -371,40 +360,15 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s';" 
       timestamps  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
-      for timestamp in timestamps:
-         headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], timestamp)}
-         results = self.__execute_query(headers) 
-         try: 
-            expected_results = int(results['Query'][0]['count'])
-         except: 
-            expected_results = results['Query.output.all']
-
-         actual_results = []
-         for server in self.config_info['OPERATOR']: 
-            headers['servers'] = server 
-            results = self.__execute_query(headers)
-            try: 
-               actual_results.append(int(results['Query'][0]['count']))
-            except: 
-               actual_results.append(results['Query.output.all'])
-
-         if all(isinstance(result, int) for result in actual_results): 
-            assert sum(actual_results) == expected_results 
-         elif all(isinstance(result, str) for result in actual_results): 
-            assert all(result == expected_results for result in actual_results)
-         else:
-            actual_result = 0 
-            for result in actual_results: 
-               if isinstance(result, int): 
-                  actual_result += result 
-            assert actual_result == expected_results
+      for i, timestamp in enumerate(timestamps):
+         self.__check_count(query % (self.config_info['TABLE'], timestamp), sample=i < self.sample_queries)
 
    def test_count_greater_than(self): 
       """
@@ -414,40 +378,15 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s';" 
       timestamps  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
-      for timestamp in timestamps:
-         headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], timestamp)}
-         results = self.__execute_query(headers) 
-         try: 
-            expected_results = int(results['Query'][0]['count'])
-         except: 
-            expected_results = results['Query.output.all']
-
-         actual_results = []
-         for server in self.config_info['OPERATOR']: 
-            headers['servers'] = server 
-            results = self.__execute_query(headers)
-            try: 
-               actual_results.append(int(results['Query'][0]['count']))
-            except: 
-               actual_results.append(results['Query.output.all'])
-
-         if all(isinstance(result, int) for result in actual_results): 
-            assert sum(actual_results) == expected_results 
-         elif all(isinstance(result, str) for result in actual_results): 
-            assert all(result == expected_results for result in actual_results)
-         else:
-            actual_result = 0 
-            for result in actual_results: 
-               if isinstance(result, int): 
-                  actual_result += result 
-            assert actual_result == expected_results
+      for i, timestamp in enumerate(timestamps):
+         self.__check_count(query % (self.config_info['TABLE'], timestamp), sample=i < self.sample_queries)
 
    def test_count_greater_than_and_less_than(self): 
       """
@@ -457,44 +396,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' AND timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_and_less_than_inverse(self): 
       """
@@ -504,44 +418,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' AND timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_or_less_than(self): 
       """
@@ -551,44 +440,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' OR timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_or_less_than_inverse(self): 
       """
@@ -598,44 +462,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' AND timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_and_less_than(self): 
       """
@@ -645,44 +484,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' AND timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_and_less_than_inverse(self): 
       """
@@ -692,44 +506,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' AND timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_or_less_than(self): 
       """
@@ -739,44 +528,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' OR timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_or_less_than_inverse(self): 
       """
@@ -786,44 +550,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' AND timestamp < '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_and_less_than_equals(self): 
       """
@@ -833,44 +572,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' AND timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_and_less_than_equals_inverse(self): 
       """
@@ -880,44 +594,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' AND timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_or_less_than_equals(self): 
       """
@@ -927,44 +616,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' OR timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_equals_or_less_than_equals_inverse(self): 
       """
@@ -974,44 +638,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp >= '%s' AND timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_and_less_than_equals(self): 
       """
@@ -1021,44 +660,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' AND timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_and_less_than_equals_inverse(self): 
       """
@@ -1068,44 +682,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' AND timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_or_less_than_equals(self): 
       """
@@ -1115,44 +704,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' OR timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps1: 
-         for ts2 in timestamps2:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps1 for ts2 in timestamps2]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_greater_than_or_less_than_equals_inverse(self): 
       """
@@ -1162,44 +726,19 @@ class TestValidateData:
       """
       query = "SELECT COUNT(*) AS count FROM %s WHERE timestamp > '%s' AND timestamp <= '%s';" 
       timestamps1  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MIN DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MIN DAYS BACK']),
+              self.__threshold(datetime.timedelta(hours=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MIN DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MIN DAYS BACK'])),
       ]
       timestamps2  = [
-              datetime.datetime.today() - datetime.timedelta(hours=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(days=self.config_info['MAX DAYS BACK']),
-              datetime.datetime.today() - datetime.timedelta(weeks=self.config_info['MAX DAYS BACK'])
+              self.__threshold(datetime.timedelta(hours=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(days=self.config_info['MAX DAYS BACK'])),
+              self.__threshold(datetime.timedelta(weeks=self.config_info['MAX DAYS BACK']))
       ]
 
-      for ts1 in timestamps2: 
-         for ts2 in timestamps1:
-            headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts1, ts2)}
-            results = self.__execute_query(headers)
-            try: 
-               expected_results = int(results['Query'][0]['count'])
-            except: 
-               expected_results = results['Query.output.all'] 
-
-            actual_results = []
-            for server in self.config_info['OPERATOR']: 
-               headers['servers'] = server 
-               results = self.__execute_query(headers)
-               try: 
-                  actual_results.append(int(results['Query'][0]['count']))
-               except: 
-                  actual_results.append(results['Query.output.all'])
-
-            if all(isinstance(result, int) for result in actual_results): 
-               assert sum(actual_results) == expected_results 
-            elif all(isinstance(result, str) for result in actual_results): 
-               assert all(result == expected_results for result in actual_results)
-            else:
-               actual_result = 0 
-               for result in actual_results: 
-                  if isinstance(result, int): 
-                     actual_result += result 
-               assert actual_result == expected_results
+      queries = [query % (self.config_info['TABLE'], ts1, ts2) for ts1 in timestamps2 for ts2 in timestamps1]
+      for i, details in enumerate(queries):
+         self.__check_count(details, sample=i < self.sample_queries)
 
    def test_count_col_equals(self): 
        """
@@ -1220,9 +759,7 @@ class TestValidateData:
              expected_results = int(results['Query'][0]['count']) 
 
              actual_results = []
-             for server in self.config_info['OPERATOR']:
-                headers['servers'] = server
-                results = self.__execute_query(headers)
+             for results in self.__execute_operators(headers):
                 try:
                    actual_results.append(int(results['Query'][0]['count']))
                 except:
@@ -1261,9 +798,7 @@ class TestValidateData:
              expected_results = int(results['Query'][0]['count']) 
 
              actual_results = []
-             for server in self.config_info['OPERATOR']:
-                headers['servers'] = server
-                results = self.__execute_query(headers)
+             for results in self.__execute_operators(headers):
                 try:
                    actual_results.append(int(results['Query'][0]['count']))
                 except:
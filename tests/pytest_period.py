@@ -1,4 +1,5 @@
 import argparse 
+import concurrent.futures
 import datetime 
 import json 
 import os 
@@ -6,6 +7,7 @@ import pytest
 import requests
 import yaml 
 
+import aggregate_state
 import read_config 
 
 CONFIG_FILE = '$HOME/AnyLog-Network/tests/rest/configs/default_config.yaml' 
@@ -56,6 +58,33 @@ class TestPeriodNow:
          print(e) 
          return {} 
 
+   def __execute_operators(self, headers:dict)->list: 
+      """
+      Execute query against each operator concurrently - fan-out time is that of the slowest operator
+      :args: 
+         headers:dict - header (servers is set per operator on a copy)
+      :return: 
+         results per operator, in the order of self.config_info['OPERATOR']
+      """
+      operators = self.config_info['OPERATOR']
+      with concurrent.futures.ThreadPoolExecutor(max_workers=max(1, len(operators))) as executor: 
+         return list(executor.map(lambda server: self.__execute_query(dict(headers, servers=server)), operators))
+
+   def __verify(self, headers:dict)->list: 
+      """
+      Verify the combined result of a query is the merge of the results of each operator (see aggregate_state.verify)
+      :args: 
+         headers:dict - header 
+      :return: 
+         mismatches - empty if the combined result is the merge of the operators' results 
+      """
+      results = self.__execute_query(headers)
+      operators = self.__execute_operators(headers)
+      try: 
+         return aggregate_state.verify(combined=results['Query'], partials=[operator['Query'] for operator in operators])
+      except Exception as e: 
+         return ['%s (Error: %s)' % (headers['details'], e)]
+
    def test_status(self): 
       """
       Test node is accessible
@@ -91,22 +120,8 @@ class TestPeriodNow:
        query = "SELECT COUNT(*) AS count FROM %s WHERE period(minute, %s, now(), timestamp);" 
        for ts in [1, 5, 10, 30, 60]: 
           headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts)}
-          results = self.__execute_query(headers) 
-          try: 
-             expected_results = int(results['Query'][0]['count'])
-          except: 
-             assert False    
-          
-          actual_results = 0 
-          for server in self.config_info['OPERATOR']: 
-             headers['servers'] = server 
-             results = self.__execute_query(headers) 
-             try: 
-                result = int(results['Query'][0]['count']) 
-             except: 
-                assert False 
-             actual_results += result 
-          assert actual_results == expected_results       
+          mismatches = self.__verify(headers)
+          assert mismatches == [], mismatches
 
 
    def test_hour(self): 
@@ -118,22 +133,8 @@ class TestPeriodNow:
        query = "SELECT COUNT(*) AS count FROM %s WHERE period(hour, %s, now(), timestamp);" 
        for ts in [1, 6, 12, 24]: 
           headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts)}
-          results = self.__execute_query(headers) 
-          try: 
-             expected_results = int(results['Query'][0]['count'])
-          except: 
-             assert False    
-          
-          actual_results = 0 
-          for server in self.config_info['OPERATOR']: 
-             headers['servers'] = server 
-             results = self.__execute_query(headers) 
-             try: 
-                result = int(results['Query'][0]['count']) 
-             except: 
-                assert False 
-             actual_results += result 
-          assert actual_results == expected_results       
+          mismatches = self.__verify(headers)
+          assert mismatches == [], mismatches
 
    def test_day(self): 
        """
@@ -144,22 +145,8 @@ class TestPeriodNow:
        query = "SELECT COUNT(*) AS count FROM %s WHERE period(day, %s, now(), timestamp);" 
        for ts in [1, 7, 14, 28, 30]: 
           headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts)}
-          results = self.__execute_query(headers) 
-          try: 
-             expected_results = int(results['Query'][0]['count'])
-          except: 
-             assert False    
-          
-          actual_results = 0 
-          for server in self.config_info['OPERATOR']: 
-             headers['servers'] = server 
-             results = self.__execute_query(headers) 
-             try: 
-                result = int(results['Query'][0]['count']) 
-             except: 
-                assert False 
-             actual_results += result 
-          assert actual_results == expected_results
+          mismatches = self.__verify(headers)
+          assert mismatches == [], mismatches
 
    def test_week(self): 
        """
@@ -170,22 +157,8 @@ class TestPeriodNow:
        query = "SELECT COUNT(*) AS count FROM %s WHERE period(week, %s, now(), timestamp);" 
        for ts in [1, 4, 12, 24, 52]: 
           headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts)}
-          results = self.__execute_query(headers) 
-          try: 
-             expected_results = int(results['Query'][0]['count'])
-          except: 
-             assert False    
-          
-          actual_results = 0 
-          for server in self.config_info['OPERATOR']: 
-             headers['servers'] = server 
-             results = self.__execute_query(headers) 
-             try: 
-                result = int(results['Query'][0]['count']) 
-             except: 
-                assert False 
-             actual_results += result 
-          assert actual_results == expected_results
+          mismatches = self.__verify(headers)
+          assert mismatches == [], mismatches
 
    def test_month(self): 
        """
@@ -196,22 +169,8 @@ class TestPeriodNow:
        query = "SELECT COUNT(*) AS count FROM %s WHERE period(month, %s, now(), timestamp);" 
        for ts in [1, 3, 4, 6, 8, 9, 10, 12]: 
           headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts)}
-          results = self.__execute_query(headers) 
-          try: 
-             expected_results = int(results['Query'][0]['count'])
-          except: 
-             assert False    
-          
-          actual_results = 0 
-          for server in self.config_info['OPERATOR']: 
-             headers['servers'] = server 
-             results = self.__execute_query(headers) 
-             try: 
-                result = int(results['Query'][0]['count']) 
-             except: 
-                assert False 
-             actual_results += result 
-          assert actual_results == expected_results
+          mismatches = self.__verify(headers)
+          assert mismatches == [], mismatches
 
    def test_year(self): 
        """
@@ -222,22 +181,8 @@ class TestPeriodNow:
        query = "SELECT COUNT(*) AS count FROM %s WHERE period(year, %s, now(), timestamp);" 
        for ts in [1, 5, 10]: 
           headers = {"type": "sql", "dbms": self.config_info['DB'], "details": query % (self.config_info['TABLE'], ts)}
-          results = self.__execute_query(headers) 
-          try: 
-             expected_results = int(results['Query'][0]['count'])
-          except: 
-             assert False    
-          
-          actual_results = 0 
-          for server in self.config_info['OPERATOR']: 
-             headers['servers'] = server 
-             results = self.__execute_query(headers) 
-             try: 
-                result = int(results['Query'][0]['count']) 
-             except: 
-                assert False 
-             actual_results += result 
-          assert actual_results == expected_results
+          mismatches = self.__verify(headers)
+          assert mismatches == [], mismatches
 
    def test_minute_vs_hour(self): 
       """
@@ -266,19 +211,14 @@ class TestPeriodNow:
 
       actual_minute = 0 
       actual_hour = 0 
-      for operator in self.config_info['OPERATOR']: 
-         minute_headers['servers'] = operator 
-         hour_headers['servers'] = operator 
-
-         results = self.__execute_query(minute_headers) 
+      for minute_results, hour_results in zip(self.__execute_operators(minute_headers), self.__execute_operators(hour_headers)): 
          try: 
-            actual_minute += int(results['Query'][0]['count'])
+            actual_minute += int(minute_results['Query'][0]['count'])
          except: 
             assert False 
       
-         results = self.__execute_query(hour_headers) 
          try: 
-            actual_hour += int(results['Query'][0]['count'])
+            actual_hour += int(hour_results['Query'][0]['count'])
          except: 
             assert False 
 
@@ -313,19 +253,14 @@ class TestPeriodNow:
 
       actual_day = 0 
       actual_hour = 0 
-      for operator in self.config_info['OPERATOR']: 
-         day_headers['servers'] = operator 
-         hour_headers['servers'] = operator 
-
-         results = self.__execute_query(day_headers) 
+      for day_results, hour_results in zip(self.__execute_operators(day_headers), self.__execute_operators(hour_headers)): 
          try: 
-            actual_day += int(results['Query'][0]['count'])
+            actual_day += int(day_results['Query'][0]['count'])
          except: 
             assert False 
       
-         results = self.__execute_query(hour_headers) 
          try: 
-            actual_hour += int(results['Query'][0]['count'])
+            actual_hour += int(hour_results['Query'][0]['count'])
          except: 
             assert False 
 
@@ -361,19 +296,14 @@ class TestPeriodNow:
 
       actual_day = 0 
       actual_week = 0 
-      for operator in self.config_info['OPERATOR']: 
-         day_headers['servers'] = operator 
-         week_headers['servers'] = operator 
-
-         results = self.__execute_query(day_headers) 
+      for day_results, week_results in zip(self.__execute_operators(day_headers), self.__execute_operators(week_headers)): 
          try: 
-            actual_day += int(results['Query'][0]['count'])
+            actual_day += int(day_results['Query'][0]['count'])
          except: 
             assert False 
       
-         results = self.__execute_query(week_headers) 
          try: 
-            actual_week += int(results['Query'][0]['count'])
+            actual_week += int(week_results['Query'][0]['count'])
          except: 
             assert False 
 